@@ -14,23 +14,108 @@
 #    limitations under the License.
 #
 
+import codecs
+import contextlib
+import inspect
 import json
+import operator
 
 import requests
-from bs4 import BeautifulSoup
 
 from dcmanagerclient import exceptions
 from dcmanagerclient.api import httpclient
 
+# Size of the chunks read from streamed responses
+JSON_STREAM_CHUNK_SIZE = 64 * 1024
+
 
 class Resource:
     # This will be overridden by the actual resource
     resource_name = "Something"
 
+    # Resources declare their attributes as slots, so no per-instance
+    # dictionary is allocated
+    __slots__ = ()
+
+
+class _JSONText(str):
+    """Compact JSON text of a field value that was not decoded yet."""
+
+    __slots__ = ()
+
+
+class LazyJSONField:
+    """Resource field kept as compact JSON text until it is accessed.
+
+    Non-empty dicts and lists assigned to the field are stored encoded in the
+    underscore-prefixed slot of the same name, which keeps rarely used nested
+    structures cheap to hold in memory. The first read decodes the value and
+    stores it in place of the text, so it is decoded once and changes made
+    to it are kept. Other values are stored as is.
+    """
+
+    def __init__(self):
+        self.slot_name = None
+
+    def __set_name__(self, owner, name):
+        self.slot_name = "_" + name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        value = getattr(instance, self.slot_name)
+        if isinstance(value, _JSONText):
+            value = json.loads(value)
+            setattr(instance, self.slot_name, value)
+        return value
+
+    def __set__(self, instance, value):
+        if value and isinstance(value, (dict, list)):
+            value = _JSONText(json.dumps(value, separators=(",", ":")))
+        setattr(instance, self.slot_name, value)
+
 
 class Subcloud(Resource):
     resource_name = "subclouds"
 
+    __slots__ = (
+        "manager",
+        "subcloud_id",
+        "name",
+        "description",
+        "location",
+        "software_version",
+        "management_subnet",
+        "management_state",
+        "availability_status",
+        "deploy_status",
+        "error_description",
+        "oam_floating_ip",
+        "deploy_config_sync_status",
+        "management_start_ip",
+        "management_end_ip",
+        "management_gateway_ip",
+        "systemcontroller_gateway_ip",
+        "created_at",
+        "updated_at",
+        "group_id",
+        "peer_group_id",
+        "_rehome_data",
+        "sync_status",
+        "_endpoint_sync_status",
+        "backup_status",
+        "backup_datetime",
+        "prestage_software_version",
+        "region_name",
+        "prestage_status",
+        "prestage_versions",
+        "info_message",
+    )
+
+    # Rarely used, only decoded when accessed
+    rehome_data = LazyJSONField()
+    endpoint_sync_status = LazyJSONField()
+
     _PAYLOAD_NAME_MAP = {
         "id": "subcloud_id",
         "name": "name",
@@ -128,35 +213,86 @@ class Subcloud(Resource):
         self.prestage_versions = prestage_versions
         self.info_message = info_message
 
+    @classmethod
+    def _get_payload_loader(cls):
+        # Built once per class, on first use
+        loader = cls.__dict__.get("_payload_loader")
+        if loader is None:
+            loader = make_payload_loader(cls, cls._PAYLOAD_NAME_MAP)
+            cls._payload_loader = loader
+        return loader
+
     @classmethod
     def from_payload(cls, manager, payload):
         """Returns a class instance based on a single payload."""
-        parameters = {"manager": manager}
-
-        # Converts payload parameter name to match the class attributes
-        for payload_param, value in payload.items():
-            param_name = cls._PAYLOAD_NAME_MAP.get(payload_param)
-            if param_name is not None:
-                parameters[param_name] = value
-
-        subcloud = cls(**parameters)
-        return subcloud
+        return cls._get_payload_loader()(manager, payload)
 
     @classmethod
     def from_payloads(cls, manager, payloads):
         """Returns a list of class instances from a payload list."""
-        subclouds = []
-        for payload in payloads:
-            subcloud = cls.from_payload(manager, payload)
-            subclouds.append(subcloud)
-        return subclouds
+        load = cls._get_payload_loader()
+        return [load(manager, payload) for payload in payloads]
+
+
+def make_payload_loader(resource_class, payload_name_map):
+    """Returns a function building resources straight from API payloads.
+
+    The returned function takes the manager and a payload and calls the
+    resource constructor with positional arguments looked up directly in
+    the payload, so no intermediate keyword arguments are built. Payload
+    keys missing for parameters with a default value get that default.
+    """
+    attr_to_key = {attr: key for key, attr in payload_name_map.items()}
+    parameters = list(inspect.signature(resource_class).parameters.values())[1:]
+    required_keys = []
+    optional = []
+    for parameter in parameters:
+        key = attr_to_key.get(parameter.name)
+        if parameter.default is inspect.Parameter.empty:
+            required_keys.append(key)
+        else:
+            optional.append((key, parameter.default))
+    # Parameters without a default come first in any signature
+    if len(required_keys) == 1:
+        required_key = required_keys[0]
+
+        def get_required(payload):
+            return (payload[required_key],)
+
+    else:
+        get_required = operator.itemgetter(*required_keys)
+
+    def load(manager, payload):
+        get = payload.get
+        return resource_class(
+            manager,
+            *get_required(payload),
+            *[
+                default if key is None else get(key, default)
+                for key, default in optional
+            ],
+        )
+
+    return load
 
 
 class ResourceManager:
     resource_class = None
 
-    def __init__(self, http_client: httpclient.HTTPClient):
+    def __init__(self, http_client: httpclient.HTTPClient, reference_cache=None):
         self.http_client = http_client
+        # Optional api.reference_cache.ReferenceCache, shared by the managers
+        # of a client
+        self.reference_cache = reference_cache
+
+    def _cached_reference(self, ref):
+        if self.reference_cache is None:
+            return None
+        return self.reference_cache.get(self.resource_class.resource_name, ref)
+
+    def _remember_reference(self, resource, *refs):
+        if self.reference_cache is not None:
+            self.reference_cache.put(self.resource_class.resource_name, resource, *refs)
 
     def _generate_resource(self, json_response_key):
         json_objects = [json_response_key[item] for item in json_response_key]
@@ -229,8 +365,13 @@ class ResourceManager:
                 error_code=resp.status_code, error_message=error_message
             )
 
-        # Otherwise attempt to parse the HTML response content
+        # Otherwise attempt to parse the HTML response content, BeautifulSoup
+        # is only imported on this error path
         try:
+            from bs4 import (  # pylint: disable=import-outside-toplevel
+                BeautifulSoup,
+            )
+
             soup = BeautifulSoup(resp.content, "html.parser")
             line_list = soup.body.get_text().strip().split("\n")
 
@@ -259,9 +400,151 @@ class ResourceManager:
         )
 
 
+def multipart_encoder(fields):
+    """Returns a MultipartEncoder for the fields of a multipart request.
+
+    requests_toolbelt is only imported by the requests uploading files.
+    """
+    # pylint: disable-next=import-outside-toplevel
+    from requests_toolbelt import MultipartEncoder
+
+    return MultipartEncoder(fields=fields)
+
+
+@contextlib.contextmanager
+def multipart_upload(files, fields, progress=None):
+    """Yields the body and headers of a multipart request uploading files.
+
+    The files, a dict of field names and paths, are passed to the encoder as
+    open file handles so the body is streamed from disk instead of being
+    buffered in memory. The handles are closed when the context exits.
+
+    :param fields: Other fields of the request
+    :param progress: Optional callable receiving the number of bytes sent
+                     and the total size of the body as it is read
+    """
+    with contextlib.ExitStack() as stack:
+        upload_fields = {}
+        for name, path in (files or {}).items():
+            upload_fields[name] = (path, stack.enter_context(open(path, "rb")))
+        upload_fields.update(fields or {})
+
+        body = multipart_encoder(upload_fields)
+        headers = {"content-type": body.content_type}
+        if progress is not None:
+            # pylint: disable-next=import-outside-toplevel
+            from requests_toolbelt import MultipartEncoderMonitor
+
+            body = MultipartEncoderMonitor(
+                body, lambda monitor: progress(monitor.bytes_read, monitor.len)
+            )
+        yield body, headers
+
+
 def get_json(response):
     """Get JSON representation of response."""
     json_field_or_function = getattr(response, "json", None)
     if callable(json_field_or_function):
         return response.json()
     return json.loads(response.content)
+
+
+class _JSONStream:
+    """Buffer over the text chunks of a JSON document being decoded."""
+
+    def __init__(self, chunks):
+        self._chunks = chunks
+        self._decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.pos = 0
+
+    def _more(self):
+        """Appends the next chunk to the buffer, returns False at the end."""
+        chunk = next(self._chunks, None)
+        if chunk is None:
+            return False
+        # Drop the part of the buffer that was already decoded
+        self.buffer = self.buffer[self.pos :] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """Returns the next non-whitespace character without consuming it."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos].isspace():
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._more():
+                raise ValueError("Unexpected end of JSON data")
+
+    def expect(self, chars):
+        """Consumes and returns the next character, which must be in chars."""
+        char = self.peek()
+        if char not in chars:
+            raise ValueError(
+                f"Expected one of {chars!r} in JSON data, found {char!r} instead"
+            )
+        self.pos += 1
+        return char
+
+    def value(self):
+        """Decodes the next complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if not self._more():
+                    raise
+                continue
+            # A value ending with the buffer, e.g. a number, may continue in
+            # the next chunk
+            if end == len(self.buffer) and self._more():
+                continue
+            self.pos = end
+            return value
+
+
+def _iter_text(response, chunk_size):
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    for chunk in response.iter_content(chunk_size=chunk_size):
+        text = decoder.decode(chunk)
+        if text:
+            yield text
+    text = decoder.decode(b"", final=True)
+    if text:
+        yield text
+
+
+def iter_json_list(response, key, chunk_size=JSON_STREAM_CHUNK_SIZE):
+    """Incrementally decodes the items of a list in a streamed JSON response.
+
+    The response body must be a JSON object, the items of the list under
+    its top-level ``key`` are yielded one at a time as they are received, so
+    the memory used does not grow with the size of the list.
+    """
+    try:
+        stream = _JSONStream(_iter_text(response, chunk_size))
+        stream.expect("{")
+        if stream.peek() == "}":
+            return
+        while True:
+            name = stream.value()
+            stream.expect(":")
+            if name == key:
+                break
+            # Skip the values of the other keys
+            stream.value()
+            if stream.expect(",}") == "}":
+                return
+
+        stream.expect("[")
+        if stream.peek() == "]":
+            return
+        while True:
+            yield stream.value()
+            if stream.expect(",]") == "]":
+                return
+    finally:
+        response.close()
@@ -14,6 +14,7 @@
 #    limitations under the License.
 #
 
+from dcmanagerclient.api import httpclient
 from dcmanagerclient.api.v1 import client as client_v1
 
 
@@ -37,6 +38,14 @@ def client(
     session=None,
     cache_allowed=False,
     refresh_cache=False,
+    pool_maxsize=httpclient.DEFAULT_POOL_MAXSIZE,
+    response_cache_ttl=None,
+    retries=httpclient.DEFAULT_RETRIES,
+    retry_budget=None,
+    connect_timeout=httpclient.DEFAULT_CONNECT_TIMEOUT,
+    read_timeout=httpclient.DEFAULT_READ_TIMEOUT,
+    deadline=None,
+    renew_token=True,
     **kwargs
 ):
     if dcmanager_url and not isinstance(dcmanager_url, str):
@@ -62,6 +71,14 @@ def client(
         session=session,
         cache_allowed=cache_allowed,
         refresh_cache=refresh_cache,
+        pool_maxsize=pool_maxsize,
+        response_cache_ttl=response_cache_ttl,
+        retries=retries,
+        retry_budget=retry_budget,
+        connect_timeout=connect_timeout,
+        read_timeout=read_timeout,
+        deadline=deadline,
+        renew_token=renew_token,
         **kwargs
     )
 
@@ -16,26 +16,154 @@
 #    limitations under the License.
 #
 
+import collections
 import copy
+from email import utils as email_utils
+import hashlib
 import logging
 import os
+import random
+import threading
+import time
 
 import osprofiler.web
 import requests
+from requests import adapters
+
+from dcmanagerclient import exceptions
 
 CONTENT_TYPE = "content-type"
 LOG = logging.getLogger(__name__)
 
+# Number of distinct hosts and of connections per host kept alive by the
+# HTTP session. A single client usually talks to one dcmanager-api endpoint,
+# the per-host size mostly matters for callers sharing the client between
+# threads.
+DEFAULT_POOL_CONNECTIONS = 1
+DEFAULT_POOL_MAXSIZE = 10
+
+# Seconds to wait for a connection to dcmanager-api and, once connected,
+# between the bytes of its response
+DEFAULT_CONNECT_TIMEOUT = 10
+DEFAULT_READ_TIMEOUT = 300
+
+# Requests failing with these statuses or a connection error are retried
+RETRY_STATUSES = (502, 503, 504)
+# Requests safe to send again, other methods only retry when opted in
+IDEMPOTENT_METHODS = ("get", "delete")
+DEFAULT_RETRIES = 3
+# Seconds of the first retry delay, doubled on each retry up to the maximum
+DEFAULT_BACKOFF = 0.5
+DEFAULT_MAX_BACKOFF = 30
+# Longest Retry-After delay honored, in seconds
+MAX_RETRY_AFTER = 120
+
+
+class RetryPolicy:
+    """Decides whether and when the failed requests are sent again.
+
+    Connection errors, timeouts and the RETRY_STATUSES responses are retried
+    after the delay of a Retry-After header or a capped exponential backoff
+    with full jitter. The idempotent requests are retried automatically, the
+    others only when retry_mutating is set or the request opts in. The
+    budget caps the retries of a whole command, it is reset by reset_budget.
+    """
+
+    def __init__(
+        self,
+        retries=DEFAULT_RETRIES,
+        budget=None,
+        backoff=DEFAULT_BACKOFF,
+        max_backoff=DEFAULT_MAX_BACKOFF,
+        retry_mutating=False,
+    ):
+        self.retries = retries
+        self.budget = budget
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.retry_mutating = retry_mutating
+        # attempts, retries and the requests that failed for lack of
+        # retries or budget, shared by the threads using the client
+        self.counters = collections.Counter()
+        self._budget_used = 0
+        self._lock = threading.Lock()
+
+    def reset_budget(self):
+        with self._lock:
+            self._budget_used = 0
+
+    def continue_budget(self, other):
+        """Continues the retry budget used so far by another policy."""
+        with self._lock:
+            self._budget_used = other._budget_used
+
+    def backoff_delay(self, attempt):
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2**attempt))
+
+    @staticmethod
+    def retry_after(resp):
+        """Returns the delay in seconds asked by the response, if any."""
+        value = resp.headers.get("Retry-After")
+        if not value:
+            return None
+        try:
+            delay = float(value)
+        except ValueError:
+            try:
+                retry_at = email_utils.parsedate_to_datetime(value)
+            except (TypeError, ValueError):
+                return None
+            delay = retry_at.timestamp() - time.time()
+        return min(max(delay, 0), MAX_RETRY_AFTER)
+
+    def retry_delay(
+        self, method, attempt, retry=None, replayable=True, resp=None, error=None
+    ):
+        """Returns the seconds to wait before retrying, None to give up.
+
+        Called once for each attempt with its response or the error raised.
+        """
+        with self._lock:
+            self.counters["attempts"] += 1
+        if error is None and resp.status_code not in RETRY_STATUSES:
+            return None
+        if retry is None:
+            retry = method in IDEMPOTENT_METHODS or self.retry_mutating
+        if not retry or not replayable:
+            return None
+
+        with self._lock:
+            if attempt >= self.retries:
+                self.counters["retries_exhausted"] += 1
+                return None
+            if self.budget is not None and self._budget_used >= self.budget:
+                self.counters["budget_exhausted"] += 1
+                return None
+            self._budget_used += 1
+            self.counters["retries"] += 1
+
+        delay = self.retry_after(resp) if resp is not None else None
+        if delay is None:
+            delay = self.backoff_delay(attempt)
+        return delay
+
+
+def _replayable(body):
+    # Streamed bodies, such as the multipart uploads, are consumed when sent
+    return body is None or isinstance(body, (str, bytes, bytearray, dict))
+
 
 def log_request(func):
     def decorator(self, *args, **kwargs):
         resp = func(self, *args, **kwargs)
+        # The body of a streamed response can only be consumed once
+        text = "<streamed>" if kwargs.get("stream") else resp.text
         LOG.debug(
             "HTTP %s %s %d %s",
             resp.request.method,
             resp.url,
             resp.status_code,
-            resp.text,
+            text,
         )
         return resp
 
@@ -52,59 +180,288 @@ class HTTPClient:
         cacert=None,
         insecure=False,
         auth_type="keystone",
+        pool_connections=DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize=DEFAULT_POOL_MAXSIZE,
+        response_cache=None,
+        refresh_cache=False,
+        retry_policy=None,
+        connect_timeout=DEFAULT_CONNECT_TIMEOUT,
+        read_timeout=DEFAULT_READ_TIMEOUT,
+        authenticator=None,
+        reference_cache=None,
     ):
-        self.base_url = base_url
-        self.token = token
-        self.project_id = project_id
-        self.user_id = user_id
+        self.set_credentials(token, project_id, user_id)
         self.auth_type = auth_type
+        self.cacert = cacert
+        self.insecure = insecure
         self.ssl_options = {}
+        self._base_url = None
+        if base_url:
+            self._set_base_url(base_url)
 
-        if self.base_url.startswith("https"):
-            if cacert and not os.path.exists(cacert):
+        # Called once before the first request when the URL and credentials
+        # are only known after authenticating
+        self._authenticator = authenticator
+        self._auth_lock = threading.Lock()
+
+        # Reuse TCP/TLS connections across requests instead of opening a new
+        # one for every API call
+        self.session = requests.Session()
+        adapter = adapters.HTTPAdapter(
+            pool_connections=pool_connections, pool_maxsize=pool_maxsize
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        # Optional api.response_cache.ResponseCache for the GET requests,
+        # refresh_cache only updates it without serving cached responses
+        self.response_cache = response_cache
+        self.refresh_cache = refresh_cache
+        # Optional api.reference_cache.ReferenceCache of the managers, cleared
+        # by every change sent through the client
+        self.reference_cache = reference_cache
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        # time.monotonic() value after which no more request is sent
+        self.deadline = None
+        self.deadline_seconds = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Close the pooled connections held by the HTTP session."""
+        self.session.close()
+        if self.response_cache is not None:
+            self.response_cache.close()
+
+    def _set_base_url(self, base_url):
+        self.ssl_options = {}
+        if base_url.startswith("https"):
+            if self.cacert and not os.path.exists(self.cacert):
                 raise ValueError("Unable to locate cacert file at {cacert}.")
 
-            if cacert and insecure:
+            if self.cacert and self.insecure:
                 LOG.warning(
                     "Client is set to not verify even though cacert is provided."
                 )
 
-            if insecure:
+            if self.insecure:
                 self.ssl_options["verify"] = False
             else:
-                self.ssl_options["verify"] = True if not cacert else cacert
+                self.ssl_options["verify"] = True if not self.cacert else self.cacert
+        self._base_url = base_url
+
+    @property
+    def base_url(self):
+        self.authenticate()
+        return self._base_url
+
+    def authenticate(self):
+        """Authenticates with the authenticator given, if not done yet.
+
+        The authenticator returns the URL of the API, None to keep the
+        current one, and the token, project id and user id to send.
+        """
+        if self._authenticator is None:
+            return
+        with self._auth_lock:
+            if self._authenticator is None:
+                return
+            base_url, token, project_id, user_id = self._authenticator()
+            if base_url:
+                self._set_base_url(base_url)
+            self.set_credentials(token, project_id, user_id)
+            self._authenticator = None
+
+    def set_credentials(self, token, project_id, user_id):
+        """Replaces the credentials sent with the requests.
+
+        They are swapped in a single assignment, so a request sent while
+        a renewed token is set never mixes the old and new credentials.
+        """
+        self._credentials = (token, project_id, user_id)
+
+    @property
+    def token(self):
+        return self._credentials[0]
+
+    @property
+    def project_id(self):
+        return self._credentials[1]
+
+    @property
+    def user_id(self):
+        return self._credentials[2]
+
+    def set_deadline(self, seconds):
+        """Limits the time left for the requests, None removes the limit.
+
+        Shared by the managers and threads using the client, so it bounds
+        every request of a command rather than each one of them.
+        """
+        self.deadline_seconds = seconds
+        self.deadline = None if seconds is None else time.monotonic() + seconds
+
+    def continue_command(self, other):
+        """Applies the deadline and retry budget of another client.
+
+        Used when a client replaces another one in the middle of a command,
+        e.g. after an authentication error, so that the command keeps its
+        limits.
+        """
+        self.deadline = other.deadline
+        self.deadline_seconds = other.deadline_seconds
+        self.retry_policy.continue_budget(other.retry_policy)
+
+    def _remaining_time(self):
+        """Returns the seconds left before the deadline, None without one."""
+        if self.deadline is None:
+            return None
+        remaining = self.deadline - time.monotonic()
+        if remaining <= 0:
+            raise exceptions.DeadlineExceeded(
+                f"The command deadline of {self.deadline_seconds} seconds expired"
+            )
+        return remaining
+
+    def _timeout(self):
+        remaining = self._remaining_time()
+        timeouts = (self.connect_timeout, self.read_timeout)
+        if remaining is None:
+            return timeouts
+        return tuple(remaining if t is None else min(t, remaining) for t in timeouts)
+
+    @property
+    def auth_identity(self):
+        """Identifies the authenticated user the responses belong to."""
+        token, project_id, user_id = self._credentials
+        if user_id or project_id:
+            identity = f"{self.auth_type}:{user_id}:{project_id}"
+        else:
+            identity = f"{self.auth_type}:token:{token}"
+        return hashlib.sha256(identity.encode("utf-8")).hexdigest()
 
     @log_request
-    def get(self, url, headers=None):
+    def get(self, url, headers=None, stream=False, cache=True):
+        """Sends a GET request, cache=False bypasses the response cache."""
         options = self._get_request_options("get", headers)
+        if stream:
+            options["stream"] = True
+        elif self.response_cache is not None and cache:
+            return self._cached_get(self.base_url + url, options)
 
-        return requests.get(self.base_url + url, **options)
+        return self._send("get", self.base_url + url, **options)
 
-    @log_request
-    def post(self, url, body, headers=None):
-        options = self._get_request_options("post", headers)
+    def _cached_get(self, full_url, options):
+        identity = self.auth_identity
+        key = self.response_cache.make_key(identity, full_url)
+        cached = None if self.refresh_cache else self.response_cache.get(key)
 
-        return requests.post(self.base_url + url, body, **options)
+        if cached is not None:
+            if self.response_cache.is_fresh(cached):
+                LOG.debug("Using the cached response of %s", full_url)
+                return cached.to_response()
+            options["headers"].update(cached.validators)
 
-    @log_request
-    def put(self, url, body, headers=None):
-        options = self._get_request_options("put", headers)
+        resp = self._send("get", full_url, **options)
+        if cached is not None and resp.status_code == 304:
+            LOG.debug("Cached response of %s is still valid", full_url)
+            self.response_cache.revalidated(cached)
+            return cached.to_response()
+
+        self.response_cache.put(key, identity, resp)
+        return resp
+
+    def _invalidate_cache(self, resp):
+        # Any successful change may affect the cached resources
+        if self.response_cache is not None and resp.status_code < 400:
+            self.response_cache.invalidate(self.auth_identity)
+        return resp
+
+    def _send_change(self, method, url, *body, retry=None, headers=None):
+        options = self._get_request_options(method, headers)
+        try:
+            resp = self._send(
+                method, self.base_url + url, *body, retry=retry, **options
+            )
+        finally:
+            # Any change, even a failed one, may rename, move or delete the
+            # resources looked up by name or id
+            if self.reference_cache is not None:
+                self.reference_cache.clear()
+        return self._invalidate_cache(resp)
 
-        return requests.put(self.base_url + url, body, **options)
+    @log_request
+    def post(self, url, body, headers=None, retry=None):
+        return self._send_change("post", url, body, retry=retry, headers=headers)
 
     @log_request
-    def patch(self, url, body, headers=None):
-        options = self._get_request_options("patch", headers)
+    def put(self, url, body, headers=None, retry=None):
+        return self._send_change("put", url, body, retry=retry, headers=headers)
 
-        return requests.patch(self.base_url + url, body, **options)
+    @log_request
+    def patch(self, url, body, headers=None, retry=None):
+        return self._send_change("patch", url, body, retry=retry, headers=headers)
 
     @log_request
     def delete(self, url, headers=None):
-        options = self._get_request_options("delete", headers)
+        return self._send_change("delete", url, headers=headers)
 
-        return requests.delete(self.base_url + url, **options)
+    def _send(self, method, full_url, *body, retry=None, **options):
+        """Sends a request, retrying the transient failures per the policy.
+
+        retry=True opts a non idempotent request in, retry=False opts out.
+        """
+        send = getattr(self.session, method)
+        replayable = _replayable(body[0] if body else None)
+        attempt = 0
+        while True:
+            if self.deadline is not None:
+                options["timeout"] = self._timeout()
+            try:
+                resp = send(full_url, *body, **options)
+            except (requests.ConnectionError, requests.Timeout) as exc:
+                delay = self.retry_policy.retry_delay(
+                    method, attempt, retry, replayable, error=exc
+                )
+                if delay is None:
+                    # Report a timeout caused by the deadline as such
+                    self._remaining_time()
+                    raise
+                reason = exc
+            else:
+                delay = self.retry_policy.retry_delay(
+                    method, attempt, retry, replayable, resp=resp
+                )
+                if delay is None:
+                    return resp
+                reason = f"HTTP {resp.status_code}"
+                resp.close()
+
+            remaining = self._remaining_time()
+            if remaining is not None and delay >= remaining:
+                raise exceptions.DeadlineExceeded(
+                    f"The command deadline of {self.deadline_seconds} seconds "
+                    f"does not leave time to retry {method.upper()} {full_url}"
+                )
+            LOG.warning(
+                "Retrying %s %s in %.1f seconds: %s",
+                method.upper(),
+                full_url,
+                delay,
+                reason,
+            )
+            time.sleep(delay)
+            attempt += 1
 
     def _get_request_options(self, method, headers):
+        # Every request builds its options first, so it authenticates here
+        self.authenticate()
         headers = self._update_headers(headers)
 
         if method in ["post", "put", "patch"] and CONTENT_TYPE not in headers:
@@ -113,6 +470,7 @@ class HTTPClient:
 
         options = copy.deepcopy(self.ssl_options)
         options["headers"] = headers
+        options["timeout"] = (self.connect_timeout, self.read_timeout)
 
         return options
 
@@ -120,7 +478,10 @@ class HTTPClient:
         if not headers:
             headers = {}
 
-        token = headers.get("x-auth-token", self.token)
+        credentials_token, credentials_project_id, credentials_user_id = (
+            self._credentials
+        )
+        token = headers.get("x-auth-token", credentials_token)
         if token:
             if self.auth_type == "oidc":
                 # For OIDC authentication, set OIDC-Token header
@@ -129,11 +490,11 @@ class HTTPClient:
                 # For Keystone authentication, set X-Auth-Token header
                 headers["x-auth-token"] = token
 
-        project_id = headers.get("X-Project-Id", self.project_id)
+        project_id = headers.get("X-Project-Id", credentials_project_id)
         if project_id:
             headers["X-Project-Id"] = project_id
 
-        user_id = headers.get("X-User-Id", self.user_id)
+        user_id = headers.get("X-User-Id", credentials_user_id)
         if user_id:
             headers["X-User-Id"] = user_id
 
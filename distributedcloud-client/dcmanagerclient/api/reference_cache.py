@@ -0,0 +1,67 @@
+# Copyright (c) 2026 Wind River Systems, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+
+"""In-memory cache of the resources looked up by name or id."""
+
+import collections
+import threading
+import time
+
+DEFAULT_TTL = 60
+DEFAULT_MAX_ENTRIES = 1024
+
+
+class ReferenceCache:
+    """TTL and LRU bounded cache of the last known resources per reference.
+
+    A resource is stored under each of its references, e.g. both the name
+    and the id of a subcloud, so later lookups by either of them are served
+    without an API request. The ``hits`` and ``misses`` counters report how
+    effective the cache is.
+    """
+
+    def __init__(self, ttl=DEFAULT_TTL, max_entries=DEFAULT_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, kind, ref):
+        """Returns the cached resource for the reference or None."""
+        key = (kind, str(ref))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, kind, resource, *refs):
+        """Caches the resource under each of the given references."""
+        expires_at = time.monotonic() + self.ttl
+        with self._lock:
+            for ref in refs:
+                if ref is None:
+                    continue
+                key = (kind, str(ref))
+                self._entries[key] = (expires_at, resource)
+                self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
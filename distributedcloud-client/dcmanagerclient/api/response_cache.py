@@ -0,0 +1,206 @@
+# Copyright (c) 2026 Wind River Systems, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+
+"""Disk-backed cache of the API responses to GET requests."""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+import requests
+from requests import structures
+
+LOG = logging.getLogger(__name__)
+
+DEFAULT_MAX_SIZE = 64 * 1024 * 1024
+CACHE_FILE_NAME = "responses.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    identity TEXT NOT NULL,
+    url TEXT NOT NULL,
+    status_code INTEGER NOT NULL,
+    headers TEXT NOT NULL,
+    content BLOB NOT NULL,
+    stored_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+)
+"""
+
+
+def default_cache_dir():
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(cache_home, "dcmanagerclient")
+
+
+class CachedResponse:
+    """A response read back from the cache."""
+
+    def __init__(self, key, url, status_code, headers, content, stored_at):
+        self.key = key
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.stored_at = stored_at
+
+    @property
+    def validators(self):
+        """Conditional request headers to revalidate this response."""
+        headers = {}
+        if "etag" in self.headers:
+            headers["If-None-Match"] = self.headers["etag"]
+        if "last-modified" in self.headers:
+            headers["If-Modified-Since"] = self.headers["last-modified"]
+        return headers
+
+    def to_response(self):
+        response = requests.Response()
+        response.status_code = self.status_code
+        response.headers = structures.CaseInsensitiveDict(self.headers)
+        response._content = self.content
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        response.url = self.url
+        response.request = requests.Request("GET", self.url).prepare()
+        return response
+
+
+class ResponseCache:
+    """LRU cache of GET responses stored in an SQLite file.
+
+    Entries are keyed by the request URL and by the identity of the
+    authenticated user, so cached data is never shared between users. Entries
+    younger than ``ttl`` seconds are served without contacting the server;
+    older ones are revalidated with a conditional request when the server
+    provided an ETag or Last-Modified header. The least recently used
+    entries are evicted once the stored content exceeds ``max_size`` bytes.
+
+    Errors accessing the cache file are logged and handled as cache misses.
+    """
+
+    def __init__(self, ttl, path=None, max_size=DEFAULT_MAX_SIZE):
+        if path is None:
+            path = os.path.join(default_cache_dir(), CACHE_FILE_NAME)
+        self.ttl = ttl
+        self.path = path
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._connection = None
+
+    @staticmethod
+    def make_key(identity, url):
+        return hashlib.sha256(f"{identity}\n{url}".encode("utf-8")).hexdigest()
+
+    def _connect(self):
+        if self._connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                # Cached responses are only readable by their owner
+                os.makedirs(directory, mode=0o700, exist_ok=True)
+            # The file is created before sqlite does it with the default umask
+            os.close(os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600))
+            connection = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+            connection.execute(_SCHEMA)
+            connection.commit()
+            self._connection = connection
+        return self._connection
+
+    def _execute(self, statement, parameters=()):
+        with self._lock:
+            try:
+                connection = self._connect()
+                with connection:
+                    return connection.execute(statement, parameters).fetchall()
+            except (OSError, sqlite3.Error) as exc:
+                LOG.warning(
+                    "Unable to access the response cache %s: %s", self.path, exc
+                )
+                return None
+
+    def close(self):
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def is_fresh(self, cached):
+        return time.time() - cached.stored_at < self.ttl
+
+    def get(self, key):
+        rows = self._execute(
+            "SELECT url, status_code, headers, content, stored_at "
+            "FROM responses WHERE key = ?",
+            (key,),
+        )
+        if not rows:
+            return None
+
+        url, status_code, headers, content, stored_at = rows[0]
+        self._execute(
+            "UPDATE responses SET accessed_at = ? WHERE key = ?", (time.time(), key)
+        )
+        return CachedResponse(
+            key, url, status_code, json.loads(headers), bytes(content), stored_at
+        )
+
+    def put(self, key, identity, response):
+        """Stores a successful response, unless the server forbids it."""
+        if response.status_code != 200:
+            return
+        if "no-store" in response.headers.get("cache-control", "").lower():
+            return
+
+        content = response.content
+        if len(content) > self.max_size:
+            return
+
+        # Header names are stored lowercase to be looked up consistently
+        headers = {name.lower(): value for name, value in response.headers.items()}
+        now = time.time()
+        self._execute(
+            "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                key,
+                identity,
+                response.url,
+                response.status_code,
+                json.dumps(headers),
+                sqlite3.Binary(content),
+                now,
+                now,
+            ),
+        )
+        self._evict()
+
+    def revalidated(self, cached):
+        """Marks an entry confirmed by the server as fresh again."""
+        now = time.time()
+        self._execute(
+            "UPDATE responses SET stored_at = ?, accessed_at = ? WHERE key = ?",
+            (now, now, cached.key),
+        )
+
+    def invalidate(self, identity):
+        """Drops every entry cached for the given identity."""
+        self._execute("DELETE FROM responses WHERE identity = ?", (identity,))
+
+    def _evict(self):
+        # Keep the most recently used entries that fit in max_size
+        self._execute(
+            "DELETE FROM responses WHERE key IN ("
+            " SELECT key FROM ("
+            "  SELECT key, SUM(LENGTH(content))"
+            "   OVER (ORDER BY accessed_at DESC, stored_at DESC) AS total"
+            "  FROM responses)"
+            " WHERE total > ?)",
+            (self.max_size,),
+        )
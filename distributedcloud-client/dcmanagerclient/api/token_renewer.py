@@ -0,0 +1,94 @@
+# Copyright (c) 2026 Wind River Systems, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+
+"""Background renewal of the token used by an HTTP client."""
+
+import datetime
+import logging
+import threading
+
+LOG = logging.getLogger(__name__)
+
+# Seconds before the expiry at which the token is renewed
+TOKEN_RENEWAL_MARGIN = 300
+# Seconds to wait before trying again after a failed renewal
+TOKEN_RENEWAL_RETRY = 30
+
+
+class TokenRenewer:
+    """Renews the token of an HTTP client before it expires.
+
+    A daemon timer fires ``margin`` seconds before the expiry, or half way
+    through the remaining lifetime of short lived tokens, and calls
+    ``renew`` with the current expiry. It returns an object with the
+    ``token``, ``project_id``, ``user_id`` and ``expires_at`` of the new
+    token, which is swapped into the HTTP client at once. The requests sent
+    meanwhile keep using the current token, so the identity service is
+    contacted once per token lifetime rather than by the requests.
+    """
+
+    def __init__(self, http_client, renew, expires_at, margin=TOKEN_RENEWAL_MARGIN):
+        self.http_client = http_client
+        self.expires_at = expires_at
+        self.margin = margin
+        self.renewals = 0
+        self.failures = 0
+        self._renew = renew
+        self._timer = None
+        self._closed = False
+        self._lock = threading.Lock()
+        self._schedule(self.renewal_delay())
+
+    def remaining(self):
+        """Returns the seconds left before the current token expires."""
+        now = datetime.datetime.now(datetime.timezone.utc)
+        return (self.expires_at - now).total_seconds()
+
+    def renewal_delay(self):
+        """Returns the seconds to wait before renewing the current token."""
+        remaining = self.remaining()
+        return max(remaining - self.margin, remaining / 2, 0)
+
+    def _schedule(self, delay):
+        with self._lock:
+            if self._closed:
+                return
+            self._timer = threading.Timer(delay, self.renew)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def renew(self):
+        """Renews the token now and schedules the next renewal."""
+        try:
+            auth = self._renew(self.expires_at)
+            if auth.expires_at is None or auth.expires_at <= self.expires_at:
+                raise ValueError("the renewed token does not expire later")
+        except Exception as exc:
+            self.failures += 1
+            remaining = self.remaining()
+            LOG.warning(
+                "Unable to renew the token expiring in %d seconds: %s",
+                remaining,
+                exc,
+            )
+            # Once expired, the token is renewed by the authentication
+            # retry of the next request instead
+            if remaining > 0:
+                self._schedule(min(TOKEN_RENEWAL_RETRY, remaining / 2))
+            return
+
+        self.http_client.set_credentials(auth.token, auth.project_id, auth.user_id)
+        self.expires_at = auth.expires_at
+        self.renewals += 1
+        LOG.debug("Renewed the token, it expires at %s", self.expires_at)
+        self._schedule(self.renewal_delay())
+
+    def close(self):
+        """Stops renewing the token."""
+        with self._lock:
+            self._closed = True
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
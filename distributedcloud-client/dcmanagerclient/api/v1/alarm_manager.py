@@ -21,6 +21,15 @@ from dcmanagerclient.api.base import get_json
 
 class AlarmSummary(base.Resource):
     resource_name = "alarms"
+    __slots__ = (
+        "manger",
+        "name",
+        "critical",
+        "major",
+        "minor",
+        "warnings",
+        "status",
+    )
 
     def __init__(self, manager, name, critical, major, minor, warnings, status):
         self.manger = manager
@@ -0,0 +1,106 @@
+# Copyright (c) 2026 Wind River Systems, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+
+"""Asyncio interface to the DC Manager v1 API."""
+
+import asyncio
+from concurrent import futures
+import functools
+
+from dcmanagerclient.api import httpclient
+from dcmanagerclient.api.v1 import client as client_v1
+
+DEFAULT_MAX_CONCURRENCY = 10
+
+
+class AsyncManager:
+    """Exposes the methods of a v1 manager as coroutines.
+
+    The calls are delegated to the synchronous manager, so the payload
+    decoding and resource construction are the same for both clients.
+    """
+
+    def __init__(self, manager, async_client):
+        self._manager = manager
+        self._async_client = async_client
+
+    def __getattr__(self, name):
+        attr = getattr(self._manager, name)
+        if not callable(attr):
+            return attr
+
+        @functools.wraps(attr)
+        async def wrapper(*args, **kwargs):
+            return await self._async_client.run(attr, *args, **kwargs)
+
+        return wrapper
+
+
+class AsyncClient:
+    """Asyncio counterpart of api.v1.client.Client.
+
+    Managers are accessed with the same names as in the synchronous client,
+    e.g. ``await client.subcloud_manager.subcloud_detail("subcloud1")``.
+    Requests run on a bounded worker pool sharing the pooled HTTP session of
+    the wrapped client and at most ``max_concurrency`` of them are in flight
+    at any given time.
+    """
+
+    def __init__(self, client=None, max_concurrency=DEFAULT_MAX_CONCURRENCY, **kwargs):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be a positive integer.")
+
+        if client is None:
+            # Keep enough connections alive for every concurrent request
+            kwargs.setdefault(
+                "pool_maxsize", max(max_concurrency, httpclient.DEFAULT_POOL_MAXSIZE)
+            )
+            client = client_v1.Client(**kwargs)
+
+        self.client = client
+        self.max_concurrency = max_concurrency
+        self._executor = futures.ThreadPoolExecutor(
+            max_workers=max_concurrency, thread_name_prefix="dcmanagerclient"
+        )
+        self._semaphore = None
+        self._semaphore_loop = None
+        self._managers = {}
+
+    def __getattr__(self, name):
+        if name.startswith("_") or not name.endswith("_manager"):
+            raise AttributeError(name)
+
+        if name not in self._managers:
+            self._managers[name] = AsyncManager(getattr(self.client, name), self)
+        return self._managers[name]
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    def _get_semaphore(self):
+        # The semaphore must belong to the running loop, which may change
+        # between asyncio.run() calls made with the same client
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphore_loop = loop
+        return self._semaphore
+
+    async def run(self, func, *args, **kwargs):
+        """Run a blocking client call without blocking the event loop."""
+        async with self._get_semaphore():
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._executor, functools.partial(func, *args, **kwargs)
+            )
+
+    async def close(self):
+        """Wait for the pending requests and release the client resources."""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._executor.shutdown)
+        self.client.close()
@@ -16,8 +16,11 @@
 #    limitations under the License.
 #
 
+import collections
+import contextlib
 import datetime
 import logging
+import re
 from typing import Union
 from urllib.parse import urlparse
 
@@ -28,6 +31,9 @@ from platform_util.oidc import oidc_utils
 
 from dcmanagerclient import utils
 from dcmanagerclient.api import httpclient
+from dcmanagerclient.api.reference_cache import ReferenceCache
+from dcmanagerclient.api.response_cache import ResponseCache
+from dcmanagerclient.api.token_renewer import TokenRenewer
 from dcmanagerclient.api.v1.alarm_manager import AlarmManager
 from dcmanagerclient.api.v1.fw_update_manager import FwUpdateManager
 from dcmanagerclient.api.v1.kube_rootca_update_manager import KubeRootcaUpdateManager
@@ -54,6 +60,12 @@ from dcmanagerclient import exceptions
 LOG = logging.getLogger(__name__)
 _DEFAULT_DCMANAGER_URL = "http://localhost:8119/v1.0"
 
+# Result of a keystone authentication, expires_at is None when unknown
+AuthResult = collections.namedtuple(
+    "AuthResult",
+    ["dcmanager_url", "token", "project_id", "user_id", "expires_at", "session"],
+)
+
 
 def _cache_key(username: Union[str, None] = None) -> str:
     if username:
@@ -61,6 +73,13 @@ def _cache_key(username: Union[str, None] = None) -> str:
     return "dcmanager_client:session"
 
 
+def _auth_cache_lock(cache_key, cache_allowed):
+    """Serializes the fills of the auth cache by the processes of the user."""
+    if not cache_allowed:
+        return contextlib.nullcontext()
+    return utils.file_lock(re.sub(r"[^\w.-]", "_", cache_key) + ".lock")
+
+
 class Client:
     """Class where the communication from KB to Keystone happens."""
 
@@ -85,28 +104,46 @@ class Client:
         session=None,
         cache_allowed=False,
         refresh_cache=False,
+        pool_maxsize=httpclient.DEFAULT_POOL_MAXSIZE,
+        response_cache_ttl=None,
+        retries=httpclient.DEFAULT_RETRIES,
+        retry_budget=None,
+        connect_timeout=httpclient.DEFAULT_CONNECT_TIMEOUT,
+        read_timeout=httpclient.DEFAULT_READ_TIMEOUT,
+        deadline=None,
+        renew_token=True,
         **kwargs,
     ):
         """DC Manager communicates with Keystone to fetch necessary values."""
         if dcmanager_url and not isinstance(dcmanager_url, str):
             raise RuntimeError("DC Manager url should be a string.")
 
+        # Authenticating is deferred to the first request, only the local
+        # validation of the credentials happens here
+        authenticator = None
         if auth_url or session:
             if auth_type == "keystone":
-                (dcmanager_url, auth_token, project_id, user_id) = authenticate(
-                    dcmanager_url,
-                    username,
-                    api_key,
-                    project_name,
-                    auth_url,
-                    project_id,
-                    endpoint_type,
-                    service_type,
-                    auth_token,
-                    user_id,
-                    session,
-                    cacert,
-                    insecure,
+                if session is None:
+                    session = _keystone_session(
+                        auth_url,
+                        username,
+                        api_key,
+                        project_name,
+                        project_id,
+                        auth_token,
+                        user_id,
+                        cacert,
+                        insecure,
+                        **kwargs,
+                    )
+                authenticator = self._keystone_authenticator(
+                    # A token given by the caller cannot be renewed
+                    renew_token and not auth_token,
+                    dcmanager_url=dcmanager_url,
+                    username=username,
+                    endpoint_type=endpoint_type,
+                    service_type=service_type,
+                    session=session,
                     cache_allowed=cache_allowed,
                     refresh_cache=refresh_cache,
                     **kwargs,
@@ -115,27 +152,31 @@ class Client:
                 if not username:
                     raise RuntimeError("Username is required for OIDC authentication")
 
-                try:
-                    (dcmanager_url, auth_token) = _get_oidc_data(
-                        username,
-                        auth_url,
-                        endpoint_type,
-                        service_type,
-                    )
-                except Exception as e:
-                    raise RuntimeError(f"OIDC authentication failed: {e}") from e
+                authenticator = _oidc_authenticator(
+                    username, auth_url, endpoint_type, service_type, project_id, user_id
+                )
             else:
                 raise RuntimeError(
                     "Invalid authentication type "
                     f"[value={auth_type}, valid_values=keystone,oidc]"
                 )
-
-        if not dcmanager_url:
+        elif not dcmanager_url:
             dcmanager_url = _DEFAULT_DCMANAGER_URL
 
         if profile:
             osprofiler.profiler.init(profile)
 
+        # The GET responses are only cached on disk when a TTL is given
+        response_cache = None
+        if response_cache_ttl:
+            response_cache = ResponseCache(ttl=response_cache_ttl)
+
+        # Resources looked up by name or id, cleared by the HTTP client on
+        # every change
+        self.reference_cache = ReferenceCache()
+
+        # The keystone token is renewed in the background before it expires
+        self.token_renewer = None
         self.http_client = httpclient.HTTPClient(
             dcmanager_url,
             auth_token,
@@ -144,36 +185,135 @@ class Client:
             cacert=cacert,
             insecure=insecure,
             auth_type=auth_type,
+            pool_maxsize=pool_maxsize,
+            response_cache=response_cache,
+            refresh_cache=refresh_cache,
+            retry_policy=httpclient.RetryPolicy(retries=retries, budget=retry_budget),
+            connect_timeout=connect_timeout,
+            read_timeout=read_timeout,
+            authenticator=authenticator,
+            reference_cache=self.reference_cache,
         )
+        # Seconds left for all the requests sent by the client, typically
+        # the duration allowed to the command using it
+        if deadline is not None:
+            self.http_client.set_deadline(deadline)
+
+    def __getattr__(self, name):
+        # The managers are created on first use, they all share the same
+        # pooled HTTP session
+        factory = _MANAGERS.get(name)
+        if factory is None:
+            raise AttributeError(
+                f"'{type(self).__name__}' object has no attribute '{name}'"
+            )
+        manager = factory(self)
+        setattr(self, name, manager)
+        return manager
+
+    def __dir__(self):
+        return sorted(set(super().__dir__()) | set(_MANAGERS))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Release the connections kept alive by the shared HTTP client."""
+        if self.token_renewer is not None:
+            self.token_renewer.close()
+        self.http_client.close()
+
+    def _keystone_authenticator(self, renew_token, **auth_args):
+        """Returns the callable authenticating before the first request."""
+
+        def authenticator():
+            auth = _authenticate(**auth_args)
+            if renew_token and isinstance(auth.expires_at, datetime.datetime):
+                self.token_renewer = TokenRenewer(
+                    self.http_client,
+                    self._token_renewal(auth, auth_args),
+                    auth.expires_at,
+                )
+            return (
+                auth.dcmanager_url or _DEFAULT_DCMANAGER_URL,
+                auth.token,
+                auth.project_id,
+                auth.user_id,
+            )
 
-        # Create all managers
-        self.subcloud_manager = SubcloudManager(self.http_client)
-        self.subcloud_group_manager = SubcloudGroupManager(
-            self.http_client, self.subcloud_manager
-        )
-        self.subcloud_peer_group_manager = SubcloudPeerGroupManager(
-            self.http_client, self.subcloud_manager
-        )
-        self.peer_group_association_manager = PeerGroupAssociationManager(
-            self.http_client
-        )
-        self.subcloud_backup_manager = SubcloudBackupManager(self.http_client)
-        self.subcloud_deploy_manager = SubcloudDeployManager(self.http_client)
-        self.system_peer_manager = SystemPeerManager(
-            self.http_client, self.subcloud_peer_group_manager
-        )
-        self.alarm_manager = AlarmManager(self.http_client)
-        self.fw_update_manager = FwUpdateManager(self.http_client)
-        self.kube_rootca_update_manager = KubeRootcaUpdateManager(self.http_client)
-        self.kube_upgrade_manager = KubeUpgradeManager(self.http_client)
-        self.sw_deploy_manager = SwDeployManager(self.http_client)
-        self.sw_prestage_manager = SwPrestageManager(self.http_client)
-        self.sw_update_options_manager = SwUpdateOptionsManager(self.http_client)
-        self.strategy_step_manager = StrategyStepManager(self.http_client)
-        self.sw_strategy_manager = SwStrategyManager(self.http_client)
-        self.phased_subcloud_deploy_manager = PhasedSubcloudDeployManager(
-            self.http_client
-        )
+        return authenticator
+
+    @staticmethod
+    def _token_renewal(auth, auth_args):
+        """Returns the callable getting a token expiring after the given time."""
+        cache_key = _cache_key(auth_args.get("username"))
+
+        def renew(expires_at):
+            # Another process may have renewed and cached the token already
+            if auth_args.get("cache_allowed"):
+                cached = _load_cached_auth(cache_key)
+                if (
+                    cached.token
+                    and cached.expires_at
+                    and cached.expires_at > expires_at
+                ):
+                    return cached
+            auth.session.invalidate()
+            return _authenticate(
+                **dict(
+                    auth_args,
+                    dcmanager_url=auth.dcmanager_url,
+                    session=auth.session,
+                    refresh_cache=True,
+                )
+            )
+
+        return renew
+
+
+# Factories of the managers of a client, by attribute name
+_MANAGERS = {
+    "alarm_manager": lambda client: AlarmManager(client.http_client),
+    "fw_update_manager": lambda client: FwUpdateManager(client.http_client),
+    "kube_rootca_update_manager": lambda client: KubeRootcaUpdateManager(
+        client.http_client
+    ),
+    "kube_upgrade_manager": lambda client: KubeUpgradeManager(client.http_client),
+    "peer_group_association_manager": lambda client: PeerGroupAssociationManager(
+        client.http_client
+    ),
+    "phased_subcloud_deploy_manager": lambda client: PhasedSubcloudDeployManager(
+        client.http_client
+    ),
+    "strategy_step_manager": lambda client: StrategyStepManager(client.http_client),
+    "subcloud_backup_manager": lambda client: SubcloudBackupManager(client.http_client),
+    "subcloud_deploy_manager": lambda client: SubcloudDeployManager(client.http_client),
+    "subcloud_group_manager": lambda client: SubcloudGroupManager(
+        client.http_client,
+        client.subcloud_manager,
+        reference_cache=client.reference_cache,
+    ),
+    "subcloud_manager": lambda client: SubcloudManager(
+        client.http_client, reference_cache=client.reference_cache
+    ),
+    "subcloud_peer_group_manager": lambda client: SubcloudPeerGroupManager(
+        client.http_client,
+        client.subcloud_manager,
+        reference_cache=client.reference_cache,
+    ),
+    "sw_deploy_manager": lambda client: SwDeployManager(client.http_client),
+    "sw_prestage_manager": lambda client: SwPrestageManager(client.http_client),
+    "sw_strategy_manager": lambda client: SwStrategyManager(client.http_client),
+    "sw_update_options_manager": lambda client: SwUpdateOptionsManager(
+        client.http_client
+    ),
+    "system_peer_manager": lambda client: SystemPeerManager(
+        client.http_client, client.subcloud_peer_group_manager
+    ),
+}
 
 
 def authenticate(
@@ -195,78 +335,188 @@ def authenticate(
     **kwargs,
 ):
     """Get token, project_id, user_id and Endpoint."""
+    return _authenticate(
+        dcmanager_url,
+        username,
+        api_key,
+        project_name,
+        auth_url,
+        project_id,
+        endpoint_type,
+        service_type,
+        auth_token,
+        user_id,
+        session,
+        cacert,
+        insecure,
+        cache_allowed=cache_allowed,
+        refresh_cache=refresh_cache,
+        **kwargs,
+    )[:4]
+
+
+def _keystone_session(
+    auth_url,
+    username,
+    api_key,
+    project_name,
+    project_id,
+    auth_token,
+    user_id,
+    cacert,
+    insecure,
+    **kwargs,
+):
+    """Returns a keystone session, without contacting keystone yet."""
     user_domain_name = kwargs.get("user_domain_name")
     user_domain_id = kwargs.get("user_domain_id")
     project_domain_name = kwargs.get("project_domain_name")
     project_domain_id = kwargs.get("project_domain_id")
-    token = None
     verify = False if insecure else (cacert if cacert else True)
 
-    if session is None:
-        if auth_token:
-            auth = auth_plugin.Token(
-                auth_url=auth_url,
-                token=auth_token,
-                project_id=project_id,
-                project_name=project_name,
-                project_domain_name=project_domain_name,
-                project_domain_id=project_domain_id,
-            )
+    if auth_token:
+        auth = auth_plugin.Token(
+            auth_url=auth_url,
+            token=auth_token,
+            project_id=project_id,
+            project_name=project_name,
+            project_domain_name=project_domain_name,
+            project_domain_id=project_domain_id,
+        )
 
-        elif api_key and (username or user_id):
-            auth = auth_plugin.Password(
-                auth_url=auth_url,
-                username=username,
-                user_id=user_id,
-                password=api_key,
-                project_id=project_id,
-                project_name=project_name,
-                user_domain_name=user_domain_name,
-                user_domain_id=user_domain_id,
-                project_domain_name=project_domain_name,
-                project_domain_id=project_domain_id,
-            )
+    elif api_key and (username or user_id):
+        auth = auth_plugin.Password(
+            auth_url=auth_url,
+            username=username,
+            user_id=user_id,
+            password=api_key,
+            project_id=project_id,
+            project_name=project_name,
+            user_domain_name=user_domain_name,
+            user_domain_id=user_domain_id,
+            project_domain_name=project_domain_name,
+            project_domain_id=project_domain_id,
+        )
 
-        else:
-            raise RuntimeError(
-                "You must either provide a valid token or "
-                "a password (api_key) and a username."
-            )
-        session = ks_session.Session(auth=auth, verify=verify)
+    else:
+        raise RuntimeError(
+            "You must either provide a valid token or "
+            "a password (api_key) and a username."
+        )
+    return ks_session.Session(auth=auth, verify=verify)
 
+
+def _load_cached_auth(cache_key):
+    """Returns the AuthResult cached in keyring, with None for the missing fields."""
+    cache = utils.load_auth_session_keyring_by_name(cache_key)
+    expires_at = cache.get("expires_at")
+    return AuthResult(
+        cache.get("dcmanager_url"),
+        cache.get("token"),
+        cache.get("project_id"),
+        cache.get("user_id"),
+        datetime.datetime.fromisoformat(expires_at) if expires_at else None,
+        None,
+    )
+
+
+def _authenticate(
+    dcmanager_url=None,
+    username=None,
+    api_key=None,
+    project_name=None,
+    auth_url=None,
+    project_id=None,
+    endpoint_type="publicURL",
+    service_type="dcmanager",
+    auth_token=None,
+    user_id=None,
+    session=None,
+    cacert=None,
+    insecure=False,
+    cache_allowed=False,
+    refresh_cache=False,
+    **kwargs,
+):
+    """Authenticates with keystone and returns an AuthResult."""
+    if session is None:
+        session = _keystone_session(
+            auth_url,
+            username,
+            api_key,
+            project_name,
+            project_id,
+            auth_token,
+            user_id,
+            cacert,
+            insecure,
+            **kwargs,
+        )
+
+    expires_at = None
     if session:
         token, cache_key = None, _cache_key(username)
         if cache_allowed:
             LOG.debug("Retrieving session auth data from cache")
-            cache = utils.load_auth_session_keyring_by_name(cache_key)
-            token = cache.get("token")
-            dcmanager_url = cache.get("dcmanager_url")
-            project_id = cache.get("project_id")
-            user_id = cache.get("user_id")
+            cache = _load_cached_auth(cache_key)
+            dcmanager_url, token, project_id, user_id, expires_at = cache[:5]
 
         if not all([token, dcmanager_url, project_id, user_id]) or refresh_cache:
-            token = session.get_token()
-            if not dcmanager_url:
-                dcmanager_url = session.get_endpoint(
-                    service_type=service_type, interface=endpoint_type
-                )
-            project_id = session.get_project_id()
-            user_id = session.get_user_id()
-
-            now = datetime.datetime.now().astimezone() + datetime.timedelta(seconds=10)
-            timeout = int((session.auth.auth_ref.expires - now).total_seconds())
-            if cache_allowed:
-                LOG.debug("Caching session auth data")
-                utils.persist_auth_session_keyring(
-                    name=cache_key,
-                    timeout=timeout,
-                    token=token,
-                    dcmanager_url=dcmanager_url,
-                    project_id=project_id,
-                    user_id=user_id,
+            # A single process authenticates on a cache miss, the others
+            # wait for it and then reuse the token it cached
+            with _auth_cache_lock(cache_key, cache_allowed):
+                if cache_allowed and not refresh_cache:
+                    cache = _load_cached_auth(cache_key)
+                    if all(cache[:4]):
+                        LOG.debug("Using session auth data cached meanwhile")
+                        return cache._replace(session=session)
+
+                token = session.get_token()
+                if not dcmanager_url:
+                    dcmanager_url = session.get_endpoint(
+                        service_type=service_type, interface=endpoint_type
+                    )
+                project_id = session.get_project_id()
+                user_id = session.get_user_id()
+
+                expires_at = session.auth.auth_ref.expires
+                now = datetime.datetime.now().astimezone() + datetime.timedelta(
+                    seconds=10
                 )
+                timeout = int((expires_at - now).total_seconds())
+                if cache_allowed:
+                    LOG.debug("Caching session auth data")
+                    utils.persist_auth_session_keyring(
+                        name=cache_key,
+                        timeout=timeout,
+                        token=token,
+                        dcmanager_url=dcmanager_url,
+                        project_id=project_id,
+                        user_id=user_id,
+                        expires_at=expires_at.isoformat(),
+                    )
+
+    return AuthResult(dcmanager_url, token, project_id, user_id, expires_at, session)
+
+
+def _oidc_authenticator(
+    username, auth_url, endpoint_type, service_type, project_id, user_id
+):
+    """Returns the callable reading the OIDC token before the first request."""
+
+    def authenticator():
+        try:
+            (dcmanager_url, auth_token) = _get_oidc_data(
+                username,
+                auth_url,
+                endpoint_type,
+                service_type,
+            )
+        except Exception as e:
+            raise RuntimeError(f"OIDC authentication failed: {e}") from e
+        return dcmanager_url, auth_token, project_id, user_id
 
-    return dcmanager_url, token, project_id, user_id
+    return authenticator
 
 
 def _get_oidc_data(username, auth_url, endpoint_type, service_type):
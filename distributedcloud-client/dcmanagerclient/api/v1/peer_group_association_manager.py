@@ -16,6 +16,18 @@ BASE_URL = "/peer-group-associations/"
 
 class PeerGroupAssociation(base.Resource):
     resource_name = "peer_group_association"
+    __slots__ = (
+        "manager",
+        "association_id",
+        "peer_group_id",
+        "system_peer_id",
+        "peer_group_priority",
+        "association_type",
+        "sync_status",
+        "sync_message",
+        "created_at",
+        "updated_at",
+    )
 
     def __init__(
         self,
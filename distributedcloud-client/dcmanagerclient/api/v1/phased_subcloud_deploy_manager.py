@@ -4,8 +4,6 @@
 # SPDX-License-Identifier: Apache-2.0
 #
 
-from requests_toolbelt import MultipartEncoder
-
 from dcmanagerclient.api import base
 from dcmanagerclient.api.base import get_json
 
@@ -24,15 +22,9 @@ class PhasedSubcloudDeployManager(base.ResourceManager):
             raise ValueError(f"Invalid request method: {method}")
         return getattr(self.http_client, method)(url, body, headers)
 
-    def _deploy_operation(self, url, body, data, method="post"):
-        fields = {}
-        for k, v in body.items():
-            with open(v, "rb") as file:
-                fields.update({k: (v, file.read())})
-        fields.update(data)
-        enc = MultipartEncoder(fields=fields)
-        headers = {"content-type": enc.content_type}
-        resp = self._request_method(method, url, enc, headers)
+    def _deploy_operation(self, url, body, data, method="post", progress=None):
+        with base.multipart_upload(body, data, progress) as (enc, headers):
+            resp = self._request_method(method, url, enc, headers)
         if resp.status_code != 200:
             self._raise_api_exception(resp)
         json_object = get_json(resp)
@@ -42,25 +34,33 @@ class PhasedSubcloudDeployManager(base.ResourceManager):
     def subcloud_deploy_create(self, **kwargs):
         data = kwargs.get("data")
         files = kwargs.get("files")
-        return self._deploy_operation(BASE_URL, files, data)
+        return self._deploy_operation(
+            BASE_URL, files, data, progress=kwargs.get("progress")
+        )
 
     def subcloud_deploy_install(self, subcloud_ref, **kwargs):
         data = kwargs.get("data")
         files = kwargs.get("files")
         url = BASE_URL + f"{subcloud_ref}/install"
-        return self._deploy_operation(url, files, data, method="patch")
+        return self._deploy_operation(
+            url, files, data, method="patch", progress=kwargs.get("progress")
+        )
 
     def subcloud_deploy_bootstrap(self, subcloud_ref, **kwargs):
         data = kwargs.get("data")
         files = kwargs.get("files")
         url = BASE_URL + f"{subcloud_ref}/bootstrap"
-        return self._deploy_operation(url, files, data, method="patch")
+        return self._deploy_operation(
+            url, files, data, method="patch", progress=kwargs.get("progress")
+        )
 
     def subcloud_deploy_config(self, subcloud_ref, **kwargs):
         data = kwargs.get("data")
         files = kwargs.get("files")
         url = BASE_URL + f"{subcloud_ref}/configure"
-        return self._deploy_operation(url, files, data, method="patch")
+        return self._deploy_operation(
+            url, files, data, method="patch", progress=kwargs.get("progress")
+        )
 
     def subcloud_deploy_complete(self, subcloud_ref):
         url = BASE_URL + f"{subcloud_ref}/complete"
@@ -78,10 +78,14 @@ class PhasedSubcloudDeployManager(base.ResourceManager):
         data = kwargs.get("data")
         files = kwargs.get("files")
         url = BASE_URL + f"{subcloud_ref}/resume"
-        return self._deploy_operation(url, files, data, method="patch")
+        return self._deploy_operation(
+            url, files, data, method="patch", progress=kwargs.get("progress")
+        )
 
     def subcloud_deploy_enroll(self, subcloud_ref, **kwargs):
         data = kwargs.get("data")
         files = kwargs.get("files")
         url = BASE_URL + f"{subcloud_ref}/enroll"
-        return self._deploy_operation(url, files, data, method="patch")
+        return self._deploy_operation(
+            url, files, data, method="patch", progress=kwargs.get("progress")
+        )
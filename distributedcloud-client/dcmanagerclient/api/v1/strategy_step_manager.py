@@ -14,12 +14,31 @@
 #    See the License for the specific language governing permissions and
 #    limitations under the License.
 #
+import collections
+from urllib import parse
+
 from dcmanagerclient.api import base
 from dcmanagerclient.api.base import get_json
 
+# The steps added, changed and removed between two polls of the steps
+StrategyStepChanges = collections.namedtuple(
+    "StrategyStepChanges", ("added", "changed", "removed")
+)
+
 
 class StrategyStep(base.Resource):
     resource_name = "strategy_step"
+    __slots__ = (
+        "manager",
+        "cloud",
+        "stage",
+        "state",
+        "details",
+        "started_at",
+        "finished_at",
+        "created_at",
+        "updated_at",
+    )
 
     def __init__(
         self,
@@ -51,8 +70,87 @@ class StrategyStepManager(base.ResourceManager):
         self.steps_url = "/sw-update-strategy/steps"
         self.response_key = "strategy-steps"
 
-    def list_strategy_steps(self):
-        return self._strategy_step_list(self.steps_url)
+    def list_strategy_steps(
+        self,
+        state=None,
+        stage=None,
+        cloud_prefix=None,
+        limit=None,
+        marker=None,
+        cache=True,
+    ):
+        """Lists the strategy steps, optionally filtered and paginated.
+
+        The filters accept a single value or a list of values and, along with
+        limit and marker (the cloud of the last step of the previous page),
+        are sent as query parameters. They are also applied to the response in
+        case the server does not support them. cache=False bypasses the
+        response cache.
+        """
+        if limit is not None and limit < 1:
+            raise ValueError("limit must be a positive integer.")
+        filters = {"state": state, "stage": stage}
+        filters = {k: v for k, v in filters.items() if v is not None}
+        url = self._strategy_step_list_url(filters, cloud_prefix, limit, marker)
+        steps = self._skip_to_marker(self._strategy_step_list(url, cache), marker)
+        steps = self._filter_strategy_steps(steps, filters, cloud_prefix)
+        if limit is not None:
+            steps = steps[:limit]
+        return steps
+
+    def iter_strategy_step_changes(self, **filters):
+        """Yields the changes of the strategy steps since the previous poll.
+
+        The steps are listed again on each iteration, the first one yields
+        every step as added. Only the changed steps are returned, so the
+        callers do work proportional to the changes rather than the steps.
+        Accepts the same filters as list_strategy_steps, except for the
+        pagination ones, a step leaving the filters is reported as removed.
+        The steps are never served from the response cache.
+        """
+        snapshot = {}
+        while True:
+            steps = self.list_strategy_steps(cache=False, **filters)
+            yield self.diff_strategy_steps(snapshot, steps)
+
+    @staticmethod
+    def diff_strategy_steps(snapshot, steps):
+        """Compares the steps with a snapshot keyed by cloud, updating it.
+
+        A step with the same updated_at as in the snapshot is unchanged,
+        otherwise the hash of its fields tells whether it changed.
+        """
+        added = []
+        changed = []
+        seen = set()
+        for step in steps:
+            seen.add(step.cloud)
+            previous = snapshot.get(step.cloud)
+            if (
+                previous is not None
+                and step.updated_at is not None
+                and previous[0] == step.updated_at
+            ):
+                continue
+
+            digest = hash(
+                (
+                    step.stage,
+                    step.state,
+                    step.details,
+                    step.started_at,
+                    step.finished_at,
+                )
+            )
+            snapshot[step.cloud] = (step.updated_at, digest, step)
+            if previous is None:
+                added.append(step)
+            elif previous[1] != digest:
+                changed.append(step)
+
+        gone = [cloud for cloud in snapshot if cloud not in seen]
+        removed = [snapshot.pop(cloud)[2] for cloud in gone]
+        return StrategyStepChanges(added, changed, removed)
 
     def strategy_step_detail(self, cloud_name):
         url = f"{self.steps_url}/{cloud_name}"
@@ -71,8 +169,48 @@ class StrategyStepManager(base.ResourceManager):
             updated_at=json_object["updated-at"],
         )
 
-    def _strategy_step_list(self, url):
-        resp = self.http_client.get(url)
+    def _strategy_step_list_url(self, filters, cloud_prefix, limit, marker):
+        params = dict(filters)
+        if cloud_prefix:
+            params["cloud_prefix"] = cloud_prefix
+        if limit is not None:
+            params["limit"] = limit
+        if marker is not None:
+            params["marker"] = marker
+
+        url = self.steps_url
+        if params:
+            url += "?" + parse.urlencode(params, doseq=True)
+        return url
+
+    @staticmethod
+    def _skip_to_marker(steps, marker):
+        # Servers without pagination support return the steps from the start
+        # of the list, drop everything up to the marker in that case
+        if marker is None:
+            return steps
+        for index, step in enumerate(steps):
+            if str(step.cloud) == str(marker):
+                return steps[index + 1 :]
+        return steps
+
+    @staticmethod
+    def _filter_strategy_steps(steps, filters, cloud_prefix):
+        expected = {
+            attr: {str(v) for v in (value if isinstance(value, list) else [value])}
+            for attr, value in filters.items()
+        }
+        return [
+            step
+            for step in steps
+            if (not cloud_prefix or str(step.cloud).startswith(cloud_prefix))
+            and all(
+                str(getattr(step, attr)) in values for attr, values in expected.items()
+            )
+        ]
+
+    def _strategy_step_list(self, url, cache=True):
+        resp = self.http_client.get(url, cache=cache)
         if resp.status_code != 200:
             self._raise_api_exception(resp)
         json_response_key = get_json(resp)
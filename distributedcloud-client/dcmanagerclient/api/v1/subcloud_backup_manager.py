@@ -6,8 +6,6 @@
 
 import json
 
-from requests_toolbelt import MultipartEncoder
-
 from dcmanagerclient.api import base
 from dcmanagerclient.api.base import get_json
 
@@ -18,16 +16,9 @@ class SubcloudBackupManager(base.ResourceManager):
     def json_to_resource(self, json_object):
         return self.resource_class.from_payload(self, json_object)
 
-    def subcloud_backup_create(self, url, files, data):
-        fields = {}
-        if files:
-            for k, v in files.items():
-                with open(v, "rb") as file:
-                    fields.update({k: (v, file.read())})
-        fields.update(data)
-        enc = MultipartEncoder(fields=fields)
-        headers = {"content-type": enc.content_type}
-        resp = self.http_client.post(url, enc, headers=headers)
+    def subcloud_backup_create(self, url, files, data, progress=None):
+        with base.multipart_upload(files, data, progress) as (enc, headers):
+            resp = self.http_client.post(url, enc, headers=headers)
 
         if resp.status_code != 200:
             self._raise_api_exception(resp)
@@ -41,7 +32,7 @@ class SubcloudBackupManager(base.ResourceManager):
     def subcloud_backup_delete(self, url, data):
         fields = {}
         fields.update(data)
-        enc = MultipartEncoder(fields=fields)
+        enc = base.multipart_encoder(fields)
         headers = {"content-type": enc.content_type}
 
         resp = self.http_client.patch(url, enc, headers=headers)
@@ -51,17 +42,9 @@ class SubcloudBackupManager(base.ResourceManager):
             return json.loads(resp.content)
         return None
 
-    def subcloud_backup_restore(self, url, files, data):
-        fields = {}
-        if files:
-            for k, v in files.items():
-                with open(v, "rb") as file:
-                    fields.update({k: (v, file.read())})
-        fields.update(data)
-        enc = MultipartEncoder(fields=fields)
-        headers = {"content-type": enc.content_type}
-
-        resp = self.http_client.patch(url, enc, headers=headers)
+    def subcloud_backup_restore(self, url, files, data, progress=None):
+        with base.multipart_upload(files, data, progress) as (enc, headers):
+            resp = self.http_client.patch(url, enc, headers=headers)
 
         if resp.status_code != 200:
             self._raise_api_exception(resp)
@@ -77,7 +60,7 @@ class SubcloudBackupManager(base.ResourceManager):
         files = kwargs.get("files")
         data = kwargs.get("data")
         url = "/subcloud-backup/"
-        return self.subcloud_backup_create(url, files, data)
+        return self.subcloud_backup_create(url, files, data, kwargs.get("progress"))
 
     def backup_subcloud_delete(self, release_version, **kwargs):
         data = kwargs.get("data")
@@ -88,4 +71,4 @@ class SubcloudBackupManager(base.ResourceManager):
         files = kwargs.get("files")
         data = kwargs.get("data")
         url = "/subcloud-backup/restore"
-        return self.subcloud_backup_restore(url, files, data)
+        return self.subcloud_backup_restore(url, files, data, kwargs.get("progress"))
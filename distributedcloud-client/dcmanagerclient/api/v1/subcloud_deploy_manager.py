@@ -14,18 +14,55 @@
 #    limitations under the License.
 #
 
-import io
+import contextlib
+import functools
+import hashlib
+import json
+import logging
 import os
+import tempfile
+import time
 import zipfile
 
-from requests_toolbelt import MultipartEncoder
+import requests
 
+from dcmanagerclient import exceptions
 from dcmanagerclient.api import base
 from dcmanagerclient.api.base import get_json
+from dcmanagerclient.api.response_cache import default_cache_dir
+
+LOG = logging.getLogger(__name__)
+
+# Number of playbook archives kept in the cache
+PLAYBOOK_CACHE_SIZE = 4
+# Archives larger than this are spooled to disk when they cannot be cached
+PLAYBOOK_SPOOL_MAX_SIZE = 16 * 1024 * 1024
+
+# Chunked uploads of the large deployment files
+UPLOADS_URL = "/subcloud-deploy/uploads/"
+DEFAULT_CHUNK_SIZE = 64 * 1024 * 1024
+CHUNK_RETRIES = 3
+# Seconds before retrying a chunk, doubled after each consecutive failure
+CHUNK_RETRY_DELAY = 1
+# Returned by servers without chunked upload support
+UNSUPPORTED_UPLOAD_STATUSES = (404, 405, 501)
+# Offset conflict and checksum mismatch, the chunk is sent again
+RETRY_CHUNK_STATUSES = (409, 460)
+
+
+def _chunk_progress(progress, base_sent, total, bytes_sent, _file_size):
+    progress(base_sent + bytes_sent, total)
 
 
 class SubcloudDeploy(base.Resource):
     resource_name = "subcloud_deploy"
+    __slots__ = (
+        "deploy_playbook",
+        "deploy_overrides",
+        "deploy_chart",
+        "prestage_images",
+        "software_version",
+    )
 
     def __init__(
         self,
@@ -44,6 +81,10 @@ class SubcloudDeploy(base.Resource):
 
 class SubcloudDeployManager(base.ResourceManager):
     resource_class = SubcloudDeploy
+    # Directory of the playbook archives, under the user cache by default
+    playbook_cache_dir = None
+    # Directory of the interrupted chunked uploads, under the user cache by default
+    upload_state_dir = None
 
     def _process_json_response(self, json_object):
         resource = []
@@ -74,43 +115,313 @@ class SubcloudDeployManager(base.ResourceManager):
         resource = self._process_json_response(json_object)
         return resource
 
+    @staticmethod
+    def _playbook_files(file_path, roles):
+        """Yields the path and archive name of the files of a playbook."""
+        yield file_path, os.path.basename(file_path)
+        for root, dirs, files in os.walk(roles):
+            # Walk in a stable order so the fingerprint does not depend on it
+            dirs.sort()
+            for f in sorted(files):
+                path = os.path.join(root, f)
+                yield path, os.path.relpath(path, os.path.dirname(roles))
+
+    def _playbook_fingerprint(self, file_path, roles):
+        digest = hashlib.sha256(os.path.abspath(file_path).encode("utf-8"))
+        for path, arcname in self._playbook_files(file_path, roles):
+            path_stat = os.stat(path)
+            digest.update(
+                f"\0{arcname}\0{path_stat.st_size}\0{path_stat.st_mtime_ns}".encode(
+                    "utf-8"
+                )
+            )
+        return digest.hexdigest()
+
+    def _write_playbook_archive(self, file_path, roles, archive):
+        with zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED) as zf:
+            for path, arcname in self._playbook_files(file_path, roles):
+                zf.write(path, arcname)
+
+    def _cached_playbook_archive(self, file_path, roles):
+        """Returns the archive of the playbook from the cache, building it.
+
+        The archives are named after the fingerprint of the paths, sizes and
+        modification times of their files, so an unchanged playbook reuses
+        the archive built by a previous upload.
+        """
+        cache_dir = self.playbook_cache_dir or os.path.join(
+            default_cache_dir(), "playbooks"
+        )
+        os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+        archive_path = os.path.join(
+            cache_dir, self._playbook_fingerprint(file_path, roles) + ".zip"
+        )
+
+        try:
+            archive = open(archive_path, "rb")  # pylint: disable=consider-using-with
+            # Mark the archive as recently used
+            os.utime(archive_path)
+            return archive
+        except FileNotFoundError:
+            pass
+
+        with tempfile.NamedTemporaryFile(
+            dir=cache_dir, suffix=".tmp", delete=False
+        ) as archive:
+            try:
+                self._write_playbook_archive(file_path, roles, archive)
+            except BaseException:
+                os.unlink(archive.name)
+                raise
+        os.replace(archive.name, archive_path)
+        self._evict_playbook_archives(cache_dir)
+        return open(archive_path, "rb")  # pylint: disable=consider-using-with
+
+    @staticmethod
+    def _evict_playbook_archives(cache_dir):
+        try:
+            archives = [
+                os.path.join(cache_dir, name)
+                for name in os.listdir(cache_dir)
+                if name.endswith(".zip")
+            ]
+            archives.sort(key=os.path.getmtime, reverse=True)
+            for path in archives[PLAYBOOK_CACHE_SIZE:]:
+                os.unlink(path)
+        except OSError as exc:
+            # Another upload may be evicting the same archives
+            LOG.debug("Unable to evict the cached playbooks: %s", exc)
+
     def _get_playbook(self, file_path):
+        """Returns an open file with the playbook and its content type.
+
+        A playbook with a roles directory is uploaded as a zip archive, read
+        from the cache when possible and otherwise built in a temporary
+        file, rather than in memory.
+        """
         roles = os.path.join(os.path.dirname(file_path), "roles")
         if not os.path.isdir(roles):
-            with open(file_path, "rb") as f:
-                return f.read(), None
-
-        zbuffer = io.BytesIO()
-        with zipfile.ZipFile(zbuffer, "w", zipfile.ZIP_DEFLATED) as zf:
-            arcname = os.path.basename(file_path)
-            zf.write(file_path, arcname=arcname)
-            for root, _, files in os.walk(roles):
-                for f in files:
-                    file_path = os.path.join(root, f)
-                    arcname = os.path.relpath(file_path, os.path.dirname(roles))
-                    zf.write(file_path, arcname)
-        zbuffer.seek(0)
-        return zbuffer, "application/zip"
-
-    def _deploy_upload(self, url, files, data):
+            playbook = open(file_path, "rb")  # pylint: disable=consider-using-with
+            return playbook, None
+
+        try:
+            return self._cached_playbook_archive(file_path, roles), "application/zip"
+        except OSError as exc:
+            LOG.debug("Not caching the playbook archive: %s", exc)
+
+        archive = tempfile.SpooledTemporaryFile(  # pylint: disable=consider-using-with
+            max_size=PLAYBOOK_SPOOL_MAX_SIZE
+        )
+        self._write_playbook_archive(file_path, roles, archive)
+        archive.seek(0)
+        return archive, "application/zip"
+
+    def _deploy_upload(self, url, files, data, progress=None):
+        files = dict(files)
         fields = {}
-        for k, v in files.items():
-            if k == "deploy_playbook":
-                content, filetype = self._get_playbook(v)
-                fields.update({k: (v, content, filetype)})
-            else:
-                with open(v, "rb") as file:
-                    fields.update({k: (v, file.read())})
-        fields.update(data)
-        enc = MultipartEncoder(fields=fields)
-        headers = {"content-type": enc.content_type}
-        resp = self.http_client.post(url, enc, headers=headers)
+        with contextlib.ExitStack() as stack:
+            if "deploy_playbook" in files:
+                playbook = files.pop("deploy_playbook")
+                content, filetype = self._get_playbook(playbook)
+                stack.enter_context(content)
+                fields["deploy_playbook"] = (playbook, content, filetype)
+            fields.update(data)
+            with base.multipart_upload(files, fields, progress) as (enc, headers):
+                resp = self.http_client.post(url, enc, headers=headers)
         if resp.status_code != 200:
             self._raise_api_exception(resp)
         json_object = get_json(resp)
         resource = self._process_json_response(json_object)
         return resource
 
+    def _upload_state_path(self, field, path):
+        """Returns the file recording the upload session of a file.
+
+        The sessions are keyed by the server, the field and the path, size
+        and modification time of the file, so a modified file is uploaded
+        from the start.
+        """
+        state_dir = self.upload_state_dir or os.path.join(
+            default_cache_dir(), "uploads"
+        )
+        path_stat = os.stat(path)
+        key = "\0".join(
+            (
+                self.http_client.base_url,
+                field,
+                os.path.abspath(path),
+                str(path_stat.st_size),
+                str(path_stat.st_mtime_ns),
+            )
+        )
+        name = hashlib.sha256(key.encode("utf-8")).hexdigest() + ".json"
+        return os.path.join(state_dir, name)
+
+    @staticmethod
+    def _load_upload_id(state_path):
+        try:
+            with open(state_path, encoding="utf-8") as state_file:
+                return json.load(state_file)["upload_id"]
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    @staticmethod
+    def _save_upload_id(state_path, upload_id):
+        try:
+            os.makedirs(os.path.dirname(state_path), mode=0o700, exist_ok=True)
+            with open(state_path, "w", encoding="utf-8") as state_file:
+                json.dump({"upload_id": upload_id}, state_file)
+        except OSError as exc:
+            # The upload still works, it just can not be resumed later
+            LOG.debug("Unable to save the upload session: %s", exc)
+
+    @staticmethod
+    def _remove_upload_state(state_path):
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(state_path)
+
+    def _upload_offset(self, upload_id):
+        """Returns the number of bytes of an upload stored by the server."""
+        # Streamed so the offset is never served from the response cache
+        resp = self.http_client.get(UPLOADS_URL + upload_id, stream=True)
+        if resp.status_code != 200:
+            self._raise_api_exception(resp)
+        return int(get_json(resp)["offset"])
+
+    def _start_upload(self, field, path, data):
+        """Returns the upload id and offset to send the file from.
+
+        An interrupted upload of the same file is resumed from the last
+        offset acknowledged by the server. Returns None when the server does
+        not support chunked uploads.
+        """
+        state_path = self._upload_state_path(field, path)
+        upload_id = self._load_upload_id(state_path)
+        if upload_id is not None:
+            try:
+                offset = self._upload_offset(upload_id)
+                LOG.info("Resuming the upload of %s at offset %d", path, offset)
+                return upload_id, offset
+            except (exceptions.APIException, requests.RequestException) as exc:
+                LOG.debug("Unable to resume the upload of %s: %s", path, exc)
+                self._remove_upload_state(state_path)
+
+        body = {
+            "field": field,
+            "filename": os.path.basename(path),
+            "size": os.path.getsize(path),
+        }
+        if data.get("release"):
+            body["release"] = data["release"]
+        resp = self.http_client.post(UPLOADS_URL, json.dumps(body))
+        if resp.status_code in UNSUPPORTED_UPLOAD_STATUSES:
+            return None
+        if resp.status_code not in (200, 201):
+            self._raise_api_exception(resp)
+        json_object = get_json(resp)
+        upload_id = str(json_object["upload_id"])
+        self._save_upload_id(state_path, upload_id)
+        return upload_id, int(json_object.get("offset", 0))
+
+    def _upload_chunks(self, upload_id, path, offset, chunk_size, progress=None):
+        """Sends the file from the offset, one checksummed chunk at a time.
+
+        A failed chunk is retried from the offset acknowledged by the server,
+        the upload fails after CHUNK_RETRIES consecutive failures or chunks
+        not advancing the offset.
+        """
+        url = UPLOADS_URL + upload_id
+        size = os.path.getsize(path)
+        failures = 0
+        with open(path, "rb") as upload_file:
+            while offset < size:
+                upload_file.seek(offset)
+                chunk = upload_file.read(chunk_size)
+                headers = {
+                    "Content-Type": "application/offset+octet-stream",
+                    "Upload-Offset": str(offset),
+                    "Upload-Checksum": "sha256 " + hashlib.sha256(chunk).hexdigest(),
+                }
+                try:
+                    resp = self.http_client.patch(url, chunk, headers=headers)
+                    if resp.status_code == 200:
+                        acked = int(get_json(resp)["offset"])
+                        # An acknowledged offset that does not advance is
+                        # retried like a failed chunk, not sent forever
+                        if acked > offset:
+                            offset = acked
+                            failures = 0
+                            if progress:
+                                progress(offset, size)
+                            continue
+                        error = f"offset {acked} acknowledged"
+                    else:
+                        if (
+                            resp.status_code < 500
+                            and resp.status_code not in RETRY_CHUNK_STATUSES
+                        ):
+                            self._raise_api_exception(resp)
+                        error = f"HTTP {resp.status_code}"
+                except requests.RequestException as exc:
+                    error = exc
+
+                failures += 1
+                if failures > CHUNK_RETRIES:
+                    raise exceptions.DCManagerClientException(
+                        f"Unable to upload {path} at offset {offset}: {error}"
+                    )
+                LOG.warning(
+                    "Retrying the upload of %s at offset %d: %s", path, offset, error
+                )
+                time.sleep(CHUNK_RETRY_DELAY * 2 ** (failures - 1))
+                try:
+                    offset = self._upload_offset(upload_id)
+                except (exceptions.APIException, requests.RequestException) as exc:
+                    LOG.debug("Unable to get the offset of %s: %s", path, exc)
+
+    def _chunked_deploy_upload(self, url, files, data, chunk_size, progress=None):
+        """Uploads the files larger than the chunk size in chunks.
+
+        The remaining files are then posted along with the ids of the
+        completed uploads. Falls back to a single request when the server
+        does not support chunked uploads.
+        """
+        remaining = dict(files)
+        # The playbook may be an archive built on the fly, it is never chunked
+        chunked = {
+            field: path
+            for field, path in files.items()
+            if field != "deploy_playbook" and os.path.getsize(path) > chunk_size
+        }
+        total = sum(os.path.getsize(path) for path in chunked.values())
+        sent = 0
+        fields = dict(data)
+        state_paths = []
+        for field, path in chunked.items():
+            upload = self._start_upload(field, path, data)
+            if upload is None:
+                LOG.info("Chunked uploads not supported, using a single request")
+                # The files already uploaded in chunks are sent again
+                return self._deploy_upload(url, files, data, progress)
+
+            upload_id, offset = upload
+            file_progress = None
+            if progress:
+                # Report the progress of all the chunked files together
+                file_progress = functools.partial(
+                    _chunk_progress, progress, sent, total
+                )
+            self._upload_chunks(upload_id, path, offset, chunk_size, file_progress)
+            sent += os.path.getsize(path)
+            fields[f"{field}_upload_id"] = upload_id
+            state_paths.append(self._upload_state_path(field, path))
+            del remaining[field]
+
+        resource = self._deploy_upload(url, remaining, fields, progress)
+        for state_path in state_paths:
+            self._remove_upload_state(state_path)
+        return resource
+
     def _deploy_delete(self, url):
         resp = self.http_client.delete(url)
         if resp.status_code != 200:
@@ -126,7 +437,12 @@ class SubcloudDeployManager(base.ResourceManager):
         files = kwargs.get("files")
         data = kwargs.get("data")
         url = "/subcloud-deploy/"
-        return self._deploy_upload(url, files, data)
+        chunk_size = kwargs.get("chunk_size")
+        if chunk_size:
+            return self._chunked_deploy_upload(
+                url, files, data, chunk_size, kwargs.get("progress")
+            )
+        return self._deploy_upload(url, files, data, kwargs.get("progress"))
 
     def subcloud_deploy_delete(self, release, **kwargs):
         url = "/subcloud-deploy/"
@@ -23,6 +23,16 @@ from dcmanagerclient.api.base import get_json
 
 class SubcloudGroup(base.Resource):
     resource_name = "subcloud_group"
+    __slots__ = (
+        "manager",
+        "group_id",
+        "name",
+        "description",
+        "update_apply_type",
+        "max_parallel_subclouds",
+        "created_at",
+        "updated_at",
+    )
 
     def __init__(
         self,
@@ -48,8 +58,8 @@ class SubcloudGroup(base.Resource):
 class SubcloudGroupManager(base.ResourceManager):
     resource_class = SubcloudGroup
 
-    def __init__(self, http_client, subcloud_manager):
-        super().__init__(http_client)
+    def __init__(self, http_client, subcloud_manager, reference_cache=None):
+        super().__init__(http_client, reference_cache)
         self.subcloud_manager = subcloud_manager
 
     def _json_to_resource(self, json_object):
@@ -100,8 +110,10 @@ class SubcloudGroupManager(base.ResourceManager):
         if resp.status_code != 200:
             self._raise_api_exception(resp)
         json_object = get_json(resp)
+        group = self._json_to_resource(json_object)
+        self._remember_reference(group, group.group_id, group.name)
         resource = []
-        resource.append(self._json_to_resource(json_object))
+        resource.append(group)
         return resource
 
     def _list_subclouds_for_subcloud_group(self, url):
@@ -132,6 +144,17 @@ class SubcloudGroupManager(base.ResourceManager):
         url = f"/subcloud-groups/{subcloud_group_ref}"
         return self._subcloud_group_detail(url)
 
+    def lookup_subcloud_group(self, subcloud_group_ref):
+        """Returns the last known subcloud group with the given name or id."""
+        group = self._cached_reference(subcloud_group_ref)
+        if group is None:
+            group = self.subcloud_group_detail(subcloud_group_ref)[0]
+        return group
+
+    def get_subcloud_group_id(self, subcloud_group_ref):
+        """Resolves a subcloud group name or id to the group id."""
+        return self.lookup_subcloud_group(subcloud_group_ref).group_id
+
     def delete_subcloud_group(self, subcloud_group_ref):
         url = f"/subcloud-groups/{subcloud_group_ref}"
         return self._delete(url)
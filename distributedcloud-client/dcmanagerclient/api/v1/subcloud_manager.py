@@ -15,13 +15,20 @@
 #    limitations under the License.
 #
 
+import itertools
 import json
+import logging
+from urllib import parse
 
-from requests_toolbelt import MultipartEncoder
-
+from dcmanagerclient import utils
 from dcmanagerclient.api import base
 from dcmanagerclient.api.base import get_json
 
+LOG = logging.getLogger(__name__)
+
+# Default number of subclouds requested per page by iter_subclouds
+DEFAULT_PAGE_SIZE = 100
+
 
 class SubcloudManager(base.ResourceManager):
     resource_class = base.Subcloud
@@ -29,15 +36,9 @@ class SubcloudManager(base.ResourceManager):
     def json_to_resource(self, json_object):
         return self.resource_class.from_payload(self, json_object)
 
-    def subcloud_create(self, url, body, data):
-        fields = {}
-        for k, v in body.items():
-            with open(v, "rb") as file:
-                fields.update({k: (v, file.read())})
-        fields.update(data)
-        enc = MultipartEncoder(fields=fields)
-        headers = {"content-type": enc.content_type}
-        resp = self.http_client.post(url, enc, headers=headers)
+    def subcloud_create(self, url, body, data, progress=None):
+        with base.multipart_upload(body, data, progress) as (enc, headers):
+            resp = self.http_client.post(url, enc, headers=headers)
         if resp.status_code != 200:
             self._raise_api_exception(resp)
         json_object = get_json(resp)
@@ -45,16 +46,9 @@ class SubcloudManager(base.ResourceManager):
         resource.append(self.json_to_resource(json_object))
         return resource
 
-    def subcloud_update(self, url, body, data):
-        fields = {}
-        if body:
-            for k, v in body.items():
-                with open(v, "rb") as file:
-                    fields.update({k: (v, file.read())})
-        fields.update(data)
-        enc = MultipartEncoder(fields=fields)
-        headers = {"content-type": enc.content_type}
-        resp = self.http_client.patch(url, enc, headers=headers)
+    def subcloud_update(self, url, body, data, progress=None):
+        with base.multipart_upload(body, data, progress) as (enc, headers):
+            resp = self.http_client.patch(url, enc, headers=headers)
         if resp.status_code != 200:
             self._raise_api_exception(resp)
         json_object = get_json(resp)
@@ -62,15 +56,9 @@ class SubcloudManager(base.ResourceManager):
         resource.append(self.json_to_resource(json_object))
         return resource
 
-    def subcloud_redeploy(self, url, body, data):
-        fields = {}
-        for k, v in body.items():
-            with open(v, "rb") as file:
-                fields.update({k: (v, file.read())})
-        fields.update(data)
-        enc = MultipartEncoder(fields=fields)
-        headers = {"content-type": enc.content_type}
-        resp = self.http_client.patch(url, enc, headers=headers)
+    def subcloud_redeploy(self, url, body, data, progress=None):
+        with base.multipart_upload(body, data, progress) as (enc, headers):
+            resp = self.http_client.patch(url, enc, headers=headers)
         if resp.status_code != 200:
             self._raise_api_exception(resp)
         json_object = get_json(resp)
@@ -107,6 +95,7 @@ class SubcloudManager(base.ResourceManager):
             self._raise_api_exception(resp)
         json_object = get_json(resp)
         subcloud = self.resource_class.from_payload(self, json_object)
+        self._remember_reference(subcloud, subcloud.subcloud_id, subcloud.name)
         resource = [subcloud]
         if detail is not None:
             resource[0].oam_floating_ip = json_object["oam_floating_ip"]
@@ -120,11 +109,151 @@ class SubcloudManager(base.ResourceManager):
         data = kwargs.get("data")
         files = kwargs.get("files")
         url = "/subclouds/"
-        return self.subcloud_create(url, files, data)
+        return self.subcloud_create(url, files, data, kwargs.get("progress"))
+
+    def list_subclouds(
+        self,
+        deploy_status=None,
+        availability_status=None,
+        management_state=None,
+        group_id=None,
+        peer_group_id=None,
+        name_prefix=None,
+        exclude_deploy_status=None,
+        limit=None,
+        marker=None,
+    ):
+        """Lists the subclouds, optionally filtered and paginated.
+
+        The filters accept a single value or a list of values and, along with
+        limit and marker (the ID of the last subcloud of the previous page),
+        are sent as query parameters. They are also applied to the response in
+        case the server does not support them.
+
+        The subclouds in one of the exclude_deploy_status states are dropped
+        before the limit is applied, the following pages are requested until
+        the limit is reached.
+        """
+        filters = {
+            "deploy_status": deploy_status,
+            "availability_status": availability_status,
+            "management_state": management_state,
+            "group_id": group_id,
+            "peer_group_id": peer_group_id,
+        }
+        filters = {k: v for k, v in filters.items() if v is not None}
+        if limit is not None:
+            if limit < 1:
+                raise ValueError("limit must be a positive integer.")
+            subclouds = self.iter_subclouds(
+                page_size=limit,
+                marker=marker,
+                name_prefix=name_prefix,
+                exclude_deploy_status=exclude_deploy_status,
+                **filters,
+            )
+            return list(itertools.islice(subclouds, limit))
+        url = self._subcloud_list_url(filters, name_prefix, None, marker)
+        subclouds = self._skip_to_marker(self.subcloud_list(url), marker)
+        return self._filter_subclouds(
+            subclouds, filters, name_prefix, exclude_deploy_status
+        )
+
+    def iter_subclouds(self, page_size=DEFAULT_PAGE_SIZE, marker=None, **filters):
+        """Lazily yields the subclouds, requesting them one page at a time.
+
+        Accepts the same filters as list_subclouds, the listing starts after
+        the marker when given.
+        """
+        filter_args = {k: v for k, v in filters.items() if v is not None}
+        name_prefix = filter_args.pop("name_prefix", None)
+        exclude_deploy_status = filter_args.pop("exclude_deploy_status", None)
+        while True:
+            url = self._subcloud_list_url(filter_args, name_prefix, page_size, marker)
+            page = self._skip_to_marker(self.subcloud_list(url), marker)
+            yield from self._filter_subclouds(
+                page, filter_args, name_prefix, exclude_deploy_status
+            )
+
+            if len(page) > page_size:
+                # The server ignored the pagination and returned everything
+                return
+            if len(page) < page_size:
+                return
+            marker = page[-1].subcloud_id
+
+    def stream_subclouds(self, **filters):
+        """Lazily decodes the subcloud list, yielding one subcloud at a time.
+
+        The response is parsed incrementally as it is received, so the memory
+        used stays flat regardless of the number of subclouds. Accepts the
+        same filters as list_subclouds, except for the pagination ones.
+
+        The request is sent by the call itself, only the decoding is deferred
+        to the iteration, so the API errors are raised to the caller at once.
+        """
+        filter_args = {k: v for k, v in filters.items() if v is not None}
+        name_prefix = filter_args.pop("name_prefix", None)
+        exclude_deploy_status = filter_args.pop("exclude_deploy_status", None)
+        url = self._subcloud_list_url(filter_args, name_prefix, None, None)
+        resp = self.http_client.get(url, stream=True)
+        if resp.status_code != 200:
+            self._raise_api_exception(resp)
+        return self._iter_subclouds(
+            resp, filter_args, name_prefix, exclude_deploy_status
+        )
+
+    def _iter_subclouds(self, resp, filter_args, name_prefix, exclude_deploy_status):
+        for json_object in base.iter_json_list(resp, "subclouds"):
+            subcloud = self.resource_class.from_payload(self, json_object)
+            if self._filter_subclouds(
+                [subcloud], filter_args, name_prefix, exclude_deploy_status
+            ):
+                yield subcloud
+
+    @staticmethod
+    def _subcloud_list_url(filters, name_prefix, limit, marker):
+        params = dict(filters)
+        if name_prefix:
+            params["name_prefix"] = name_prefix
+        if limit is not None:
+            params["limit"] = limit
+        if marker is not None:
+            params["marker"] = marker
 
-    def list_subclouds(self):
         url = "/subclouds/"
-        return self.subcloud_list(url)
+        if params:
+            url += "?" + parse.urlencode(params, doseq=True)
+        return url
+
+    @staticmethod
+    def _skip_to_marker(subclouds, marker):
+        # Servers without pagination support return the subclouds from the
+        # start of the list, drop everything up to the marker in that case
+        if marker is None:
+            return subclouds
+        for index, subcloud in enumerate(subclouds):
+            if str(subcloud.subcloud_id) == str(marker):
+                LOG.debug("Server ignored the subcloud list marker")
+                return subclouds[index + 1 :]
+        return subclouds
+
+    @staticmethod
+    def _filter_subclouds(subclouds, filters, name_prefix, exclude_deploy_status=None):
+        expected = {
+            attr: {str(v) for v in (value if isinstance(value, list) else [value])}
+            for attr, value in filters.items()
+        }
+        return [
+            subcloud
+            for subcloud in subclouds
+            if (not name_prefix or str(subcloud.name).startswith(name_prefix))
+            and all(
+                str(getattr(subcloud, attr)) in values
+                for attr, values in expected.items()
+            )
+            and subcloud.deploy_status not in (exclude_deploy_status or ())
+        ]
 
     def subcloud_additional_details(self, subcloud_ref):
         url = f"/subclouds/{subcloud_ref}/detail"
@@ -134,10 +263,54 @@ class SubcloudManager(base.ResourceManager):
         url = f"/subclouds/{subcloud_ref}"
         return self._subcloud_detail(url)
 
+    def lookup_subcloud(self, subcloud_ref):
+        """Returns the last known subcloud with the given name or id.
+
+        The subcloud is served from the client reference cache when
+        possible and retrieved from the API otherwise.
+        """
+        subcloud = self._cached_reference(subcloud_ref)
+        if subcloud is None:
+            subcloud = self.subcloud_detail(subcloud_ref)[0]
+        return subcloud
+
+    def get_subcloud_id(self, subcloud_ref):
+        """Resolves a subcloud name or id to the subcloud id."""
+        return self.lookup_subcloud(subcloud_ref).subcloud_id
+
+    def subclouds_additional_details(
+        self, subcloud_refs, max_workers=utils.DEFAULT_MAX_WORKERS
+    ):
+        """Retrieves the additional details of many subclouds in parallel.
+
+        Yields a (subcloud_ref, resource, exception) tuple for each subcloud
+        as soon as its request completes.
+        """
+        return utils.run_concurrently(
+            self.subcloud_additional_details, subcloud_refs, max_workers
+        )
+
+    def subclouds_detail(self, subcloud_refs, max_workers=utils.DEFAULT_MAX_WORKERS):
+        """Retrieves the details of many subclouds in parallel.
+
+        Yields a (subcloud_ref, resource, exception) tuple for each subcloud
+        as soon as its request completes.
+        """
+        return utils.run_concurrently(self.subcloud_detail, subcloud_refs, max_workers)
+
     def delete_subcloud(self, subcloud_ref):
         url = f"/subclouds/{subcloud_ref}"
         return self._delete(url)
 
+    def delete_subclouds(self, subcloud_refs, max_workers=utils.DEFAULT_MAX_WORKERS):
+        """Deletes many subclouds in parallel.
+
+        Yields a (subcloud_ref, response, exception) tuple for each subcloud
+        as soon as its request completes, a failed deletion does not stop the
+        remaining ones.
+        """
+        return utils.run_concurrently(self.delete_subcloud, subcloud_refs, max_workers)
+
     def prestage_subcloud(self, subcloud_ref, **kwargs):
         data = kwargs.get("data")
         url = f"/subclouds/{subcloud_ref}/prestage"
@@ -147,10 +320,25 @@ class SubcloudManager(base.ResourceManager):
         files = kwargs.get("files")
         data = kwargs.get("data")
         url = f"/subclouds/{subcloud_ref}"
-        return self.subcloud_update(url, files, data)
+        return self.subcloud_update(url, files, data, kwargs.get("progress"))
+
+    def update_subclouds(
+        self, subcloud_refs, data, max_workers=utils.DEFAULT_MAX_WORKERS
+    ):
+        """Applies the same update to many subclouds in parallel.
+
+        Yields a (subcloud_ref, resource, exception) tuple for each subcloud
+        as soon as its request completes, a failed update does not stop the
+        remaining ones.
+        """
+
+        def update(subcloud_ref):
+            return self.update_subcloud(subcloud_ref, files=None, data=data)
+
+        return utils.run_concurrently(update, subcloud_refs, max_workers)
 
     def redeploy_subcloud(self, subcloud_ref, **kwargs):
         files = kwargs.get("files")
         data = kwargs.get("data")
         url = f"/subclouds/{subcloud_ref}/redeploy"
-        return self.subcloud_redeploy(url, files, data)
+        return self.subcloud_redeploy(url, files, data, kwargs.get("progress"))
@@ -13,6 +13,18 @@ BASE_URL = "/subcloud-peer-groups/"
 
 class SubcloudPeerGroup(base.Resource):
     resource_name = "subcloud_peer_group"
+    __slots__ = (
+        "manager",
+        "id",
+        "peer_group_name",
+        "group_priority",
+        "group_state",
+        "system_leader_id",
+        "system_leader_name",
+        "max_subcloud_rehoming",
+        "created_at",
+        "updated_at",
+    )
 
     def __init__(
         self,
@@ -43,8 +55,8 @@ class SubcloudPeerGroup(base.Resource):
 class SubcloudPeerGroupManager(base.ResourceManager):
     resource_class = SubcloudPeerGroup
 
-    def __init__(self, http_client, subcloud_manager):
-        super().__init__(http_client)
+    def __init__(self, http_client, subcloud_manager, reference_cache=None):
+        super().__init__(http_client, reference_cache)
         self.subcloud_manager = subcloud_manager
 
     def json_to_resource(self, json_object):
@@ -66,8 +78,10 @@ class SubcloudPeerGroupManager(base.ResourceManager):
         if resp.status_code != 200:
             self._raise_api_exception(resp)
         json_object = get_json(resp)
+        peer_group = self.json_to_resource(json_object)
+        self._remember_reference(peer_group, peer_group.id, peer_group.peer_group_name)
         resource = []
-        resource.append(self.json_to_resource(json_object))
+        resource.append(peer_group)
         return resource
 
     def _subcloud_peer_group_status(self, url):
@@ -146,6 +160,17 @@ class SubcloudPeerGroupManager(base.ResourceManager):
         url = BASE_URL + subcloud_peer_group_ref
         return self._subcloud_peer_group_detail(url)
 
+    def lookup_subcloud_peer_group(self, subcloud_peer_group_ref):
+        """Returns the last known peer group with the given name or id."""
+        peer_group = self._cached_reference(subcloud_peer_group_ref)
+        if peer_group is None:
+            peer_group = self.subcloud_peer_group_detail(subcloud_peer_group_ref)[0]
+        return peer_group
+
+    def get_subcloud_peer_group_id(self, subcloud_peer_group_ref):
+        """Resolves a peer group name or id to the peer group id."""
+        return self.lookup_subcloud_peer_group(subcloud_peer_group_ref).id
+
     def list_subcloud_peer_groups(self):
         url = BASE_URL
         return self.subcloud_peer_group_list(url)
@@ -23,6 +23,17 @@ from dcmanagerclient.api.base import get_json
 
 class SwUpdateStrategy(base.Resource):
     resource_name = "sw_update_strategy"
+    __slots__ = (
+        "manager",
+        "strategy_type",
+        "subcloud_apply_type",
+        "max_parallel_subclouds",
+        "stop_on_failure",
+        "state",
+        "created_at",
+        "updated_at",
+        "extra_args",
+    )
 
     def __init__(
         self,
@@ -86,8 +97,8 @@ class SwUpdateManager(base.ResourceManager):
             data.update({"type": self.update_type})
         return self._sw_update_create(self.create_url, data)
 
-    def update_sw_strategy_detail(self):
-        return self._sw_update_detail(self.get_url)
+    def update_sw_strategy_detail(self, cache=True):
+        return self._sw_update_detail(self.get_url, cache)
 
     def delete_sw_update_strategy(self):
         return self._sw_update_delete(self.delete_url)
@@ -146,8 +157,8 @@ class SwUpdateManager(base.ResourceManager):
         resource.append(self._build_from_json(json_object))
         return resource
 
-    def _sw_update_detail(self, url):
-        resp = self.http_client.get(url)
+    def _sw_update_detail(self, url, cache=True):
+        resp = self.http_client.get(url, cache=cache)
         if resp.status_code != 200:
             self._raise_api_exception(resp)
         json_object = get_json(resp)
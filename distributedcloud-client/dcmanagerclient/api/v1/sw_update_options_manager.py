@@ -25,6 +25,17 @@ DEFAULT_REGION_NAME = "SystemController"
 
 class SwUpdateOptions(base.Resource):
     resource_name = "sw_update_options"
+    __slots__ = (
+        "manager",
+        "cloud",
+        "storage_apply_type",
+        "worker_apply_type",
+        "max_parallel_workers",
+        "alarm_restriction_type",
+        "default_instance_action",
+        "created_at",
+        "updated_at",
+    )
 
     def __init__(
         self,
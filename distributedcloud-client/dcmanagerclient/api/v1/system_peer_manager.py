@@ -14,6 +14,23 @@ BASE_URL = "/system-peers/"
 
 class SystemPeer(base.Resource):
     resource_name = "system_peer"
+    __slots__ = (
+        "manager",
+        "peer_id",
+        "peer_uuid",
+        "peer_name",
+        "manager_endpoint",
+        "manager_username",
+        "gateway_address",
+        "administrative_state",
+        "heartbeat_interval",
+        "heartbeat_failure_threshold",
+        "heartbeat_failure_policy",
+        "heartbeat_maintenance_timeout",
+        "availability_state",
+        "created_at",
+        "updated_at",
+    )
 
     def __init__(
         self,
@@ -0,0 +1,329 @@
+# Copyright (c) 2026 Wind River Systems, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+
+"""Runs several commands in one process with a single authenticated client.
+
+The batch command reads the commands from a file or the standard input, the
+serve command keeps the client warm and runs the commands forwarded by later
+dcmanager invocations over a local Unix socket. The forwarded commands run in
+the working directory and with the environment variables of the invocation,
+the commands prompting for input run locally instead.
+"""
+
+import contextlib
+import io
+import json
+import logging
+import os
+import shlex
+import socket
+import stat
+import sys
+
+from osc_lib.command import command
+
+from dcmanagerclient import exceptions
+from dcmanagerclient import utils
+
+LOG = logging.getLogger(__name__)
+
+# The invocations are forwarded to the server listening on this socket
+SOCKET_ENV = "DCMANAGER_SOCKET"
+SOCKET_NAME = "dcmanager.sock"
+# Seconds to wait for the server to reply, the forwarded command included
+SOCKET_TIMEOUT_ENV = "DCMANAGER_SOCKET_TIMEOUT"
+DEFAULT_SOCKET_TIMEOUT = 600
+MAX_REQUEST_SIZE = 1024 * 1024
+# Environment variables of the invocation the forwarded commands run with
+FORWARDED_ENV = ("CLI_CONFIRMATIONS",)
+NESTED_COMMANDS = ("batch", "serve")
+LOG_FORMAT = "%(levelname)s (%(module)s) %(message)s"
+
+
+def default_socket_path():
+    return os.path.join(utils.runtime_dir(), SOCKET_NAME)
+
+
+def run_command(app, argv):
+    """Runs a command of an initialized application, returning its status."""
+    if argv[0] in NESTED_COMMANDS:
+        LOG.error("The %s command can not be nested", argv[0])
+        return 2
+
+    try:
+        return app.run_subcommand(argv)
+    except SystemExit as exc:
+        # Raised by argparse on invalid arguments and after printing help
+        if exc.code is None:
+            return 0
+        return exc.code if isinstance(exc.code, int) else 1
+
+
+def _read_all(sock):
+    chunks = []
+    size = 0
+    while True:
+        chunk = sock.recv(65536)
+        if not chunk:
+            return b"".join(chunks)
+        size += len(chunk)
+        if size > MAX_REQUEST_SIZE:
+            raise ValueError("Request too large")
+        chunks.append(chunk)
+
+
+def _may_prompt(argv, env):
+    """Whether the command may prompt for a confirmation."""
+    return env.get("CLI_CONFIRMATIONS") == "enabled" and "--yes" not in argv
+
+
+def forward(socket_path, argv, stdout=None, stderr=None):
+    """Runs a command on the server listening on the socket.
+
+    Returns the exit status of the command or None when it is expected to
+    run locally, because no server is listening or the command prompts for
+    input. Raises DCManagerClientException when the server does not reply.
+    """
+    stdout = stdout or sys.stdout
+    stderr = stderr or sys.stderr
+    env = {name: os.environ[name] for name in FORWARDED_ENV if name in os.environ}
+    if _may_prompt(argv, env):
+        LOG.debug("Not forwarding a command prompting for a confirmation")
+        return None
+    request = {"argv": argv, "cwd": os.getcwd(), "env": env}
+    timeout = float(os.environ.get(SOCKET_TIMEOUT_ENV, DEFAULT_SOCKET_TIMEOUT))
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        try:
+            sock.connect(socket_path)
+        except OSError as exc:
+            LOG.debug("Not forwarding the command to %s: %s", socket_path, exc)
+            return None
+
+        try:
+            sock.sendall(json.dumps(request).encode("utf-8"))
+            sock.shutdown(socket.SHUT_WR)
+            reply = json.loads(_read_all(sock))
+            status = reply["status"]
+            if status is None:
+                LOG.debug("The server refused the command: %s", reply["stderr"])
+                return None
+            output, errors = reply["stdout"], reply["stderr"]
+        except (OSError, KeyError, TypeError, ValueError) as exc:
+            raise exceptions.DCManagerClientException(
+                f"No valid reply from the server on {socket_path}: {exc}"
+            ) from exc
+
+    stdout.write(output)
+    stderr.write(errors)
+    return status
+
+
+@contextlib.contextmanager
+def _environment(cwd, env):
+    """Sets the working directory and forwarded environment variables."""
+    saved_cwd = os.getcwd()
+    saved_env = {name: os.environ.get(name) for name in FORWARDED_ENV}
+    try:
+        os.chdir(cwd or saved_cwd)
+        for name in FORWARDED_ENV:
+            if name in env:
+                os.environ[name] = env[name]
+            else:
+                os.environ.pop(name, None)
+        yield
+    finally:
+        os.chdir(saved_cwd)
+        for name, value in saved_env.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+class CommandServer:
+    """Runs the commands received on a Unix socket, one at a time.
+
+    The socket is only accessible to the current user and the commands run
+    with the global options and the client of the serving application.
+    """
+
+    def __init__(self, app, socket_path):
+        self.app = app
+        self.socket_path = socket_path
+
+    def _bind(self):
+        if os.path.exists(self.socket_path):
+            if not stat.S_ISSOCK(os.lstat(self.socket_path).st_mode):
+                raise exceptions.DCManagerClientException(
+                    f"{self.socket_path} exists and is not a socket"
+                )
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+                if probe.connect_ex(self.socket_path) == 0:
+                    raise exceptions.DCManagerClientException(
+                        f"A server is already listening on {self.socket_path}"
+                    )
+            # Left behind by a server that did not exit cleanly
+            os.unlink(self.socket_path)
+
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        old_umask = os.umask(0o177)
+        try:
+            sock.bind(self.socket_path)
+        finally:
+            os.umask(old_umask)
+        sock.listen()
+        return sock
+
+    def execute(self, argv, cwd=None, env=None):
+        """Runs a command capturing its output, returns the reply.
+
+        The status of the reply is None when the command prompted for input,
+        the client then runs it with its terminal.
+        """
+        stdout = io.StringIO()
+        stderr = io.StringIO()
+        handler = logging.StreamHandler(stderr)
+        handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        root_logger = logging.getLogger()
+        app_streams = (self.app.stdout, self.app.stderr)
+
+        root_logger.addHandler(handler)
+        self.app.stdout, self.app.stderr = stdout, stderr
+        try:
+            with contextlib.ExitStack() as stack:
+                stack.enter_context(_environment(cwd, env or {}))
+                non_interactive = stack.enter_context(utils.NonInteractive())
+                stack.enter_context(contextlib.redirect_stdout(stdout))
+                stack.enter_context(contextlib.redirect_stderr(stderr))
+                status = run_command(self.app, argv)
+        finally:
+            self.app.stdout, self.app.stderr = app_streams
+            root_logger.removeHandler(handler)
+
+        if non_interactive.refused:
+            status = None
+
+        return {
+            "status": status,
+            "stdout": stdout.getvalue(),
+            "stderr": stderr.getvalue(),
+        }
+
+    def handle(self, conn):
+        try:
+            request = json.loads(_read_all(conn))
+            argv = request["argv"]
+            if not argv or not all(isinstance(arg, str) for arg in argv):
+                raise ValueError("Invalid command")
+            cwd = request.get("cwd")
+            if cwd is not None and not (isinstance(cwd, str) and os.path.isabs(cwd)):
+                raise ValueError("Invalid working directory")
+            env = request.get("env", {})
+            if not all(isinstance(env[name], str) for name in env):
+                raise ValueError("Invalid environment")
+            env = {name: env[name] for name in FORWARDED_ENV if name in env}
+        except (KeyError, TypeError, ValueError) as exc:
+            reply = {"status": 2, "stdout": "", "stderr": f"{exc}\n"}
+        else:
+            try:
+                reply = self.execute(argv, cwd=cwd, env=env)
+            except OSError as exc:
+                # e.g. the working directory of the client is not accessible
+                reply = {"status": None, "stdout": "", "stderr": f"{exc}\n"}
+        conn.sendall(json.dumps(reply).encode("utf-8"))
+
+    def serve_forever(self):
+        sock = self._bind()
+        self.app.stdout.write(f"Serving commands on {self.socket_path}\n")
+        self.app.stdout.flush()
+        try:
+            while True:
+                conn, _ = sock.accept()
+                with conn:
+                    try:
+                        self.handle(conn)
+                    except OSError as exc:
+                        LOG.warning("Lost connection to the client: %s", exc)
+        finally:
+            sock.close()
+            os.unlink(self.socket_path)
+
+
+class BatchCommand(command.Command):
+    """Run newline separated commands with a single authenticated client.
+
+    Empty lines and comments starting with # are ignored.
+    """
+
+    def get_parser(self, prog_name):
+        parser = super().get_parser(prog_name)
+        parser.add_argument(
+            "--file",
+            default="-",
+            help="File with the commands to run, the standard input by default.",
+        )
+        parser.add_argument(
+            "--stop-on-error",
+            action="store_true",
+            help="Stop at the first command that fails.",
+        )
+        return parser
+
+    def take_action(self, parsed_args):
+        # All the commands are read first so a command prompting for input
+        # does not consume the following ones
+        if parsed_args.file == "-":
+            lines = sys.stdin.read().splitlines()
+        else:
+            with open(parsed_args.file, encoding="utf-8") as batch_file:
+                lines = batch_file.read().splitlines()
+
+        failures = 0
+        for line_number, line in enumerate(lines, 1):
+            try:
+                argv = shlex.split(line, comments=True)
+            except ValueError as exc:
+                LOG.error("Line %d: %s", line_number, exc)
+                status = 2
+            else:
+                if not argv:
+                    continue
+                status = run_command(self.app, argv)
+
+            if status:
+                failures += 1
+                LOG.error("Line %d failed with status %s", line_number, status)
+                if parsed_args.stop_on_error:
+                    break
+
+        return 1 if failures else 0
+
+
+class ServeCommand(command.Command):
+    """Serve commands on a local socket keeping the client authenticated.
+
+    Later dcmanager invocations are forwarded to the server when the
+    DCMANAGER_SOCKET environment variable is set to its socket. The commands
+    run with the global options the server was started with.
+    """
+
+    def get_parser(self, prog_name):
+        parser = super().get_parser(prog_name)
+        parser.add_argument(
+            "--socket",
+            help="Path of the socket, by default dcmanager.sock in the "
+            "runtime directory of the user.",
+        )
+        return parser
+
+    def take_action(self, parsed_args):
+        socket_path = parsed_args.socket or default_socket_path()
+        try:
+            CommandServer(self.app, socket_path).serve_forever()
+        except KeyboardInterrupt:
+            pass
+        return 0
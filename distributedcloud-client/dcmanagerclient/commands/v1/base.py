@@ -17,6 +17,7 @@
 #
 
 import abc
+import types
 
 from osc_lib.command import command
 
@@ -67,13 +68,17 @@ class ConfirmationMixin(DCManagerBase):
         return super().take_action(parsed_args)
 
 
+# Errors of a stale token, retried once with a reloaded client
+AUTH_ERROR_CODES = (401, 403)
+
+
 class AuthErrorRetryMixin:
     def retry_on_auth_error(self, f, args):
         try:
             return f(args)
         except Exception as exc:
             if (
-                getattr(exc, "error_code", None) in (401, 403)
+                getattr(exc, "error_code", None) in AUTH_ERROR_CODES
                 and getattr(self, "app", None)
                 and getattr(self.app, "load_client", None)
             ):
@@ -112,6 +117,10 @@ class DCManagerLister(
         f = self._get_format_function()
 
         ret = self._get_resources(parsed_args)
+        if isinstance(ret, types.GeneratorType):
+            # Hand the rows to the formatter as the resources are produced
+            return f()[0], (f(r)[1] for r in ret)
+
         if not isinstance(ret, list):
             ret = [ret]
 
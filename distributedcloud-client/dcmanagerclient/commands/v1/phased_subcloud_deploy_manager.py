@@ -159,9 +159,10 @@ class PhasedSubcloudDeployResume(base.DCManagerShowOne):
         if parsed_args.release:
             data["release"] = parsed_args.release
 
-        return phased_subcloud_deploy_manager.subcloud_deploy_resume(
-            subcloud_ref=subcloud_ref, files=files, data=data
-        )
+        with utils.UploadProgress(self.app.stderr) as progress:
+            return phased_subcloud_deploy_manager.subcloud_deploy_resume(
+                subcloud_ref=subcloud_ref, files=files, data=data, progress=progress
+            )
 
 
 class CreatePhasedSubcloudDeploy(base.DCManagerShowOne):
@@ -268,9 +269,10 @@ class CreatePhasedSubcloudDeploy(base.DCManagerShowOne):
         if parsed_args.release:
             data["release"] = parsed_args.release
 
-        return phased_subcloud_deploy_manager.subcloud_deploy_create(
-            files=files, data=data
-        )
+        with utils.UploadProgress(self.app.stderr) as progress:
+            return phased_subcloud_deploy_manager.subcloud_deploy_create(
+                files=files, data=data, progress=progress
+            )
 
 
 class InstallPhasedSubcloudDeploy(base.DCManagerShowOne):
@@ -345,9 +347,10 @@ class InstallPhasedSubcloudDeploy(base.DCManagerShowOne):
             data["release"] = parsed_args.release
 
         try:
-            return phased_subcloud_deploy_manager.subcloud_deploy_install(
-                subcloud_ref=subcloud_ref, files=files, data=data
-            )
+            with utils.UploadProgress(self.app.stderr) as progress:
+                return phased_subcloud_deploy_manager.subcloud_deploy_install(
+                    subcloud_ref=subcloud_ref, files=files, data=data, progress=progress
+                )
         except Exception as exc:
             error_msg = f"Unable to install subcloud {subcloud_ref}"
             return utils.raise_client_exception(error_msg, exc)
@@ -411,9 +414,10 @@ class BootstrapPhasedSubcloudDeploy(base.DCManagerShowOne):
 
         subcloud_ref = parsed_args.subcloud
 
-        return phased_subcloud_deploy_manager.subcloud_deploy_bootstrap(
-            subcloud_ref, files=files, data=data
-        )
+        with utils.UploadProgress(self.app.stderr) as progress:
+            return phased_subcloud_deploy_manager.subcloud_deploy_bootstrap(
+                subcloud_ref, files=files, data=data, progress=progress
+            )
 
 
 class ConfigPhasedSubcloudDeploy(base.DCManagerShowOne):
@@ -466,9 +470,10 @@ class ConfigPhasedSubcloudDeploy(base.DCManagerShowOne):
         utils.set_sysadmin_password(parsed_args, data)
 
         try:
-            return phased_subcloud_deploy_manager.subcloud_deploy_config(
-                subcloud_ref=subcloud_ref, files=files, data=data
-            )
+            with utils.UploadProgress(self.app.stderr) as progress:
+                return phased_subcloud_deploy_manager.subcloud_deploy_config(
+                    subcloud_ref=subcloud_ref, files=files, data=data, progress=progress
+                )
         except Exception as exc:
             error_msg = f"Unable to configure subcloud {subcloud_ref}"
             return utils.raise_client_exception(error_msg, exc)
@@ -612,9 +617,10 @@ class EnrollPhasedSubcloudDeploy(base.DCManagerShowOne):
         subcloud_ref = parsed_args.subcloud
 
         try:
-            return phased_subcloud_deploy_manager.subcloud_deploy_enroll(
-                subcloud_ref, files=files, data=data
-            )
+            with utils.UploadProgress(self.app.stderr) as progress:
+                return phased_subcloud_deploy_manager.subcloud_deploy_enroll(
+                    subcloud_ref, files=files, data=data, progress=progress
+                )
 
         except Exception as exc:
             error_msg = f"Unable to enroll subcloud {subcloud_ref}"
@@ -192,9 +192,10 @@ class CreateSubcloudBackup(base.DCManagerShow):
             files["backup_values"] = parsed_args.backup_values
 
         try:
-            return subcloud_backup_manager.backup_subcloud_create(
-                data=data, files=files
-            )
+            with utils.UploadProgress(self.app.stderr) as progress:
+                return subcloud_backup_manager.backup_subcloud_create(
+                    data=data, files=files, progress=progress
+                )
 
         except Exception as exc:
             error_msg = "Unable to create subcloud backup"
@@ -466,9 +467,10 @@ class RestoreSubcloudBackup(base.DCManagerShow):
             ).decode("utf-8")
 
         try:
-            return subcloud_backup_manager.backup_subcloud_restore(
-                data=data, files=files
-            )
+            with utils.UploadProgress(self.app.stderr) as progress:
+                return subcloud_backup_manager.backup_subcloud_restore(
+                    data=data, files=files, progress=progress
+                )
 
         except Exception as exc:
             error_msg = "Unable to restore subcloud backup"
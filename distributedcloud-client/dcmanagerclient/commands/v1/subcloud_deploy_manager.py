@@ -18,9 +18,12 @@ import os
 from osc_lib.command import command
 
 from dcmanagerclient import exceptions
+from dcmanagerclient.api.v1 import subcloud_deploy_manager as deploy_api
 from dcmanagerclient.commands.v1 import base
 from dcmanagerclient import utils
 
+MIB = 1024 * 1024
+
 
 def _format(subcloud_deploy=None):
     columns = (
@@ -105,11 +108,33 @@ class SubcloudDeployUpload(base.DCManagerShowOne):
             "the subcloud with. If not specified, the current software "
             "release of the system controller will be used.",
         )
+
+        self.add_argument(
+            "--chunked",
+            required=False,
+            action="store_true",
+            help="Upload the files larger than the chunk size in chunks, "
+            "resuming an interrupted upload of the same files. A single request "
+            "is used when the system controller does not support it.",
+        )
+
+        self.add_argument(
+            "--chunk-size",
+            required=False,
+            type=int,
+            default=deploy_api.DEFAULT_CHUNK_SIZE // MIB,
+            help="Size of the chunks in MiB, defaults to %(default)s.",
+        )
         return parser
 
     def _get_resources(self, parsed_args):
         subcloud_deploy_manager = self.app.client_manager.subcloud_deploy_manager
 
+        if parsed_args.chunk_size < 1:
+            raise exceptions.DCManagerClientException(
+                "The chunk size must be at least 1 MiB"
+            )
+
         data = {}
         files = {}
         variable_dict = {
@@ -130,9 +155,15 @@ class SubcloudDeployUpload(base.DCManagerShowOne):
             data["release"] = parsed_args.release
 
         try:
-            return subcloud_deploy_manager.subcloud_deploy_upload(
-                files=files, data=data
-            )
+            with utils.UploadProgress(self.app.stderr) as progress:
+                return subcloud_deploy_manager.subcloud_deploy_upload(
+                    files=files,
+                    data=data,
+                    progress=progress,
+                    chunk_size=(
+                        parsed_args.chunk_size * MIB if parsed_args.chunked else None
+                    ),
+                )
         except Exception as exc:
             error_msg = "Unable to upload subcloud deploy files"
             return utils.raise_client_exception(error_msg, exc)
@@ -25,6 +25,9 @@ from dcmanagerclient.commands.v1 import base
 
 SET_FIELD_VALUE_DICT = {"region_name": None, "info_message": None}
 
+# Subclouds in these deploy states are hidden unless explicitly requested
+SECONDARY_DEPLOY_STATES = ("secondary", "secondary-failed")
+
 
 def basic_format(subcloud=None):
     columns = (
@@ -174,6 +177,60 @@ def detail_list_format(subcloud=None):
     return columns, data
 
 
+def detail_many_format(subcloud=None):
+    columns, data = detail_list_format(subcloud)
+
+    columns += ("oam_floating_ip", "deploy_config_sync_status", "region_name")
+    if subcloud:
+        data += (
+            subcloud.oam_floating_ip,
+            subcloud.deploy_config_sync_status,
+            subcloud.region_name,
+        )
+    else:
+        data = (tuple("<none>" for _ in range(len(columns))),)
+
+    return columns, data
+
+
+def bulk_result_format(result=None):
+    """Formats a (subcloud_ref, subcloud, exception) result of a bulk action."""
+    columns = ("subcloud", "result", "management", "availability", "error")
+
+    if result:
+        subcloud_ref, subcloud, error = result
+        if error is None:
+            data = (
+                subcloud.name,
+                "success",
+                subcloud.management_state,
+                subcloud.availability_status,
+                "<none>",
+            )
+        else:
+            data = (subcloud_ref, "failed", "<none>", "<none>", str(error))
+    else:
+        data = (tuple("<none>" for _ in range(len(columns))),)
+
+    return columns, data
+
+
+def delete_result_format(result=None):
+    """Formats a (subcloud_ref, exception) result of a bulk deletion."""
+    columns = ("subcloud", "result", "error")
+
+    if result:
+        subcloud_ref, error = result
+        if error is None:
+            data = (subcloud_ref, "deleted", "<none>")
+        else:
+            data = (subcloud_ref, "failed", str(error))
+    else:
+        data = (tuple("<none>" for _ in range(len(columns))),)
+
+    return columns, data
+
+
 # The API is returning the region_name field, however only the list
 # and show commands should consider the region name field.
 # The other commands do not required it, since the output should
@@ -362,7 +419,10 @@ class AddSubcloud(base.DCManagerShowOne):
                     --migrate option."
                 raise exceptions.DCManagerClientException(error_msg)
 
-        result = subcloud_manager.add_subcloud(files=files, data=data)
+        with utils.UploadProgress(self.app.stderr) as progress:
+            result = subcloud_manager.add_subcloud(
+                files=files, data=data, progress=progress
+            )
         update_fields_values(result)
         return result
 
@@ -378,6 +438,14 @@ class ListSubcloud(base.DCManagerLister):
 
     def _validate_parsed_args(self, parsed_args):
         self.show_basic_list = not (parsed_args.columns or parsed_args.detail)
+        if parsed_args.stream and (
+            parsed_args.limit is not None or parsed_args.marker is not None
+        ):
+            error_msg = "The --stream option cannot be used with --limit or --marker."
+            raise exceptions.DCManagerClientException(error_msg)
+        if parsed_args.limit is not None and parsed_args.limit < 1:
+            error_msg = "The --limit value must be a positive integer."
+            raise exceptions.DCManagerClientException(error_msg)
 
     def _get_format_function(self):
         return basic_format if self.show_basic_list else detail_list_format
@@ -397,36 +465,135 @@ class ListSubcloud(base.DCManagerLister):
             action="store_true",
             help="List all columns of the subclouds",
         )
+        self.add_argument(
+            "--deploy-status",
+            required=False,
+            action="append",
+            help="Only list subclouds with this deploy status. Can be repeated.",
+        )
+        self.add_argument(
+            "--availability",
+            required=False,
+            choices=["online", "offline"],
+            help="Only list subclouds with this availability status",
+        )
+        self.add_argument(
+            "--management",
+            required=False,
+            choices=["managed", "unmanaged"],
+            help="Only list subclouds with this management state",
+        )
+        self.add_argument(
+            "--group",
+            required=False,
+            help="Only list subclouds of this subcloud group (name or ID)",
+        )
+        self.add_argument(
+            "--peer-group",
+            required=False,
+            help="Only list subclouds of this subcloud peer group (name or ID)",
+        )
+        self.add_argument(
+            "--name-prefix",
+            required=False,
+            help="Only list subclouds whose name starts with this prefix",
+        )
+        self.add_argument(
+            "--limit",
+            required=False,
+            type=int,
+            help="Maximum number of subclouds to list",
+        )
+        self.add_argument(
+            "--marker",
+            required=False,
+            help="ID of the last subcloud of the previous page, the listing "
+            "starts after it",
+        )
+        self.add_argument(
+            "--stream",
+            required=False,
+            action="store_true",
+            help="Decode and output the subclouds one at a time as they are "
+            "received, keeping the memory usage constant. Rows are printed "
+            "immediately with the value and csv formatters.",
+        )
         return parser
 
     def _get_resources(self, parsed_args):
         subcloud_manager = self.app.client_manager.subcloud_manager
-        subclouds = subcloud_manager.list_subclouds()
 
+        group_id = parsed_args.group
+        if group_id and not group_id.isdigit():
+            subcloud_group_manager = self.app.client_manager.subcloud_group_manager
+            group_id = subcloud_group_manager.get_subcloud_group_id(group_id)
+
+        peer_group_id = parsed_args.peer_group
+        if peer_group_id and not peer_group_id.isdigit():
+            peer_group_manager = self.app.client_manager.subcloud_peer_group_manager
+            peer_group_id = peer_group_manager.get_subcloud_peer_group_id(peer_group_id)
+
+        filters = {
+            "deploy_status": parsed_args.deploy_status,
+            "availability_status": parsed_args.availability,
+            "management_state": parsed_args.management,
+            "group_id": group_id,
+            "peer_group_id": peer_group_id,
+            "name_prefix": parsed_args.name_prefix,
+        }
         # for '--all' parameter, show all subclouds.
         # for no parameter, hidden all 'secondary/secondary-failed'
-        # state subclouds.
-        if parsed_args.all:
-            return subclouds
-        filtered_subclouds = [
-            s
-            for s in subclouds
-            if s.deploy_status not in ("secondary", "secondary-failed")
-        ]
-        return filtered_subclouds
+        # state subclouds. Subclouds explicitly filtered by deploy status
+        # are shown as is. They are excluded before the --limit is applied.
+        if not (parsed_args.all or parsed_args.deploy_status):
+            filters["exclude_deploy_status"] = SECONDARY_DEPLOY_STATES
+
+        if parsed_args.stream:
+            return subcloud_manager.stream_subclouds(**filters)
+        return subcloud_manager.list_subclouds(
+            limit=parsed_args.limit, marker=parsed_args.marker, **filters
+        )
+
 
+class ShowSubcloud(base.DCManagerShow):
+    """Show the details of one or more subclouds."""
 
-class ShowSubcloud(base.DCManagerShowOne):
-    """Show the details of a subcloud."""
+    def __init__(self, app, app_args):
+        super().__init__(app, app_args)
+        # Set a flag to indicate showing a single subcloud or a list of them
+        self.show_many = False
+        self.failed = []
 
     def _get_format_function(self):
-        return detail_show_format
+        return detail_many_format if self.show_many else detail_show_format
+
+    def should_list(self, parsed_args):
+        return bool(
+            parsed_args.all or parsed_args.group or len(parsed_args.subcloud) > 1
+        )
+
+    def _validate_parsed_args(self, parsed_args):
+        self.show_many = self.should_list(parsed_args)
+        if parsed_args.all and parsed_args.group:
+            error_msg = "The --all and --group options cannot be combined."
+            raise exceptions.DCManagerClientException(error_msg)
+        if (parsed_args.all or parsed_args.group) and parsed_args.subcloud:
+            error_msg = "Subclouds cannot be specified together with --all or --group."
+            raise exceptions.DCManagerClientException(error_msg)
+        if not (parsed_args.all or parsed_args.group or parsed_args.subcloud):
+            error_msg = "A subcloud, --group or --all must be specified."
+            raise exceptions.DCManagerClientException(error_msg)
+        if parsed_args.concurrency < 1:
+            error_msg = "The --concurrency value must be a positive integer."
+            raise exceptions.DCManagerClientException(error_msg)
 
     def get_parser(self, prog_name):
         parser = super().get_parser(prog_name)
 
         self.add_argument(
-            "subcloud", help="Name or ID of subcloud to view the details."
+            "subcloud",
+            nargs="*",
+            help="Name or ID of the subcloud(s) to view the details.",
         )
 
         self.add_argument(
@@ -436,10 +603,35 @@ class ShowSubcloud(base.DCManagerShowOne):
             help="Show additional details for a subcloud",
         )
 
+        self.add_argument(
+            "--group",
+            required=False,
+            help="Name or ID of the subcloud group whose subclouds are shown.",
+        )
+
+        self.add_argument(
+            "--all",
+            required=False,
+            action="store_true",
+            help="Show all subclouds.",
+        )
+
+        self.add_argument(
+            "--concurrency",
+            required=False,
+            type=int,
+            default=utils.DEFAULT_MAX_WORKERS,
+            help="Maximum number of subclouds queried in parallel when "
+            f"showing many subclouds (default: {utils.DEFAULT_MAX_WORKERS}).",
+        )
+
         return parser
 
     def _get_resources(self, parsed_args):
-        subcloud_ref = parsed_args.subcloud
+        if self.show_many:
+            return self._get_many_resources(parsed_args)
+
+        subcloud_ref = parsed_args.subcloud[0]
         if not subcloud_ref:
             raise exceptions.DCManagerClientException(
                 "Subcloud cannot be an empty value."
@@ -450,6 +642,70 @@ class ShowSubcloud(base.DCManagerShowOne):
             return subcloud_manager.subcloud_additional_details(subcloud_ref)
         return subcloud_manager.subcloud_detail(subcloud_ref)
 
+    def _get_many_resources(self, parsed_args):
+        subcloud_manager = self.app.client_manager.subcloud_manager
+
+        if parsed_args.subcloud:
+            subcloud_refs = parsed_args.subcloud
+            subclouds = None
+        else:
+            if parsed_args.group:
+                subcloud_group_manager = self.app.client_manager.subcloud_group_manager
+                subclouds = subcloud_group_manager.subcloud_group_list_subclouds(
+                    parsed_args.group
+                )
+            else:
+                subclouds = subcloud_manager.list_subclouds()
+            subcloud_refs = [subcloud.name for subcloud in subclouds]
+
+        if subclouds is not None and not parsed_args.detail:
+            # The listed subclouds already carry all the basic details
+            return (subcloud for subcloud in subclouds)
+
+        if parsed_args.detail:
+            results = subcloud_manager.subclouds_additional_details(
+                subcloud_refs, max_workers=parsed_args.concurrency
+            )
+        else:
+            results = subcloud_manager.subclouds_detail(
+                subcloud_refs, max_workers=parsed_args.concurrency
+            )
+        return self._collect_results(results)
+
+    def _collect_results(self, results):
+        """Returns the subclouds shown and records the failed ones.
+
+        The results are resolved here rather than by the formatter, which
+        reads every row before writing any, so an authentication error is
+        retried by take_action and the other failures do not hide the rows
+        of the subclouds shown.
+        """
+        self.failed = []
+        subclouds = []
+        for subcloud_ref, result, error in results:
+            if error is None:
+                subclouds.extend(result)
+                continue
+            if getattr(error, "error_code", None) in base.AUTH_ERROR_CODES:
+                raise error
+            self.failed.append(subcloud_ref)
+            self.app.stderr.write(f"Unable to show subcloud {subcloud_ref}: {error}\n")
+        # Shown as rows, even when there is none
+        return (subcloud for subcloud in subclouds)
+
+    def produce_output(self, parsed_args, column_names, data):
+        """Overrides method from DCManagerShow.
+
+        The failures are reported once the other subclouds are shown.
+        """
+        result = super().produce_output(parsed_args, column_names, data)
+        if self.failed:
+            raise exceptions.DCManagerClientException(
+                f"Unable to show {len(self.failed)} subcloud(s): "
+                f"{', '.join(self.failed)}"
+            )
+        return result
+
 
 class ShowSubcloudError(base.CacheRetryMixin, base.DCManagerBase, command.Command):
     """Show the error of the last failed operation."""
@@ -474,78 +730,362 @@ class ShowSubcloudError(base.CacheRetryMixin, base.DCManagerBase, command.Comman
         print("".join(data))
 
 
-class DeleteSubcloud(base.CacheRetryMixin, base.ConfirmationMixin, command.Command):
-    """Delete subcloud details from the database."""
+class SubcloudSelectionMixin:
+    """Selects the subclouds of a bulk action.
+
+    The subclouds are given by name or ID, or selected from all of them,
+    a subcloud group or a subcloud peer group and the optional filters.
+    """
+
+    def _add_selection_arguments(self, action, allow_all=True):
+        selection = self.parser.add_mutually_exclusive_group(required=True)
+        selection.add_argument(
+            "subcloud",
+            nargs="*",
+            default=[],
+            help=f"Name or ID of the subcloud(s) to {action}.",
+        )
+        selection.add_argument(
+            "--group",
+            help=f"Name or ID of the subcloud group whose subclouds to {action}.",
+        )
+        selection.add_argument(
+            "--peer-group",
+            help=f"Name or ID of the subcloud peer group whose subclouds to {action}.",
+        )
+        if allow_all:
+            selection.add_argument(
+                "--all",
+                action="store_true",
+                help=f"Select all subclouds to {action}.",
+            )
+
+        self.add_argument(
+            "--availability",
+            required=False,
+            choices=["online", "offline"],
+            help="Only select subclouds with this availability status.",
+        )
+        self.add_argument(
+            "--deploy-status",
+            required=False,
+            action="append",
+            help="Only select subclouds with this deploy status. Can be repeated.",
+        )
+        self.add_argument(
+            "--name-prefix",
+            required=False,
+            help="Only select subclouds whose name starts with this prefix.",
+        )
+        self.add_argument(
+            "--concurrency",
+            required=False,
+            type=int,
+            default=utils.DEFAULT_MAX_WORKERS,
+            help="Maximum number of subclouds processed in parallel "
+            f"(default: {utils.DEFAULT_MAX_WORKERS}).",
+        )
+
+    @staticmethod
+    def _validate_selection(parsed_args):
+        filtered = (
+            parsed_args.availability
+            or parsed_args.deploy_status
+            or parsed_args.name_prefix
+        )
+        if parsed_args.subcloud and filtered:
+            error_msg = (
+                "The filters can only be used with --all, --group or --peer-group."
+            )
+            raise exceptions.DCManagerClientException(error_msg)
+        if parsed_args.concurrency < 1:
+            error_msg = "The --concurrency value must be a positive integer."
+            raise exceptions.DCManagerClientException(error_msg)
+
+    def _select_subcloud_refs(self, parsed_args, **filters):
+        """Returns the names of the selected subclouds."""
+        if parsed_args.subcloud:
+            return parsed_args.subcloud
+
+        client_manager = self.app.client_manager
+        group_id = peer_group_id = None
+        if parsed_args.group:
+            group_id = client_manager.subcloud_group_manager.get_subcloud_group_id(
+                parsed_args.group
+            )
+        if parsed_args.peer_group:
+            peer_group_manager = client_manager.subcloud_peer_group_manager
+            peer_group_id = peer_group_manager.get_subcloud_peer_group_id(
+                parsed_args.peer_group
+            )
+
+        subclouds = client_manager.subcloud_manager.list_subclouds(
+            deploy_status=parsed_args.deploy_status,
+            availability_status=parsed_args.availability,
+            group_id=group_id,
+            peer_group_id=peer_group_id,
+            name_prefix=parsed_args.name_prefix,
+            **filters,
+        )
+        return [
+            subcloud.name
+            for subcloud in subclouds
+            if parsed_args.deploy_status
+            or subcloud.deploy_status not in SECONDARY_DEPLOY_STATES
+        ]
+
+
+class DeleteSubcloud(
+    SubcloudSelectionMixin, base.CacheRetryMixin, base.ConfirmationMixin, command.Lister
+):
+    """Delete one or more subclouds from the database.
+
+    Many subclouds are deleted in parallel after a single confirmation. A
+    report with the result of each of them is shown, which can be output as
+    JSON with -f json, and the command fails if any of the deletions failed.
+    """
 
     requires_confirmation = True
 
+    def __init__(self, app, app_args):
+        super().__init__(app, app_args)
+        # Set a flag to indicate deleting a single subcloud or many of them
+        self.delete_many = False
+        self.failed = []
+
+    def should_list(self, parsed_args):
+        return bool(
+            parsed_args.group or parsed_args.peer_group or len(parsed_args.subcloud) > 1
+        )
+
     def get_parser(self, prog_name):
         parser = super().get_parser(prog_name)
-
-        self.add_argument("subcloud", help="Name or ID of the subcloud to delete.")
+        self._add_selection_arguments("delete", allow_all=False)
         return parser
 
+    def take_action(self, parsed_args):
+        # Rejects the filters given with a subcloud before deleting anything
+        self._validate_selection(parsed_args)
+        self.delete_many = self.should_list(parsed_args)
+        if not self.delete_many:
+            return super().take_action(parsed_args)
+
+        return self.retry_on_auth_error(self._delete_many, parsed_args)
+
     def _take_action(self, parsed_args):
-        subcloud_ref = parsed_args.subcloud
+        subcloud_ref = parsed_args.subcloud[0]
         subcloud_manager = self.app.client_manager.subcloud_manager
         try:
             subcloud_manager.delete_subcloud(subcloud_ref)
         except Exception as exc:
             error_msg = f"Unable to delete subcloud {subcloud_ref}"
             utils.raise_client_exception(error_msg, exc)
+        return delete_result_format()
 
+    def _delete_many(self, parsed_args):
+        subcloud_refs = self._select_subcloud_refs(parsed_args)
+        if not subcloud_refs:
+            raise exceptions.DCManagerClientException(
+                "No subcloud matches the selection."
+            )
+        # A single confirmation is requested for all the subclouds
+        utils.CLIUtils.prompt_cli_confirmation_if_required(
+            self.requires_confirmation, parsed_args, resources=subcloud_refs
+        )
 
-class UnmanageSubcloud(base.DCManagerShowOne):
-    """Unmanage a subcloud."""
+        subcloud_manager = self.app.client_manager.subcloud_manager
+        results = subcloud_manager.delete_subclouds(
+            subcloud_refs, max_workers=parsed_args.concurrency
+        )
+        progress = utils.ProgressLine(self.app.stderr)
+        rows = []
+        try:
+            for subcloud_ref, _result, error in results:
+                if error is not None:
+                    self.failed.append(subcloud_ref)
+                rows.append(delete_result_format((subcloud_ref, error))[1])
+                progress.update(
+                    f"Deleting subclouds: {len(rows)}/{len(subcloud_refs)} done, "
+                    f"{len(self.failed)} failed"
+                )
+        finally:
+            progress.close()
 
-    requires_confirmation = True
+        return delete_result_format()[0], rows
+
+    def produce_output(self, parsed_args, column_names, data):
+        """Overrides method from cliff.Lister.
+
+        Nothing is shown when deleting a single subcloud, the failures of
+        many deletions are reported once the report is shown.
+        """
+        if not self.delete_many:
+            return 0
+
+        result = super().produce_output(parsed_args, column_names, data)
+        if self.failed:
+            raise exceptions.DCManagerClientException(
+                f"Unable to delete {len(self.failed)} subcloud(s): "
+                f"{', '.join(sorted(self.failed))}"
+            )
+        return result
+
+
+class ManagementStateCommand(SubcloudSelectionMixin, base.DCManagerShow):
+    """Base of the commands changing the management state of subclouds.
+
+    A single subcloud is shown in detail. Many subclouds are updated in
+    parallel, a row is shown for the result of each of them and the command
+    fails after all of them were attempted if any of the updates failed.
+    """
+
+    action = None
+    management_state = None
+    # Only the subclouds in this state are selected by the filters
+    selected_state = None
+
+    def __init__(self, app, app_args):
+        super().__init__(app, app_args)
+        # Set a flag to indicate updating a single subcloud or many of them
+        self.update_many = False
+        self.subcloud_refs = []
+        self.failed = []
 
     def _get_format_function(self):
+        # Many subclouds are formatted by _update_many
         return detail_format
 
+    def should_list(self, parsed_args):
+        return bool(
+            parsed_args.all
+            or parsed_args.group
+            or parsed_args.peer_group
+            or len(parsed_args.subcloud) > 1
+        )
+
+    def _validate_parsed_args(self, parsed_args):
+        self.update_many = self.should_list(parsed_args)
+        self._validate_selection(parsed_args)
+
     def get_parser(self, prog_name):
         parser = super().get_parser(prog_name)
+        self._add_selection_arguments(self.action)
+        return parser
 
-        self.add_argument("subcloud", help="Name or ID of the subcloud to unmanage.")
+    def _get_data(self, parsed_args):  # pylint: disable=unused-argument
+        return {"management-state": self.management_state}
 
-        self.add_argument(
-            "--migrate",
-            required=False,
-            action="store_true",
-            help="Mark the subcloud for an upcoming migration.",
+    def take_action(self, parsed_args):
+        # Rejects an invalid selection before anything is confirmed, the
+        # single subcloud case is confirmed by DCManagerShowOne
+        self._validate_parsed_args(parsed_args)
+        if not self.update_many:
+            return super().take_action(parsed_args)
+
+        self.subcloud_refs = self.retry_on_auth_error(self._select_many, parsed_args)
+        # A single confirmation is requested for all the subclouds
+        utils.CLIUtils.prompt_cli_confirmation_if_required(
+            self.requires_confirmation, parsed_args, resources=self.subcloud_refs
         )
-        return parser
+        return self.retry_on_auth_error(self._update_many, parsed_args)
 
     def _get_resources(self, parsed_args):
-        subcloud_ref = parsed_args.subcloud
         subcloud_manager = self.app.client_manager.subcloud_manager
-        kwargs = {}
-        kwargs["management-state"] = "unmanaged"
-
-        if parsed_args.migrate:
-            kwargs["migrate"] = "true"
-
+        data = self._get_data(parsed_args)
+        subcloud_ref = parsed_args.subcloud[0]
         try:
             result = subcloud_manager.update_subcloud(
-                subcloud_ref, files=None, data=kwargs
+                subcloud_ref, files=None, data=data
             )
             update_fields_values(result)
             return result
         except Exception as exc:
-            error_msg = f"Unable to unmanage subcloud {subcloud_ref}"
+            error_msg = f"Unable to {self.action} subcloud {subcloud_ref}"
             return utils.raise_client_exception(error_msg, exc)
 
+    def _select_many(self, parsed_args):
+        subcloud_refs = self._select_subcloud_refs(
+            parsed_args, management_state=self.selected_state
+        )
+        if not subcloud_refs:
+            raise exceptions.DCManagerClientException(
+                "No subcloud matches the selection."
+            )
+        return subcloud_refs
 
-class ManageSubcloud(base.DCManagerShowOne):
-    """Manage a subcloud."""
+    def _update_many(self, parsed_args):
+        """Updates the selected subclouds and returns a row for each of them.
 
-    def _get_format_function(self):
-        return detail_format
+        The results are resolved here rather than by the formatter, so an
+        authentication error is retried by take_action.
+        """
+        subcloud_manager = self.app.client_manager.subcloud_manager
+        results = subcloud_manager.update_subclouds(
+            self.subcloud_refs,
+            self._get_data(parsed_args),
+            max_workers=parsed_args.concurrency,
+        )
+        self.failed = []
+        rows = []
+        for subcloud_ref, result, error in results:
+            if error is None:
+                rows.append(bulk_result_format((subcloud_ref, result[0], None))[1])
+                continue
+            if getattr(error, "error_code", None) in base.AUTH_ERROR_CODES:
+                raise error
+            self.failed.append(subcloud_ref)
+            rows.append(bulk_result_format((subcloud_ref, None, error))[1])
+        return bulk_result_format()[0], rows
+
+    def produce_output(self, parsed_args, column_names, data):
+        """Overrides method from DCManagerShow.
+
+        The failures are reported once the result of every subcloud is shown.
+        """
+        result = super().produce_output(parsed_args, column_names, data)
+        if self.failed:
+            raise exceptions.DCManagerClientException(
+                f"Unable to {self.action} {len(self.failed)} subcloud(s): "
+                f"{', '.join(sorted(self.failed))}"
+            )
+        return result
+
+
+class UnmanageSubcloud(ManagementStateCommand):
+    """Unmanage one or more subclouds."""
+
+    requires_confirmation = True
+    action = "unmanage"
+    management_state = "unmanaged"
+    selected_state = "managed"
 
     def get_parser(self, prog_name):
         parser = super().get_parser(prog_name)
 
-        self.add_argument("subcloud", help="Name or ID of the subcloud to manage.")
+        self.add_argument(
+            "--migrate",
+            required=False,
+            action="store_true",
+            help="Mark the subcloud for an upcoming migration.",
+        )
+        return parser
+
+    def _get_data(self, parsed_args):
+        data = super()._get_data(parsed_args)
+        if parsed_args.migrate:
+            data["migrate"] = "true"
+        return data
+
+
+class ManageSubcloud(ManagementStateCommand):
+    """Manage one or more subclouds."""
+
+    action = "manage"
+    management_state = "managed"
+    selected_state = "unmanaged"
+
+    def get_parser(self, prog_name):
+        parser = super().get_parser(prog_name)
 
         self.add_argument(
             "--force",
@@ -556,23 +1096,11 @@ class ManageSubcloud(base.DCManagerShowOne):
         )
         return parser
 
-    def _get_resources(self, parsed_args):
-        subcloud_ref = parsed_args.subcloud
-        subcloud_manager = self.app.client_manager.subcloud_manager
-        kwargs = {}
-        kwargs["management-state"] = "managed"
+    def _get_data(self, parsed_args):
+        data = super()._get_data(parsed_args)
         if parsed_args.force:
-            kwargs["force"] = "true"
-
-        try:
-            result = subcloud_manager.update_subcloud(
-                subcloud_ref, files=None, data=kwargs
-            )
-            update_fields_values(result)
-            return result
-        except Exception as exc:
-            error_msg = f"Unable to manage subcloud {subcloud_ref}"
-            return utils.raise_client_exception(error_msg, exc)
+            data["force"] = "true"
+        return data
 
 
 class UpdateSubcloud(base.DCManagerShowOne):
@@ -764,9 +1292,10 @@ class UpdateSubcloud(base.DCManagerShowOne):
             raise exceptions.DCManagerClientException(error_msg)
 
         try:
-            result = subcloud_manager.update_subcloud(
-                subcloud_ref, files=files, data=data
-            )
+            with utils.UploadProgress(self.app.stderr) as progress:
+                result = subcloud_manager.update_subcloud(
+                    subcloud_ref, files=files, data=data, progress=progress
+                )
             self._info_message = getattr(result[0], "info_message")
             update_fields_values(result)
             return result
@@ -926,9 +1455,10 @@ class RedeploySubcloud(base.DCManagerShowOne):
             data["release"] = parsed_args.release
 
         try:
-            return subcloud_manager.redeploy_subcloud(
-                subcloud_ref=subcloud_ref, files=files, data=data
-            )
+            with utils.UploadProgress(self.app.stderr) as progress:
+                return subcloud_manager.redeploy_subcloud(
+                    subcloud_ref=subcloud_ref, files=files, data=data, progress=progress
+                )
         except Exception as exc:
             error_msg = f"Unable to redeploy subcloud {subcloud_ref}"
             return utils.raise_client_exception(error_msg, exc)
@@ -14,6 +14,8 @@
 #    limitations under the License.
 #
 
+import time
+
 from dcmanagerclient import exceptions
 from dcmanagerclient.commands.v1 import base
 
@@ -23,6 +25,15 @@ from dcmanagerclient.commands.v1 import base
 #
 # also handles 'steps' and 'strategies'
 
+# States of a strategy that is still being applied or aborted
+STRATEGY_ACTIVE_STATES = ("applying", "abort requested", "aborting")
+STRATEGY_COMPLETE = "complete"
+# Seconds between the polls of a waited strategy, the interval grows by the
+# backoff factor while no step changes and is reset on any change
+MIN_POLL_INTERVAL = 2
+DEFAULT_MAX_POLL_INTERVAL = 30
+POLL_BACKOFF = 1.5
+
 
 def detail_format(sw_update_strategy=None):
     columns = (
@@ -190,7 +201,88 @@ class CreateSwUpdateStrategy(base.DCManagerShowOne):
         return self.get_sw_update_manager().create_sw_update_strategy(**kwargs)
 
 
-class ShowSwUpdateStrategy(base.DCManagerShowOne):
+class StrategyWaitMixin:
+    """Waits for a strategy to be applied or aborted, reporting its steps.
+
+    Only the steps that changed since the previous poll are written to
+    stderr, so the final strategy shown on stdout can still be parsed.
+    """
+
+    # State of the waited strategy once it is no longer active
+    final_state = None
+
+    def _add_wait_arguments(self):
+        self.add_argument(
+            "--wait",
+            required=False,
+            action="store_true",
+            help="Wait until the strategy is no longer applying or aborting, "
+            "reporting the steps as they change. Fails unless the strategy "
+            "completes.",
+        )
+
+        self.add_argument(
+            "--max-poll-interval",
+            required=False,
+            type=int,
+            default=DEFAULT_MAX_POLL_INTERVAL,
+            help="Maximum number of seconds between polls while waiting, "
+            "defaults to %(default)s. Polling slows down up to it while no "
+            "step changes.",
+        )
+
+    def _report_changed_steps(self, step_changes):
+        """Writes the steps that changed since the previous poll.
+
+        Returns whether any step changed.
+        """
+        added, changed, removed = next(step_changes)
+        for step in added + changed:
+            line = f"{step.cloud}: stage {step.stage} {step.state}"
+            if step.details:
+                line += f" ({step.details})"
+            self.app.stderr.write(line + "\n")
+        for step in removed:
+            self.app.stderr.write(f"{step.cloud}: removed\n")
+        self.app.stderr.flush()
+        return bool(added or changed or removed)
+
+    def _wait_for_strategy(self, strategy, parsed_args):
+        """Polls the strategy until it is no longer active, returns it."""
+        manager = self.get_sw_update_manager()
+        step_manager = self.app.client_manager.strategy_step_manager
+        step_changes = step_manager.iter_strategy_step_changes()
+        interval = MIN_POLL_INTERVAL
+        max_interval = max(parsed_args.max_poll_interval, MIN_POLL_INTERVAL)
+        while True:
+            changed = self._report_changed_steps(step_changes)
+            if strategy.state not in STRATEGY_ACTIVE_STATES:
+                break
+            if changed:
+                interval = MIN_POLL_INTERVAL
+            else:
+                interval = min(interval * POLL_BACKOFF, max_interval)
+            time.sleep(interval)
+            # Polled from the server, a cached strategy would never change
+            strategy = manager.update_sw_strategy_detail(cache=False)[0]
+
+        self.final_state = strategy.state
+        return strategy
+
+    def produce_output(self, parsed_args, column_names, data):
+        """Overrides method from cliff.ShowOne.
+
+        A waited strategy that did not complete is reported once it is shown.
+        """
+        result = super().produce_output(parsed_args, column_names, data)
+        if self.final_state not in (None, STRATEGY_COMPLETE):
+            raise exceptions.DCManagerClientException(
+                f"The strategy finished in the {self.final_state} state"
+            )
+        return result
+
+
+class ShowSwUpdateStrategy(StrategyWaitMixin, base.DCManagerShowOne):
     """Show the details of an software update strategy for a subcloud."""
 
     def get_sw_update_manager(self):
@@ -200,8 +292,17 @@ class ShowSwUpdateStrategy(base.DCManagerShowOne):
     def _get_format_function(self):
         return detail_format
 
+    def get_parser(self, prog_name):
+        parser = super().get_parser(prog_name)
+        self._add_wait_arguments()
+        return parser
+
     def _get_resources(self, parsed_args):
-        return self.get_sw_update_manager().update_sw_strategy_detail()
+        manager = self.get_sw_update_manager()
+        strategy = manager.update_sw_strategy_detail(cache=not parsed_args.wait)
+        if parsed_args.wait:
+            return self._wait_for_strategy(strategy[0], parsed_args)
+        return strategy
 
 
 class DeleteSwUpdateStrategy(base.DCManagerShowOne):
@@ -224,10 +325,11 @@ class DeleteSwUpdateStrategy(base.DCManagerShowOne):
         return parser
 
 
-class ApplySwUpdateStrategy(base.DCManagerShowOne):
+class ApplySwUpdateStrategy(StrategyWaitMixin, base.DCManagerShowOne):
     """Apply a software update strategy."""
 
     requires_confirmation = True
+    applied = None
 
     def get_sw_update_manager(self):
         # This method must be overrridden by the concrete subclass
@@ -236,8 +338,23 @@ class ApplySwUpdateStrategy(base.DCManagerShowOne):
     def _get_format_function(self):
         return detail_format
 
+    def get_parser(self, prog_name):
+        parser = super().get_parser(prog_name)
+        self._add_wait_arguments()
+        return parser
+
     def _get_resources(self, parsed_args):
-        return self.get_sw_update_manager().apply_sw_update_strategy()
+        manager = self.get_sw_update_manager()
+        if self.applied is None:
+            self.applied = manager.apply_sw_update_strategy()
+            strategy = self.applied
+        else:
+            # Retried after an authentication error while waiting, the
+            # strategy is already being applied
+            strategy = manager.update_sw_strategy_detail(cache=False)
+        if parsed_args.wait:
+            return self._wait_for_strategy(strategy[0], parsed_args)
+        return strategy
 
 
 class AbortSwUpdateStrategy(base.DCManagerShowOne):
@@ -264,8 +381,53 @@ class ListSwUpdateStrategyStep(base.DCManagerLister):
     def _get_format_function(self):
         return strategy_step_format
 
+    def _validate_parsed_args(self, parsed_args):
+        if parsed_args.limit is not None and parsed_args.limit < 1:
+            error_msg = "The --limit value must be a positive integer."
+            raise exceptions.DCManagerClientException(error_msg)
+
+    def get_parser(self, prog_name):
+        parser = super().get_parser(prog_name)
+
+        self.add_argument(
+            "--state",
+            required=False,
+            action="append",
+            help="Only list steps in this state. Can be repeated.",
+        )
+        self.add_argument(
+            "--stage",
+            required=False,
+            action="append",
+            help="Only list steps of this stage. Can be repeated.",
+        )
+        self.add_argument(
+            "--cloud-prefix",
+            required=False,
+            help="Only list steps of the clouds whose name starts with this prefix",
+        )
+        self.add_argument(
+            "--limit",
+            required=False,
+            type=int,
+            help="Maximum number of steps to list",
+        )
+        self.add_argument(
+            "--marker",
+            required=False,
+            help="Cloud of the last step of the previous page, the listing "
+            "starts after it",
+        )
+        return parser
+
     def _get_resources(self, parsed_args):
-        return self.get_strategy_step_manager().list_strategy_steps()
+        return self.get_strategy_step_manager().list_strategy_steps(
+            state=parsed_args.state,
+            stage=parsed_args.stage,
+            cloud_prefix=parsed_args.cloud_prefix,
+            limit=parsed_args.limit,
+            marker=parsed_args.marker,
+        )
 
 
 class ShowSwUpdateStrategyStep(base.DCManagerShowOne):
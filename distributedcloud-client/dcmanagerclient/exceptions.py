@@ -60,3 +60,13 @@ class APIException(Exception):
         super().__init__(error_message)
         self.error_code = error_code
         self.error_message = error_message
+
+
+class DeadlineExceeded(DCManagerClientException):
+    message = "The command deadline expired"
+    code = "DEADLINE_EXCEEDED"
+
+    def __init__(self, message=None):
+        super().__init__(message)
+        if message:
+            self.message = message
@@ -0,0 +1,177 @@
+# Copyright (c) 2026 Wind River Systems, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+
+"""Access to the Linux kernel key retention service.
+
+Keys are stored in the session keyring of the current user. The keyutils
+library is called through ctypes when it is available, avoiding a keyctl
+process spawn per operation, otherwise the keyctl command is used.
+"""
+
+import ctypes
+import logging
+import os
+import subprocess
+import threading
+
+LOG = logging.getLogger(__name__)
+
+KEYCTL_PATH = "/usr/bin/keyctl"
+KEYUTILS_LIBRARY = "libkeyutils.so.1"
+KEY_TYPE = b"user"
+KEY_SPEC_SESSION_KEYRING = -3
+# Largest timeout accepted by keyctl_set_timeout, an unsigned int
+MAX_KEY_TIMEOUT = 2**32 - 1
+
+
+class KeyringBackend:
+    """Interface of the keyring backends, key identifiers are strings."""
+
+    def add(self, name: str, data: bytes) -> str:
+        """Adds or updates a key in the session keyring."""
+        raise NotImplementedError
+
+    def set_timeout(self, key_id: str, timeout: int):
+        raise NotImplementedError
+
+    def search(self, name: str) -> str:
+        """Returns the identifier of a key, raising an error if missing."""
+        raise NotImplementedError
+
+    def read(self, key_id: str) -> bytes:
+        raise NotImplementedError
+
+    def revoke(self, key_id: str):
+        raise NotImplementedError
+
+
+class KeyctlCommandBackend(KeyringBackend):
+    """Runs the keyctl command for each operation."""
+
+    @staticmethod
+    def _keyctl(*args):
+        return subprocess.run(
+            [KEYCTL_PATH, *args], check=True, capture_output=True
+        ).stdout
+
+    def add(self, name, data):
+        stdout = self._keyctl("add", "user", name, data.decode("utf-8"), "@s")
+        return stdout.decode("utf-8").strip("\n")
+
+    def set_timeout(self, key_id, timeout):
+        self._keyctl("timeout", key_id, str(timeout))
+
+    def search(self, name):
+        stdout = self._keyctl("search", "@s", "user", name)
+        return stdout.decode("utf-8").strip("\n")
+
+    def read(self, key_id):
+        return self._keyctl("print", key_id).strip(b"\n")
+
+    def revoke(self, key_id):
+        self._keyctl("revoke", key_id)
+
+
+class KeyutilsBackend(KeyringBackend):
+    """Calls add_key and keyctl through the keyutils library."""
+
+    def __init__(self, library=None):
+        if library is None:
+            # Loaded by soname, ctypes.util.find_library spawns ldconfig
+            library = ctypes.CDLL(KEYUTILS_LIBRARY, use_errno=True)
+
+        self._add_key = library.add_key
+        self._add_key.argtypes = [
+            ctypes.c_char_p,
+            ctypes.c_char_p,
+            ctypes.c_void_p,
+            ctypes.c_size_t,
+            ctypes.c_int32,
+        ]
+        self._add_key.restype = ctypes.c_int32
+
+        self._search = library.keyctl_search
+        self._search.argtypes = [
+            ctypes.c_int32,
+            ctypes.c_char_p,
+            ctypes.c_char_p,
+            ctypes.c_int32,
+        ]
+        self._search.restype = ctypes.c_long
+
+        self._read = library.keyctl_read
+        self._read.argtypes = [ctypes.c_int32, ctypes.c_char_p, ctypes.c_size_t]
+        self._read.restype = ctypes.c_long
+
+        self._set_timeout = library.keyctl_set_timeout
+        self._set_timeout.argtypes = [ctypes.c_int32, ctypes.c_uint]
+        self._set_timeout.restype = ctypes.c_long
+
+        self._revoke = library.keyctl_revoke
+        self._revoke.argtypes = [ctypes.c_int32]
+        self._revoke.restype = ctypes.c_long
+
+    @staticmethod
+    def _check(result, operation):
+        if result < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, f"{operation}: {os.strerror(errno)}")
+        return result
+
+    def add(self, name, data):
+        key_id = self._add_key(
+            KEY_TYPE, name.encode("utf-8"), data, len(data), KEY_SPEC_SESSION_KEYRING
+        )
+        return str(self._check(key_id, "add_key"))
+
+    def set_timeout(self, key_id, timeout):
+        # ctypes silently wraps the values not fitting an unsigned int
+        if isinstance(timeout, bool) or not isinstance(timeout, int) or timeout < 0:
+            raise ValueError(f"Invalid key timeout: {timeout!r}")
+        timeout = min(timeout, MAX_KEY_TIMEOUT)
+        self._check(self._set_timeout(int(key_id), timeout), "keyctl_set_timeout")
+
+    def search(self, name):
+        key_id = self._search(
+            KEY_SPEC_SESSION_KEYRING, KEY_TYPE, name.encode("utf-8"), 0
+        )
+        return str(self._check(key_id, "keyctl_search"))
+
+    def read(self, key_id):
+        # The key may grow between the size query and the read
+        size = self._check(self._read(int(key_id), None, 0), "keyctl_read")
+        while True:
+            buffer = ctypes.create_string_buffer(size)
+            length = self._check(self._read(int(key_id), buffer, size), "keyctl_read")
+            if length <= size:
+                return buffer.raw[:length]
+            size = length
+
+    def revoke(self, key_id):
+        self._check(self._revoke(int(key_id)), "keyctl_revoke")
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_backend() -> KeyringBackend:
+    """Returns the keyring backend, selecting it on first use."""
+    global _backend  # pylint: disable=global-statement
+    with _backend_lock:
+        if _backend is None:
+            try:
+                _backend = KeyutilsBackend()
+            except (OSError, AttributeError) as exc:
+                LOG.debug("Falling back to the keyctl command: %s", exc)
+                _backend = KeyctlCommandBackend()
+        return _backend
+
+
+def set_backend(backend: KeyringBackend):
+    """Replaces the keyring backend, None selects it again on next use."""
+    global _backend  # pylint: disable=global-statement
+    with _backend_lock:
+        _backend = backend
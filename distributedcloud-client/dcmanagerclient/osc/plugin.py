@@ -40,11 +40,27 @@ def make_client(instance):
         "dcmanager", interface="publicURL"
     )
 
-    client = dcmanager_client(dcmanager_url=dcmanager_url, session=instance.session)
+    client = dcmanager_client(
+        dcmanager_url=dcmanager_url,
+        session=instance.session,
+        **_client_options(instance),
+    )
 
     return client
 
 
+def _client_options(instance):
+    """Returns the timeouts and deadline given on the command line."""
+    config = getattr(getattr(instance, "_cli_options", None), "config", None) or {}
+    options = {}
+    for name in ("connect_timeout", "read_timeout", "deadline"):
+        # openstack.config drops the os_ prefix of the option destinations
+        value = config.get(f"dcmanager_{name}", config.get(f"os_dcmanager_{name}"))
+        if value is not None:
+            options[name] = float(value)
+    return options
+
+
 def build_option_parser(parser):
     """Hook to add global options."""
     parser.add_argument(
@@ -57,5 +73,29 @@ def build_option_parser(parser):
         + DEFAULT_DCMANAGER_API_VERSION
         + " (Env: OS_DCMANAGER_API_VERSION)",
     )
+    parser.add_argument(
+        "--os-dcmanager-connect-timeout",
+        metavar="<seconds>",
+        type=float,
+        default=utils.env("OS_DCMANAGER_CONNECT_TIMEOUT", default=None),
+        help="Seconds to wait for a connection to the DCMANAGER API "
+        "(Env: OS_DCMANAGER_CONNECT_TIMEOUT)",
+    )
+    parser.add_argument(
+        "--os-dcmanager-read-timeout",
+        metavar="<seconds>",
+        type=float,
+        default=utils.env("OS_DCMANAGER_READ_TIMEOUT", default=None),
+        help="Seconds to wait for the DCMANAGER API to send data once connected "
+        "(Env: OS_DCMANAGER_READ_TIMEOUT)",
+    )
+    parser.add_argument(
+        "--os-dcmanager-deadline",
+        metavar="<seconds>",
+        type=float,
+        default=utils.env("OS_DCMANAGER_DEADLINE", default=None),
+        help="Seconds allowed to all the DCMANAGER API requests of a command "
+        "(Env: OS_DCMANAGER_DEADLINE)",
+    )
 
     return parser
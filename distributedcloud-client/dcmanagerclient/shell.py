@@ -19,6 +19,7 @@ Command-line interface to the DC Manager APIs
 """
 
 import argparse
+import importlib
 import logging
 import os
 import sys
@@ -29,24 +30,12 @@ from cliff import help as cliff_help
 from osc_lib.command import command
 
 from dcmanagerclient import __version__ as dcmanager_version
+from dcmanagerclient import batch
 from dcmanagerclient import exceptions
 from dcmanagerclient.api import client
-from dcmanagerclient.commands.v1 import alarm_manager as am
-from dcmanagerclient.commands.v1 import fw_update_manager as fum
-from dcmanagerclient.commands.v1 import kube_rootca_update_manager as krum
-from dcmanagerclient.commands.v1 import kube_upgrade_manager as kupm
-from dcmanagerclient.commands.v1 import peer_group_association_manager as pgam
-from dcmanagerclient.commands.v1 import phased_subcloud_deploy_manager as psdm
-from dcmanagerclient.commands.v1 import subcloud_backup_manager as sbm
-from dcmanagerclient.commands.v1 import subcloud_deploy_manager as sdm
-from dcmanagerclient.commands.v1 import subcloud_group_manager as gm
-from dcmanagerclient.commands.v1 import subcloud_manager as sm
-from dcmanagerclient.commands.v1 import subcloud_peer_group_manager as pm
-from dcmanagerclient.commands.v1 import sw_deploy_manager as swdm
-from dcmanagerclient.commands.v1 import sw_prestage_manager as spr
-from dcmanagerclient.commands.v1 import sw_update_manager as swum
-from dcmanagerclient.commands.v1 import sw_update_options_manager as suom
-from dcmanagerclient.commands.v1 import system_peer_manager as sp
+from dcmanagerclient.api import httpclient
+
+COMMANDS_V1 = "dcmanagerclient.commands.v1."
 
 
 def env(*args, **kwargs):
@@ -212,6 +201,32 @@ complete -F _"""
         )
 
 
+class LazyCommand(commandmanager.EntryPointWrapper):
+    """Command registered as a "module:Class" reference.
+
+    The command module is only imported when the command is looked up, so
+    running one command does not import every command module and their
+    dependencies.
+    """
+
+    def __init__(self, name, reference):  # pylint: disable=super-init-not-called
+        self.name = name
+        self.reference = reference
+        self._command_class = None
+
+    @property
+    def command_class(self):
+        if self._command_class is None:
+            module_name, class_name = self.reference.split(":")
+            module = importlib.import_module(module_name)
+            self._command_class = getattr(module, class_name)
+        return self._command_class
+
+    @property
+    def value(self):
+        return self.reference
+
+
 class CustomCompleteCommand(complete.CompleteCommand):
     """Custom completion command.
 
@@ -232,6 +247,39 @@ class CustomCompleteCommand(complete.CompleteCommand):
         return 0
 
 
+class ClientManager:
+    """Gives the commands the managers of the client, created on first use."""
+
+    MANAGERS = (
+        "alarm_manager",
+        "fw_update_manager",
+        "kube_rootca_update_manager",
+        "kube_upgrade_manager",
+        "peer_group_association_manager",
+        "phased_subcloud_deploy_manager",
+        "strategy_step_manager",
+        "subcloud_backup_manager",
+        "subcloud_deploy_manager",
+        "subcloud_group_manager",
+        "subcloud_peer_group_manager",
+        "subcloud_manager",
+        "sw_deploy_manager",
+        "sw_prestage_manager",
+        "sw_update_options_manager",
+        "system_peer_manager",
+    )
+
+    def __init__(self, dcmanager_client):
+        self._client = dcmanager_client
+
+    def __getattr__(self, name):
+        if name not in self.MANAGERS:
+            raise AttributeError(
+                f"'{type(self).__name__}' object has no attribute '{name}'"
+            )
+        return getattr(self._client, name)
+
+
 class DCManagerShell(app.App):
 
     def __init__(self):
@@ -265,6 +313,20 @@ class DCManagerShell(app.App):
         if self.options.verbose_level <= 1:
             logging.getLogger("requests").setLevel(logging.WARNING)
 
+    def prepare_to_run_command(self, cmd):
+        # Each command of a batch or a server gets the whole retry budget
+        # and deadline
+        if self.client is not None:
+            self.client.http_client.retry_policy.reset_budget()
+            self.client.http_client.set_deadline(self.options.deadline)
+
+    def clean_up(self, cmd, result, err):
+        if self.client is not None:
+            self.client.http_client.set_deadline(None)
+            counters = self.client.http_client.retry_policy.counters
+            if counters["retries"]:
+                self.LOG.debug("HTTP retry counters: %s", dict(counters))
+
     def build_option_parser(self, description, version, argparse_kwargs=None):
         """Return an argparse option parser for this application.
 
@@ -335,6 +397,80 @@ class DCManagerShell(app.App):
             help="Disables cache feature (Env: DCCLIENT_NO_CACHE)",
         )
 
+        parser.add_argument(
+            "--response-cache-ttl",
+            action="store",
+            dest="response_cache_ttl",
+            type=int,
+            metavar="SECONDS",
+            default=env("DCMANAGER_RESPONSE_CACHE_TTL", default=0),
+            help="Caches the responses of the read-only requests on disk and "
+            "reuses them for the given number of seconds, revalidating them "
+            "with the server afterwards. Disabled by default, the cache is "
+            "bypassed with --no-cache and updated with --refresh-cache "
+            "(Env: DCMANAGER_RESPONSE_CACHE_TTL)",
+        )
+
+        parser.add_argument(
+            "--retries",
+            action="store",
+            dest="retries",
+            type=int,
+            default=env("DCMANAGER_RETRIES", default=httpclient.DEFAULT_RETRIES),
+            help="Number of times a read-only or delete request failing with a "
+            "connection error or a 502, 503 or 504 status is retried, with an "
+            "exponential backoff. Defaults to %(default)s "
+            "(Env: DCMANAGER_RETRIES)",
+        )
+
+        parser.add_argument(
+            "--retry-budget",
+            action="store",
+            dest="retry_budget",
+            type=int,
+            default=env("DCMANAGER_RETRY_BUDGET", default=None),
+            help="Maximum number of retries of all the requests of a command, "
+            "unlimited by default (Env: DCMANAGER_RETRY_BUDGET)",
+        )
+
+        parser.add_argument(
+            "--connect-timeout",
+            action="store",
+            dest="connect_timeout",
+            type=float,
+            metavar="SECONDS",
+            default=env(
+                "DCMANAGER_CONNECT_TIMEOUT", default=httpclient.DEFAULT_CONNECT_TIMEOUT
+            ),
+            help="Seconds to wait for a connection to the dcmanager API. "
+            "Defaults to %(default)s (Env: DCMANAGER_CONNECT_TIMEOUT)",
+        )
+
+        parser.add_argument(
+            "--read-timeout",
+            action="store",
+            dest="read_timeout",
+            type=float,
+            metavar="SECONDS",
+            default=env(
+                "DCMANAGER_READ_TIMEOUT", default=httpclient.DEFAULT_READ_TIMEOUT
+            ),
+            help="Seconds to wait for the dcmanager API to send data once "
+            "connected. Defaults to %(default)s (Env: DCMANAGER_READ_TIMEOUT)",
+        )
+
+        parser.add_argument(
+            "--deadline",
+            action="store",
+            dest="deadline",
+            type=float,
+            metavar="SECONDS",
+            default=env("DCMANAGER_DEADLINE", default=None),
+            help="Seconds allowed to all the requests of a command, the "
+            "command fails once they expire. Unlimited by default "
+            "(Env: DCMANAGER_DEADLINE)",
+        )
+
         if self.deferred_help:
             parser.add_argument(
                 "-h",
@@ -586,6 +722,12 @@ class DCManagerShell(app.App):
 
         auth_type = getattr(self.options, "stx_auth_type", "keystone")
 
+        # Release the pooled connections of a client being replaced, e.g.
+        # when reloading it after an authentication error
+        previous_client = self.client
+        if previous_client is not None:
+            previous_client.close()
+
         self.client = client.client(
             dcmanager_url=self.options.dcmanager_url,
             username=self.options.username,
@@ -601,6 +743,15 @@ class DCManagerShell(app.App):
             profile=self.options.profile,
             refresh_cache=refresh_cache,
             cache_allowed=self.options.no_cache is False,
+            response_cache_ttl=(
+                self.options.response_cache_ttl
+                if self.options.no_cache is False
+                else None
+            ),
+            retries=self.options.retries,
+            retry_budget=self.options.retry_budget,
+            connect_timeout=self.options.connect_timeout,
+            read_timeout=self.options.read_timeout,
             auth_type=auth_type,
             **kwargs,
         )
@@ -615,35 +766,13 @@ class DCManagerShell(app.App):
                 )
             )
 
-        phased_subcloud_deploy_manager = self.client.phased_subcloud_deploy_manager
-        peer_group_association_manager = self.client.peer_group_association_manager
-        client_keys = {
-            "alarm_manager": self.client.alarm_manager,
-            "fw_update_manager": self.client.fw_update_manager,
-            "kube_rootca_update_manager": self.client.kube_rootca_update_manager,
-            "kube_upgrade_manager": self.client.kube_upgrade_manager,
-            "peer_group_association_manager": peer_group_association_manager,
-            "phased_subcloud_deploy_manager": phased_subcloud_deploy_manager,
-            "strategy_step_manager": self.client.strategy_step_manager,
-            "subcloud_backup_manager": self.client.subcloud_backup_manager,
-            "subcloud_deploy_manager": self.client.subcloud_deploy_manager,
-            "subcloud_group_manager": self.client.subcloud_group_manager,
-            "subcloud_peer_group_manager": self.client.subcloud_peer_group_manager,
-            "subcloud_manager": self.client.subcloud_manager,
-            "sw_deploy_manager": self.client.sw_deploy_manager,
-            "sw_prestage_manager": self.client.sw_prestage_manager,
-            "sw_update_options_manager": self.client.sw_update_options_manager,
-            "system_peer_manager": self.client.system_peer_manager,
-        }
+        # The command being run keeps its deadline and retry budget
+        if previous_client is not None:
+            self.client.http_client.continue_command(previous_client.http_client)
 
         # Adding client_manager variable to make dcmanager client work with
         # unified OpenStack client.
-        ClientManager = type(
-            "ClientManager",
-            (object,),
-            client_keys,
-        )
-        self.client_manager = ClientManager()
+        self.client_manager = ClientManager(self.client)
 
     def initialize_app(self, argv):
         self._clear_shell_commands()
@@ -667,7 +796,10 @@ class DCManagerShell(app.App):
 
     def _set_shell_commands(self, cmds_dict):
         for cmd, cmd_class in cmds_dict.items():
-            self.command_manager.add_command(cmd, cmd_class)
+            if isinstance(cmd_class, str):
+                self.command_manager.commands[cmd] = LazyCommand(cmd, cmd_class)
+            else:
+                self.command_manager.add_command(cmd, cmd_class)
 
     def _clear_shell_commands(self):
         exclude_cmds = ["help", "complete"]
@@ -684,104 +816,137 @@ class DCManagerShell(app.App):
 
     @staticmethod
     def _get_commands_v1():
-        list_system_peer_groups = sp.ListSystemPeerSubcloudPeerGroups
-        create_kube_root_update = krum.CreateKubeRootcaUpdateStrategy
-        delete_kube_root_update = krum.DeleteKubeRootcaUpdateStrategy
+        # Command classes are referenced as "module:Class" and only imported
+        # when the command is run
+        am = COMMANDS_V1 + "alarm_manager:"
+        fum = COMMANDS_V1 + "fw_update_manager:"
+        gm = COMMANDS_V1 + "subcloud_group_manager:"
+        krum = COMMANDS_V1 + "kube_rootca_update_manager:"
+        kupm = COMMANDS_V1 + "kube_upgrade_manager:"
+        pgam = COMMANDS_V1 + "peer_group_association_manager:"
+        pm = COMMANDS_V1 + "subcloud_peer_group_manager:"
+        psdm = COMMANDS_V1 + "phased_subcloud_deploy_manager:"
+        sbm = COMMANDS_V1 + "subcloud_backup_manager:"
+        sdm = COMMANDS_V1 + "subcloud_deploy_manager:"
+        sm = COMMANDS_V1 + "subcloud_manager:"
+        sp = COMMANDS_V1 + "system_peer_manager:"
+        spr = COMMANDS_V1 + "sw_prestage_manager:"
+        suom = COMMANDS_V1 + "sw_update_options_manager:"
+        swdm = COMMANDS_V1 + "sw_deploy_manager:"
+        swum = COMMANDS_V1 + "sw_update_manager:"
+        list_system_peer_groups = sp + "ListSystemPeerSubcloudPeerGroups"
+        create_kube_root_update = krum + "CreateKubeRootcaUpdateStrategy"
+        delete_kube_root_update = krum + "DeleteKubeRootcaUpdateStrategy"
         return {
-            "alarm summary": am.ListAlarmSummary,
+            "alarm summary": am + "ListAlarmSummary",
             "bash-completion": BashCompletionCommand,
-            "fw-update-strategy abort": fum.AbortFwUpdateStrategy,
-            "fw-update-strategy apply": fum.ApplyFwUpdateStrategy,
-            "fw-update-strategy create": fum.CreateFwUpdateStrategy,
-            "fw-update-strategy delete": fum.DeleteFwUpdateStrategy,
-            "fw-update-strategy show": fum.ShowFwUpdateStrategy,
-            "kube-rootca-update-strategy abort": krum.AbortKubeRootcaUpdateStrategy,
-            "kube-rootca-update-strategy apply": krum.ApplyKubeRootcaUpdateStrategy,
+            "batch": batch.BatchCommand,
+            "fw-update-strategy abort": fum + "AbortFwUpdateStrategy",
+            "fw-update-strategy apply": fum + "ApplyFwUpdateStrategy",
+            "fw-update-strategy create": fum + "CreateFwUpdateStrategy",
+            "fw-update-strategy delete": fum + "DeleteFwUpdateStrategy",
+            "fw-update-strategy show": fum + "ShowFwUpdateStrategy",
+            "kube-rootca-update-strategy abort": krum + "AbortKubeRootcaUpdateStrategy",
+            "kube-rootca-update-strategy apply": krum + "ApplyKubeRootcaUpdateStrategy",
             "kube-rootca-update-strategy create": create_kube_root_update,
             "kube-rootca-update-strategy delete": delete_kube_root_update,
-            "kube-rootca-update-strategy show": krum.ShowKubeRootcaUpdateStrategy,
-            "kube-upgrade-strategy abort": kupm.AbortKubeUpgradeStrategy,
-            "kube-upgrade-strategy apply": kupm.ApplyKubeUpgradeStrategy,
-            "kube-upgrade-strategy create": kupm.CreateKubeUpgradeStrategy,
-            "kube-upgrade-strategy delete": kupm.DeleteKubeUpgradeStrategy,
-            "kube-upgrade-strategy show": kupm.ShowKubeUpgradeStrategy,
-            "peer-group-association add": pgam.AddPeerGroupAssociation,
-            "peer-group-association delete": pgam.DeletePeerGroupAssociation,
-            "peer-group-association list": pgam.ListPeerGroupAssociation,
-            "peer-group-association show": pgam.ShowPeerGroupAssociation,
-            "peer-group-association sync": pgam.SyncPeerGroupAssociation,
-            "peer-group-association update": pgam.UpdatePeerGroupAssociation,
-            "prestage-strategy abort": spr.AbortSwPrestageStrategy,
-            "prestage-strategy apply": spr.ApplySwPrestageStrategy,
-            "prestage-strategy create": spr.CreateSwPrestageStrategy,
-            "prestage-strategy delete": spr.DeleteSwPrestageStrategy,
-            "prestage-strategy show": spr.ShowSwPrestageStrategy,
-            "strategy-step list": swum.ListSwUpdateStrategyStep,
-            "strategy-step show": swum.ShowSwUpdateStrategyStep,
-            "strategy-config delete": suom.DeleteSwUpdateOptions,
-            "strategy-config list": suom.ListSwUpdateOptions,
-            "strategy-config show": suom.ShowSwUpdateOptions,
-            "strategy-config update": suom.UpdateSwUpdateOptions,
-            "subcloud add": sm.AddSubcloud,
-            "subcloud delete": sm.DeleteSubcloud,
-            "subcloud deploy abort": psdm.AbortPhasedSubcloudDeploy,
-            "subcloud deploy bootstrap": psdm.BootstrapPhasedSubcloudDeploy,
-            "subcloud deploy complete": psdm.CompletePhasedSubcloudDeploy,
-            "subcloud deploy config": psdm.ConfigPhasedSubcloudDeploy,
-            "subcloud deploy create": psdm.CreatePhasedSubcloudDeploy,
-            "subcloud deploy delete": sdm.SubcloudDeployDelete,
-            "subcloud deploy install": psdm.InstallPhasedSubcloudDeploy,
-            "subcloud deploy resume": psdm.PhasedSubcloudDeployResume,
-            "subcloud deploy enroll": psdm.EnrollPhasedSubcloudDeploy,
-            "subcloud deploy show": sdm.SubcloudDeployShow,
-            "subcloud deploy upload": sdm.SubcloudDeployUpload,
-            "subcloud errors": sm.ShowSubcloudError,
-            "subcloud list": sm.ListSubcloud,
-            "subcloud manage": sm.ManageSubcloud,
-            "subcloud reconfig": sm.ReconfigSubcloud,
-            "subcloud redeploy": sm.RedeploySubcloud,
-            "subcloud reinstall": sm.ReinstallSubcloud,
-            "subcloud restore": sm.RestoreSubcloud,
-            "subcloud show": sm.ShowSubcloud,
-            "subcloud prestage": sm.PrestageSubcloud,
-            "subcloud unmanage": sm.UnmanageSubcloud,
-            "subcloud update": sm.UpdateSubcloud,
-            "subcloud-backup create": sbm.CreateSubcloudBackup,
-            "subcloud-backup delete": sbm.DeleteSubcloudBackup,
-            "subcloud-backup restore": sbm.RestoreSubcloudBackup,
-            "subcloud-deploy show": sdm.DeprecatedSubcloudDeployShow,
-            "subcloud-deploy upload": sdm.DeprecatedSubcloudDeployUpload,
-            "subcloud-group add": gm.AddSubcloudGroup,
-            "subcloud-group delete": gm.DeleteSubcloudGroup,
-            "subcloud-group list": gm.ListSubcloudGroup,
-            "subcloud-group list-subclouds": gm.ListSubcloudGroupSubclouds,
-            "subcloud-group show": gm.ShowSubcloudGroup,
-            "subcloud-group update": gm.UpdateSubcloudGroup,
-            "subcloud-peer-group add": pm.AddSubcloudPeerGroup,
-            "subcloud-peer-group delete": pm.DeleteSubcloudPeerGroup,
-            "subcloud-peer-group list": pm.ListSubcloudPeerGroup,
-            "subcloud-peer-group list-subclouds": pm.ListSubcloudPeerGroupSubclouds,
-            "subcloud-peer-group migrate": pm.MigrateSubcloudPeerGroup,
-            "subcloud-peer-group show": pm.ShowSubcloudPeerGroup,
-            "subcloud-peer-group status": pm.StatusSubcloudPeerGroup,
-            "subcloud-peer-group update": pm.UpdateSubcloudPeerGroup,
-            "sw-deploy-strategy abort": swdm.AbortSwDeployStrategy,
-            "sw-deploy-strategy apply": swdm.ApplySwDeployStrategy,
-            "sw-deploy-strategy create": swdm.CreateSwDeployStrategy,
-            "sw-deploy-strategy delete": swdm.DeleteSwDeployStrategy,
-            "sw-deploy-strategy show": swdm.ShowSwDeployStrategy,
-            "system-peer add": sp.AddSystemPeer,
-            "system-peer delete": sp.DeleteSystemPeer,
-            "system-peer list": sp.ListSystemPeer,
+            "kube-rootca-update-strategy show": krum + "ShowKubeRootcaUpdateStrategy",
+            "kube-upgrade-strategy abort": kupm + "AbortKubeUpgradeStrategy",
+            "kube-upgrade-strategy apply": kupm + "ApplyKubeUpgradeStrategy",
+            "kube-upgrade-strategy create": kupm + "CreateKubeUpgradeStrategy",
+            "kube-upgrade-strategy delete": kupm + "DeleteKubeUpgradeStrategy",
+            "kube-upgrade-strategy show": kupm + "ShowKubeUpgradeStrategy",
+            "peer-group-association add": pgam + "AddPeerGroupAssociation",
+            "peer-group-association delete": pgam + "DeletePeerGroupAssociation",
+            "peer-group-association list": pgam + "ListPeerGroupAssociation",
+            "peer-group-association show": pgam + "ShowPeerGroupAssociation",
+            "peer-group-association sync": pgam + "SyncPeerGroupAssociation",
+            "peer-group-association update": pgam + "UpdatePeerGroupAssociation",
+            "prestage-strategy abort": spr + "AbortSwPrestageStrategy",
+            "prestage-strategy apply": spr + "ApplySwPrestageStrategy",
+            "prestage-strategy create": spr + "CreateSwPrestageStrategy",
+            "prestage-strategy delete": spr + "DeleteSwPrestageStrategy",
+            "prestage-strategy show": spr + "ShowSwPrestageStrategy",
+            "serve": batch.ServeCommand,
+            "strategy-step list": swum + "ListSwUpdateStrategyStep",
+            "strategy-step show": swum + "ShowSwUpdateStrategyStep",
+            "strategy-config delete": suom + "DeleteSwUpdateOptions",
+            "strategy-config list": suom + "ListSwUpdateOptions",
+            "strategy-config show": suom + "ShowSwUpdateOptions",
+            "strategy-config update": suom + "UpdateSwUpdateOptions",
+            "subcloud add": sm + "AddSubcloud",
+            "subcloud delete": sm + "DeleteSubcloud",
+            "subcloud deploy abort": psdm + "AbortPhasedSubcloudDeploy",
+            "subcloud deploy bootstrap": psdm + "BootstrapPhasedSubcloudDeploy",
+            "subcloud deploy complete": psdm + "CompletePhasedSubcloudDeploy",
+            "subcloud deploy config": psdm + "ConfigPhasedSubcloudDeploy",
+            "subcloud deploy create": psdm + "CreatePhasedSubcloudDeploy",
+            "subcloud deploy delete": sdm + "SubcloudDeployDelete",
+            "subcloud deploy install": psdm + "InstallPhasedSubcloudDeploy",
+            "subcloud deploy resume": psdm + "PhasedSubcloudDeployResume",
+            "subcloud deploy enroll": psdm + "EnrollPhasedSubcloudDeploy",
+            "subcloud deploy show": sdm + "SubcloudDeployShow",
+            "subcloud deploy upload": sdm + "SubcloudDeployUpload",
+            "subcloud errors": sm + "ShowSubcloudError",
+            "subcloud list": sm + "ListSubcloud",
+            "subcloud manage": sm + "ManageSubcloud",
+            "subcloud reconfig": sm + "ReconfigSubcloud",
+            "subcloud redeploy": sm + "RedeploySubcloud",
+            "subcloud reinstall": sm + "ReinstallSubcloud",
+            "subcloud restore": sm + "RestoreSubcloud",
+            "subcloud show": sm + "ShowSubcloud",
+            "subcloud prestage": sm + "PrestageSubcloud",
+            "subcloud unmanage": sm + "UnmanageSubcloud",
+            "subcloud update": sm + "UpdateSubcloud",
+            "subcloud-backup create": sbm + "CreateSubcloudBackup",
+            "subcloud-backup delete": sbm + "DeleteSubcloudBackup",
+            "subcloud-backup restore": sbm + "RestoreSubcloudBackup",
+            "subcloud-deploy show": sdm + "DeprecatedSubcloudDeployShow",
+            "subcloud-deploy upload": sdm + "DeprecatedSubcloudDeployUpload",
+            "subcloud-group add": gm + "AddSubcloudGroup",
+            "subcloud-group delete": gm + "DeleteSubcloudGroup",
+            "subcloud-group list": gm + "ListSubcloudGroup",
+            "subcloud-group list-subclouds": gm + "ListSubcloudGroupSubclouds",
+            "subcloud-group show": gm + "ShowSubcloudGroup",
+            "subcloud-group update": gm + "UpdateSubcloudGroup",
+            "subcloud-peer-group add": pm + "AddSubcloudPeerGroup",
+            "subcloud-peer-group delete": pm + "DeleteSubcloudPeerGroup",
+            "subcloud-peer-group list": pm + "ListSubcloudPeerGroup",
+            "subcloud-peer-group list-subclouds": pm + "ListSubcloudPeerGroupSubclouds",
+            "subcloud-peer-group migrate": pm + "MigrateSubcloudPeerGroup",
+            "subcloud-peer-group show": pm + "ShowSubcloudPeerGroup",
+            "subcloud-peer-group status": pm + "StatusSubcloudPeerGroup",
+            "subcloud-peer-group update": pm + "UpdateSubcloudPeerGroup",
+            "sw-deploy-strategy abort": swdm + "AbortSwDeployStrategy",
+            "sw-deploy-strategy apply": swdm + "ApplySwDeployStrategy",
+            "sw-deploy-strategy create": swdm + "CreateSwDeployStrategy",
+            "sw-deploy-strategy delete": swdm + "DeleteSwDeployStrategy",
+            "sw-deploy-strategy show": swdm + "ShowSwDeployStrategy",
+            "system-peer add": sp + "AddSystemPeer",
+            "system-peer delete": sp + "DeleteSystemPeer",
+            "system-peer list": sp + "ListSystemPeer",
             "system-peer list-subcloud-peer-groups": list_system_peer_groups,
-            "system-peer show": sp.ShowSystemPeer,
-            "system-peer update": sp.UpdateSystemPeer,
+            "system-peer show": sp + "ShowSystemPeer",
+            "system-peer update": sp + "UpdateSystemPeer",
         }
 
 
 def main(argv=None):
     if argv is None:
         argv = sys.argv[1:]
+
+    # Commands without global options run on the server keeping a warm
+    # client when there is one
+    socket_path = os.environ.get(batch.SOCKET_ENV)
+    if socket_path and argv and not argv[0].startswith("-"):
+        if argv[0] not in batch.NESTED_COMMANDS:
+            try:
+                status = batch.forward(socket_path, argv)
+            except exceptions.DCManagerClientException as exc:
+                sys.stderr.write(f"{exc}, running the command locally\n")
+                status = None
+            if status is not None:
+                return status
     return DCManagerShell().run(argv)
 
 
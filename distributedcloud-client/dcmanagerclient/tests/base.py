@@ -197,6 +197,26 @@ SUBCLOUD_RESOURCE_WITH_ALL_LIST_FIELDS = api_base.Subcloud(
     prestage_versions=PRESTAGE_VERSIONS,
 )
 
+# Subcloud payload as returned by the API
+SUBCLOUD_PAYLOAD = {
+    "id": ID,
+    "name": NAME,
+    "description": DESCRIPTION,
+    "location": LOCATION,
+    "software-version": SOFTWARE_VERSION,
+    "management-state": MANAGEMENT_STATE,
+    "availability-status": AVAILABILITY_STATUS,
+    "deploy-status": DEPLOY_STATUS,
+    "management-subnet": MANAGEMENT_SUBNET,
+    "management-start-ip": MANAGEMENT_START_IP,
+    "management-end-ip": MANAGEMENT_END_IP,
+    "management-gateway-ip": MANAGEMENT_GATEWAY_IP,
+    "systemcontroller-gateway-ip": SYSTEMCONTROLLER_GATEWAY_IP,
+    "created-at": TIME_NOW,
+    "updated-at": TIME_NOW,
+    "group_id": DEFAULT_SUBCLOUD_GROUP_ID,
+}
+
 # Subcloud result values returned from various API calls (e.g. subcloud show)
 SUBCLOUD_FIELD_RESULT_LIST = (
     ID,
@@ -0,0 +1,82 @@
+# Copyright (c) 2026 Wind River Systems, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+
+import asyncio
+import json
+import threading
+import time
+
+import mock
+import testtools
+
+from dcmanagerclient.api import base as api_base
+from dcmanagerclient.api.v1 import async_client
+from dcmanagerclient.api.v1.subcloud_manager import SubcloudManager
+from dcmanagerclient.tests import base
+
+
+class AsyncClientTest(testtools.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.http_client = mock.MagicMock()
+        self.client = mock.MagicMock()
+        self.client.subcloud_manager = SubcloudManager(self.http_client)
+
+    def test_manager_builds_resources(self):
+        self.http_client.get.return_value = base.FakeResponse(
+            200, json.dumps(base.SUBCLOUD_PAYLOAD)
+        )
+        aclient = async_client.AsyncClient(client=self.client)
+
+        async def detail():
+            async with aclient:
+                return await aclient.subcloud_manager.subcloud_detail(base.NAME)
+
+        result = asyncio.run(detail())
+
+        self.http_client.get.assert_called_once_with(f"/subclouds/{base.NAME}")
+        self.assertIsInstance(result[0], api_base.Subcloud)
+        self.assertEqual(base.NAME, result[0].name)
+        self.client.close.assert_called_once_with()
+
+    def test_concurrency_is_bounded(self):
+        lock = threading.Lock()
+        in_flight = []
+        peak = []
+
+        def fake_detail(subcloud_ref):
+            with lock:
+                in_flight.append(subcloud_ref)
+                peak.append(len(in_flight))
+            time.sleep(0.01)
+            with lock:
+                in_flight.remove(subcloud_ref)
+            return [subcloud_ref]
+
+        self.client.subcloud_manager = mock.MagicMock()
+        self.client.subcloud_manager.subcloud_detail.side_effect = fake_detail
+        aclient = async_client.AsyncClient(client=self.client, max_concurrency=2)
+
+        async def fan_out():
+            return await asyncio.gather(
+                *(
+                    aclient.subcloud_manager.subcloud_detail(f"subcloud{i}")
+                    for i in range(8)
+                )
+            )
+
+        results = asyncio.run(fan_out())
+
+        self.assertEqual([[f"subcloud{i}"] for i in range(8)], results)
+        self.assertLessEqual(max(peak), 2)
+
+    def test_unknown_attribute(self):
+        aclient = async_client.AsyncClient(client=self.client)
+        self.assertRaises(AttributeError, getattr, aclient, "http_client")
+
+    def test_invalid_max_concurrency(self):
+        self.assertRaises(
+            ValueError, async_client.AsyncClient, client=self.client, max_concurrency=0
+        )
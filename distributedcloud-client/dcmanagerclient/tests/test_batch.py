@@ -0,0 +1,236 @@
+# Copyright (c) 2026 Wind River Systems, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+
+import io
+import logging
+import os
+import shutil
+import socket
+import tempfile
+import threading
+
+import mock
+import testtools
+
+from dcmanagerclient import batch
+from dcmanagerclient import exceptions
+from dcmanagerclient import shell
+from dcmanagerclient import utils
+
+BATCH_COMMANDS = """
+# Delete the groups
+subcloud-group delete group1 --yes
+subcloud-group delete "group 2" --yes
+"""
+AUTH_ARGS = [
+    "--os-auth-url=http://127.0.0.1:5000/v3",
+    "--os-username=admin",
+    "--os-password=password",
+    "--os-tenant-name=admin",
+]
+
+
+class BatchCommandTest(testtools.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.app = mock.MagicMock()
+        self.app.run_subcommand.return_value = 0
+        # pylint: disable-next=consider-using-with
+        self.batch_file = tempfile.NamedTemporaryFile("w", delete=False)
+        self.addCleanup(os.unlink, self.batch_file.name)
+
+    def _run(self, commands, *args):
+        self.batch_file.write(commands)
+        self.batch_file.close()
+        cmd = batch.BatchCommand(self.app, None)
+        parsed_args = cmd.get_parser("batch").parse_args(
+            ["--file", self.batch_file.name, *args]
+        )
+        return cmd.take_action(parsed_args)
+
+    def test_commands_run(self):
+        self.assertEqual(0, self._run(BATCH_COMMANDS))
+        self.assertEqual(
+            [
+                mock.call(["subcloud-group", "delete", "group1", "--yes"]),
+                mock.call(["subcloud-group", "delete", "group 2", "--yes"]),
+            ],
+            self.app.run_subcommand.call_args_list,
+        )
+
+    def test_failed_command(self):
+        self.app.run_subcommand.side_effect = [1, 0]
+        self.assertEqual(1, self._run(BATCH_COMMANDS))
+        self.assertEqual(2, self.app.run_subcommand.call_count)
+
+    def test_stop_on_error(self):
+        self.app.run_subcommand.side_effect = [1, 0]
+        self.assertEqual(1, self._run(BATCH_COMMANDS, "--stop-on-error"))
+        self.assertEqual(1, self.app.run_subcommand.call_count)
+
+    def test_invalid_arguments(self):
+        self.app.run_subcommand.side_effect = SystemExit(2)
+        self.assertEqual(1, self._run('subcloud show "subcloud1\nbatch\nsubcloud'))
+        self.assertEqual(1, self.app.run_subcommand.call_count)
+
+    @mock.patch("dcmanagerclient.api.client.client")
+    def test_single_client(self, mock_client):
+        self.batch_file.write(BATCH_COMMANDS)
+        self.batch_file.close()
+        manager = mock_client.return_value.subcloud_group_manager
+
+        status = shell.DCManagerShell().run(
+            AUTH_ARGS + ["batch", "--file", self.batch_file.name]
+        )
+
+        self.assertEqual(0, status)
+        mock_client.assert_called_once()
+        self.assertEqual(
+            [mock.call("group1"), mock.call("group 2")],
+            manager.delete_subcloud_group.call_args_list,
+        )
+
+
+class CommandServerTest(testtools.TestCase):
+    def setUp(self):
+        super().setUp()
+        runtime_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, runtime_dir)
+        self.socket_path = os.path.join(runtime_dir, batch.SOCKET_NAME)
+        self.app = mock.MagicMock()
+        self.server = batch.CommandServer(self.app, self.socket_path)
+
+    def _serve_once(self):
+        sock = self.server._bind()
+        self.addCleanup(sock.close)
+
+        def serve():
+            conn, _ = sock.accept()
+            with conn:
+                self.server.handle(conn)
+
+        thread = threading.Thread(target=serve)
+        thread.start()
+        self.addCleanup(thread.join)
+        return sock
+
+    def test_forward(self):
+        def run_subcommand(argv):
+            self.app.stdout.write(" ".join(argv))
+            logging.getLogger("cliff.app").error("Failed")
+            return 1
+
+        self.app.run_subcommand.side_effect = run_subcommand
+        self._serve_once()
+        stdout = io.StringIO()
+        stderr = io.StringIO()
+
+        status = batch.forward(
+            self.socket_path, ["subcloud", "list"], stdout=stdout, stderr=stderr
+        )
+
+        self.assertEqual(1, status)
+        self.assertEqual("subcloud list", stdout.getvalue())
+        self.assertIn("Failed", stderr.getvalue())
+        self.assertEqual(0o600, os.stat(self.socket_path).st_mode & 0o777)
+
+    def test_execute_in_client_environment(self):
+        client_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, client_dir)
+        server_dir = os.getcwd()
+        seen = {}
+
+        def run_subcommand(_argv):
+            seen["cwd"] = os.getcwd()
+            seen["confirmations"] = os.environ.get("CLI_CONFIRMATIONS")
+            return 0
+
+        self.app.run_subcommand.side_effect = run_subcommand
+        with mock.patch.dict(os.environ, {"CLI_CONFIRMATIONS": "disabled"}):
+            reply = self.server.execute(
+                ["subcloud", "list"],
+                cwd=client_dir,
+                env={"CLI_CONFIRMATIONS": "enabled"},
+            )
+            self.assertEqual("disabled", os.environ["CLI_CONFIRMATIONS"])
+
+        self.assertEqual(0, reply["status"])
+        self.assertEqual(os.path.realpath(client_dir), os.path.realpath(seen["cwd"]))
+        self.assertEqual("enabled", seen["confirmations"])
+        self.assertEqual(server_dir, os.getcwd())
+
+    def test_prompting_command_runs_locally(self):
+        def run_subcommand(_argv):
+            try:
+                utils.prompt_for_password()
+            except exceptions.DCManagerClientException:
+                return 1
+            return 0
+
+        self.app.run_subcommand.side_effect = run_subcommand
+        self._serve_once()
+
+        self.assertIsNone(batch.forward(self.socket_path, ["subcloud", "add"]))
+
+    @mock.patch.dict(os.environ, {"CLI_CONFIRMATIONS": "enabled"})
+    def test_confirmation_not_forwarded(self):
+        self.assertIsNone(
+            batch.forward(self.socket_path, ["subcloud", "delete", "sc1"])
+        )
+        self.app.run_subcommand.assert_not_called()
+
+    def test_forward_invalid_reply(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.addCleanup(sock.close)
+        sock.bind(self.socket_path)
+        sock.listen()
+
+        def close_connection():
+            conn, _ = sock.accept()
+            conn.close()
+
+        thread = threading.Thread(target=close_connection)
+        thread.start()
+        self.addCleanup(thread.join)
+
+        self.assertRaises(
+            exceptions.DCManagerClientException,
+            batch.forward,
+            self.socket_path,
+            ["subcloud", "list"],
+        )
+
+    @mock.patch.object(shell.DCManagerShell, "run", return_value=0)
+    @mock.patch.object(
+        batch, "forward", side_effect=exceptions.DCManagerClientException("No reply")
+    )
+    def test_main_runs_locally_without_reply(self, _mock_forward, mock_run):
+        with mock.patch.dict(os.environ, {batch.SOCKET_ENV: self.socket_path}):
+            self.assertEqual(0, shell.main(["subcloud", "list"]))
+        mock_run.assert_called_once_with(["subcloud", "list"])
+
+    def test_forward_without_server(self):
+        self.assertIsNone(batch.forward(self.socket_path, ["subcloud", "list"]))
+
+    def test_server_already_listening(self):
+        self.addCleanup(self.server._bind().close)
+        self.assertRaises(exceptions.DCManagerClientException, self.server._bind)
+
+    def test_stale_socket_replaced(self):
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(self.socket_path)
+        stale.close()
+
+        self.server._bind().close()
+
+    @mock.patch.object(batch, "forward", return_value=3)
+    def test_main_forwards_to_server(self, mock_forward):
+        with mock.patch.dict(os.environ, {batch.SOCKET_ENV: self.socket_path}):
+            self.assertEqual(3, shell.main(["subcloud", "list"]))
+        mock_forward.assert_called_once_with(self.socket_path, ["subcloud", "list"])
+
+    def test_nested_command_rejected(self):
+        self.assertEqual(2, self.server.execute(["batch"])["status"])
+        self.app.run_subcommand.assert_not_called()
@@ -16,6 +16,7 @@
 #    limitations under the License.
 #
 
+import datetime
 import os
 import tempfile
 import uuid
@@ -25,6 +26,7 @@ import osprofiler.profiler
 import testtools
 
 from dcmanagerclient.api import client
+from dcmanagerclient.api import httpclient
 from dcmanagerclient.api.v1.client import _build_service_url
 
 AUTH_HTTP_URL = "http://localhost:35357/v3"
@@ -52,12 +54,21 @@ class BaseClientTests(testtools.TestCase):
         user_id = keystone_session_instance.get_user_id.return_value = str(uuid.uuid4())
         keystone_session_instance.get_endpoint.return_value = DCMANAGER_HTTP_URL
 
-        expected_args = (DCMANAGER_HTTP_URL, token, project_id, user_id)
+        expected_args = (None, None, None, None)
+        expected_auth = (DCMANAGER_HTTP_URL, token, project_id, user_id)
 
         expected_kwargs = {
             "auth_type": "keystone",
             "cacert": None,
             "insecure": False,
+            "pool_maxsize": httpclient.DEFAULT_POOL_MAXSIZE,
+            "response_cache": None,
+            "refresh_cache": False,
+            "retry_policy": mock.ANY,
+            "connect_timeout": httpclient.DEFAULT_CONNECT_TIMEOUT,
+            "read_timeout": httpclient.DEFAULT_READ_TIMEOUT,
+            "authenticator": mock.ANY,
+            "reference_cache": mock.ANY,
         }
 
         client.client(
@@ -71,6 +82,10 @@ class BaseClientTests(testtools.TestCase):
         self.assertEqual(mock_client.call_args[0], expected_args)
         self.assertDictEqual(mock_client.call_args[1], expected_kwargs)
 
+        # Authenticated by the first request
+        authenticator = mock_client.call_args[1]["authenticator"]
+        self.assertEqual(expected_auth, authenticator())
+
     @mock.patch("keystoneauth1.session.Session")
     @mock.patch("dcmanagerclient.api.httpclient.HTTPClient")
     def test_dcmanager_url_https_insecure(
@@ -84,12 +99,21 @@ class BaseClientTests(testtools.TestCase):
         user_id = keystone_session_instance.get_user_id.return_value = str(uuid.uuid4())
         keystone_session_instance.get_endpoint.return_value = DCMANAGER_HTTP_URL
 
-        expected_args = (DCMANAGER_HTTPS_URL, token, project_id, user_id)
+        expected_args = (DCMANAGER_HTTPS_URL, None, None, None)
+        expected_auth = (DCMANAGER_HTTPS_URL, token, project_id, user_id)
 
         expected_kwargs = {
             "auth_type": "keystone",
             "cacert": None,
             "insecure": True,
+            "pool_maxsize": httpclient.DEFAULT_POOL_MAXSIZE,
+            "response_cache": None,
+            "refresh_cache": False,
+            "retry_policy": mock.ANY,
+            "connect_timeout": httpclient.DEFAULT_CONNECT_TIMEOUT,
+            "read_timeout": httpclient.DEFAULT_READ_TIMEOUT,
+            "authenticator": mock.ANY,
+            "reference_cache": mock.ANY,
         }
 
         client.client(
@@ -107,6 +131,10 @@ class BaseClientTests(testtools.TestCase):
         self.assertEqual(mock_client.call_args[0], expected_args)
         self.assertDictEqual(mock_client.call_args[1], expected_kwargs)
 
+        # Authenticated by the first request
+        authenticator = mock_client.call_args[1]["authenticator"]
+        self.assertEqual(expected_auth, authenticator())
+
     @mock.patch("keystoneauth1.session.Session")
     @mock.patch("dcmanagerclient.api.httpclient.HTTPClient")
     def test_dcmanager_url_https_secure(self, mock_client, mock_keystone_auth_session):
@@ -119,12 +147,21 @@ class BaseClientTests(testtools.TestCase):
         user_id = keystone_session_instance.get_user_id.return_value = str(uuid.uuid4())
         keystone_session_instance.get_endpoint.return_value = DCMANAGER_HTTPS_URL
 
-        expected_args = (DCMANAGER_HTTPS_URL, token, project_id, user_id)
+        expected_args = (DCMANAGER_HTTPS_URL, None, None, None)
+        expected_auth = (DCMANAGER_HTTPS_URL, token, project_id, user_id)
 
         expected_kwargs = {
             "auth_type": "keystone",
             "cacert": path,
             "insecure": False,
+            "pool_maxsize": httpclient.DEFAULT_POOL_MAXSIZE,
+            "response_cache": None,
+            "refresh_cache": False,
+            "retry_policy": mock.ANY,
+            "connect_timeout": httpclient.DEFAULT_CONNECT_TIMEOUT,
+            "read_timeout": httpclient.DEFAULT_READ_TIMEOUT,
+            "authenticator": mock.ANY,
+            "reference_cache": mock.ANY,
         }
 
         try:
@@ -146,6 +183,10 @@ class BaseClientTests(testtools.TestCase):
         self.assertEqual(mock_client.call_args[0], expected_args)
         self.assertDictEqual(mock_client.call_args[1], expected_kwargs)
 
+        # Authenticated by the first request
+        authenticator = mock_client.call_args[1]["authenticator"]
+        self.assertEqual(expected_auth, authenticator())
+
     @mock.patch("keystoneauth1.session.Session")
     def test_dcmanager_url_https_bad_cacert(self, _mock_keystone_auth_session):
         self.assertRaises(
@@ -185,6 +226,173 @@ class BaseClientTests(testtools.TestCase):
 
         self.assertTrue(mock_log_warning.called)
 
+    @mock.patch("dcmanagerclient.api.httpclient.HTTPClient")
+    def test_dcmanager_retry_policy(self, mock_client):
+        client.client(dcmanager_url=DCMANAGER_HTTP_URL, retries=5, retry_budget=10)
+
+        retry_policy = mock_client.call_args[1]["retry_policy"]
+        self.assertEqual(5, retry_policy.retries)
+        self.assertEqual(10, retry_policy.budget)
+
+    @mock.patch("dcmanagerclient.api.v1.client.ResponseCache")
+    @mock.patch("dcmanagerclient.api.httpclient.HTTPClient")
+    def test_dcmanager_response_cache_ttl(self, mock_client, mock_response_cache):
+        # The TTL alone enables the cache, cache_allowed is for the auth cache
+        client.client(dcmanager_url=DCMANAGER_HTTP_URL, response_cache_ttl=60)
+
+        mock_response_cache.assert_called_once_with(ttl=60)
+        self.assertIs(
+            mock_response_cache.return_value,
+            mock_client.call_args[1]["response_cache"],
+        )
+
+    def _keystone_session(self, mock_keystone_auth_session, seconds):
+        keystone_session_instance = mock_keystone_auth_session.return_value
+        keystone_session_instance.get_token.side_effect = ["token1", "token2"]
+        keystone_session_instance.get_endpoint.return_value = DCMANAGER_HTTP_URL
+        now = datetime.datetime.now(datetime.timezone.utc)
+        keystone_session_instance.auth.auth_ref.expires = now + datetime.timedelta(
+            seconds=seconds
+        )
+        return keystone_session_instance
+
+    @mock.patch("dcmanagerclient.api.token_renewer.threading.Timer")
+    @mock.patch("keystoneauth1.session.Session")
+    def test_dcmanager_token_renewal(self, mock_keystone_auth_session, mock_timer):
+        keystone_session_instance = self._keystone_session(
+            mock_keystone_auth_session, 3600
+        )
+
+        dcmanager_client = client.client(
+            username="dcmanager",
+            project_name="dcmanager",
+            auth_url=AUTH_HTTP_URL,
+            api_key="password",
+        )
+        dcmanager_client.http_client.authenticate()
+        self.assertEqual("token1", dcmanager_client.http_client.token)
+        mock_timer.return_value.start.assert_called_once_with()
+
+        keystone_session_instance.auth.auth_ref.expires += datetime.timedelta(
+            seconds=3600
+        )
+        dcmanager_client.token_renewer.renew()
+
+        keystone_session_instance.invalidate.assert_called_once_with()
+        self.assertEqual(2, keystone_session_instance.get_token.call_count)
+        self.assertEqual("token2", dcmanager_client.http_client.token)
+
+        dcmanager_client.close()
+        mock_timer.return_value.cancel.assert_called_once_with()
+
+    @mock.patch("dcmanagerclient.utils.load_auth_session_keyring_by_name")
+    @mock.patch("dcmanagerclient.api.token_renewer.threading.Timer")
+    @mock.patch("keystoneauth1.session.Session")
+    def test_dcmanager_token_renewed_from_cache(
+        self, mock_keystone_auth_session, _mock_timer, mock_load_cache
+    ):
+        keystone_session_instance = self._keystone_session(
+            mock_keystone_auth_session, 3600
+        )
+        mock_load_cache.return_value = {}
+
+        dcmanager_client = client.client(
+            username="dcmanager",
+            project_name="dcmanager",
+            auth_url=AUTH_HTTP_URL,
+            api_key="password",
+            cache_allowed=True,
+        )
+        dcmanager_client.http_client.authenticate()
+
+        # Another process already renewed the token
+        expires_at = keystone_session_instance.auth.auth_ref.expires
+        mock_load_cache.return_value = {
+            "token": "token3",
+            "dcmanager_url": DCMANAGER_HTTP_URL,
+            "project_id": "project",
+            "user_id": "user",
+            "expires_at": (expires_at + datetime.timedelta(hours=1)).isoformat(),
+        }
+        dcmanager_client.token_renewer.renew()
+
+        keystone_session_instance.invalidate.assert_not_called()
+        self.assertEqual(1, keystone_session_instance.get_token.call_count)
+        self.assertEqual("token3", dcmanager_client.http_client.token)
+
+    @mock.patch("dcmanagerclient.utils.file_lock")
+    @mock.patch("dcmanagerclient.utils.load_auth_session_keyring_by_name")
+    @mock.patch("keystoneauth1.session.Session")
+    def test_dcmanager_auth_cached_while_waiting_for_lock(
+        self, mock_keystone_auth_session, mock_load_cache, mock_file_lock
+    ):
+        keystone_session_instance = mock_keystone_auth_session.return_value
+        # Another process filled the cache while this one waited for the lock
+        mock_load_cache.side_effect = [
+            {},
+            {
+                "token": "token1",
+                "dcmanager_url": DCMANAGER_HTTP_URL,
+                "project_id": "project",
+                "user_id": "user",
+            },
+        ]
+
+        dcmanager_client = client.client(
+            username="dcmanager",
+            project_name="dcmanager",
+            auth_url=AUTH_HTTP_URL,
+            api_key="password",
+            cache_allowed=True,
+        )
+        dcmanager_client.http_client.authenticate()
+
+        mock_file_lock.assert_called_once_with(
+            "dcmanager_client_session_dcmanager.lock"
+        )
+        mock_file_lock.return_value.__enter__.assert_called_once_with()
+        keystone_session_instance.get_token.assert_not_called()
+        self.assertEqual("token1", dcmanager_client.http_client.token)
+
+    @mock.patch("dcmanagerclient.api.token_renewer.threading.Timer")
+    @mock.patch("keystoneauth1.session.Session")
+    def test_dcmanager_token_renewal_disabled(
+        self, mock_keystone_auth_session, mock_timer
+    ):
+        self._keystone_session(mock_keystone_auth_session, 3600)
+
+        dcmanager_client = client.client(
+            username="dcmanager",
+            project_name="dcmanager",
+            auth_url=AUTH_HTTP_URL,
+            api_key="password",
+            renew_token=False,
+        )
+        dcmanager_client.http_client.authenticate()
+
+        self.assertIsNone(dcmanager_client.token_renewer)
+        mock_timer.assert_not_called()
+
+    @mock.patch("keystoneauth1.session.Session")
+    def test_dcmanager_lazy_authentication(self, mock_keystone_auth_session):
+        keystone_session_instance = mock_keystone_auth_session.return_value
+
+        dcmanager_client = client.client(
+            username="dcmanager",
+            project_name="dcmanager",
+            auth_url=AUTH_HTTP_URL,
+            api_key="password",
+        )
+
+        keystone_session_instance.get_token.assert_not_called()
+        self.assertNotIn("subcloud_manager", vars(dcmanager_client))
+        group_manager = dcmanager_client.subcloud_group_manager
+        self.assertIs(group_manager, dcmanager_client.subcloud_group_manager)
+        self.assertIs(dcmanager_client.subcloud_manager, group_manager.subcloud_manager)
+        self.assertIn("alarm_manager", dir(dcmanager_client))
+        self.assertRaises(AttributeError, getattr, dcmanager_client, "unknown_manager")
+        keystone_session_instance.get_token.assert_not_called()
+
     @mock.patch("keystoneauth1.session.Session")
     @mock.patch("dcmanagerclient.api.httpclient.HTTPClient")
     def test_dcmanager_profile_enabled(self, mock_client, mock_keystone_auth_session):
@@ -196,12 +404,21 @@ class BaseClientTests(testtools.TestCase):
         user_id = keystone_session_instance.get_user_id.return_value = str(uuid.uuid4())
         keystone_session_instance.get_endpoint.return_value = DCMANAGER_HTTP_URL
 
-        expected_args = (DCMANAGER_HTTP_URL, token, project_id, user_id)
+        expected_args = (None, None, None, None)
+        expected_auth = (DCMANAGER_HTTP_URL, token, project_id, user_id)
 
         expected_kwargs = {
             "auth_type": "keystone",
             "cacert": None,
             "insecure": False,
+            "pool_maxsize": httpclient.DEFAULT_POOL_MAXSIZE,
+            "response_cache": None,
+            "refresh_cache": False,
+            "retry_policy": mock.ANY,
+            "connect_timeout": httpclient.DEFAULT_CONNECT_TIMEOUT,
+            "read_timeout": httpclient.DEFAULT_READ_TIMEOUT,
+            "authenticator": mock.ANY,
+            "reference_cache": mock.ANY,
         }
 
         client.client(
@@ -217,6 +434,10 @@ class BaseClientTests(testtools.TestCase):
         self.assertEqual(mock_client.call_args[0], expected_args)
         self.assertDictEqual(mock_client.call_args[1], expected_kwargs)
 
+        # Authenticated by the first request
+        authenticator = mock_client.call_args[1]["authenticator"]
+        self.assertEqual(expected_auth, authenticator())
+
         profiler = osprofiler.profiler.get()
 
         self.assertEqual(profiler.hmac_key, PROFILER_HMAC_KEY)
@@ -261,11 +482,20 @@ class BaseClientTests(testtools.TestCase):
     def test_oidc_auth_success(self, mock_client, mock_oidc_data):
         mock_oidc_data.return_value = (DCMANAGER_HTTP_URL, "oidc_token_123")
 
-        expected_args = (DCMANAGER_HTTP_URL, "oidc_token_123", None, None)
+        expected_args = (None, None, None, None)
+        expected_auth = (DCMANAGER_HTTP_URL, "oidc_token_123", None, None)
         expected_kwargs = {
             "auth_type": "oidc",
             "cacert": None,
             "insecure": False,
+            "pool_maxsize": httpclient.DEFAULT_POOL_MAXSIZE,
+            "response_cache": None,
+            "refresh_cache": False,
+            "retry_policy": mock.ANY,
+            "connect_timeout": httpclient.DEFAULT_CONNECT_TIMEOUT,
+            "read_timeout": httpclient.DEFAULT_READ_TIMEOUT,
+            "authenticator": mock.ANY,
+            "reference_cache": mock.ANY,
         }
 
         client.client(username="test_user", auth_url=AUTH_HTTP_URL, auth_type="oidc")
@@ -273,6 +503,10 @@ class BaseClientTests(testtools.TestCase):
         self.assertTrue(mock_client.called)
         self.assertEqual(mock_client.call_args[0], expected_args)
         self.assertDictEqual(mock_client.call_args[1], expected_kwargs)
+
+        # Authenticated by the first request
+        authenticator = mock_client.call_args[1]["authenticator"]
+        self.assertEqual(expected_auth, authenticator())
         mock_oidc_data.assert_called_once_with(
             "test_user",
             AUTH_HTTP_URL,
@@ -25,6 +25,7 @@ import testtools
 from osprofiler import _utils as osprofiler_utils
 
 from dcmanagerclient.api import httpclient
+from dcmanagerclient import exceptions
 
 API_BASE_URL = "http://localhost:8119/v1.0"
 API_URL = "/os-quota-sets"
@@ -43,7 +44,10 @@ EXPECTED_AUTH_HEADERS = {
     "X-User-Id": USER_ID,
 }
 
-EXPECTED_REQ_OPTIONS = {"headers": EXPECTED_AUTH_HEADERS}
+EXPECTED_REQ_OPTIONS = {
+    "headers": EXPECTED_AUTH_HEADERS,
+    "timeout": (httpclient.DEFAULT_CONNECT_TIMEOUT, httpclient.DEFAULT_READ_TIMEOUT),
+}
 
 EXPECTED_BODY = {"k1": "abc", "k2": 123, "k3": True}
 
@@ -54,12 +58,16 @@ class FakeRequest:
 
 
 class FakeResponse:
-    def __init__(self, method, url, status_code):
+    def __init__(self, method, url, status_code, headers=None):
         self.request = FakeRequest(method)
         self.url = url
         self.status_code = status_code
+        self.headers = headers or {}
         self.text = ""
 
+    def close(self):
+        pass
+
 
 class HTTPClientTest(testtools.TestCase):
     def setUp(self):
@@ -69,7 +77,7 @@ class HTTPClientTest(testtools.TestCase):
             API_BASE_URL, AUTH_TOKEN, PROJECT_ID, USER_ID
         )
 
-    @mock.patch.object(requests, "get")
+    @mock.patch.object(requests.Session, "get")
     def test_get_request_options(self, mock_requests_get):
         osprofiler.profiler.clean()
         self.client.get(API_URL)
@@ -77,7 +85,7 @@ class HTTPClientTest(testtools.TestCase):
         mock_requests_get.return_value = FakeResponse("get", EXPECTED_URL, 200)
         mock_requests_get.assert_called_with(EXPECTED_URL, **EXPECTED_REQ_OPTIONS)
 
-    @mock.patch.object(requests, "get")
+    @mock.patch.object(requests.Session, "get")
     def test_get_request_options_with_headers_for_get(self, mock_requests_get):
         headers = {"foo": "bar"}
 
@@ -91,7 +99,7 @@ class HTTPClientTest(testtools.TestCase):
 
     @mock.patch.object(osprofiler.profiler._Profiler, "get_base_id")
     @mock.patch.object(osprofiler.profiler._Profiler, "get_id")
-    @mock.patch.object(requests, "get")
+    @mock.patch.object(requests.Session, "get")
     def test_get_request_options_with_profile_enabled(
         self, mock_requests_get, mock_profiler_get_id, mock_profiler_get_base_id
     ):
@@ -112,7 +120,7 @@ class HTTPClientTest(testtools.TestCase):
 
         mock_requests_get.assert_called_with(EXPECTED_URL, **expected_options)
 
-    @mock.patch.object(requests, "post")
+    @mock.patch.object(requests.Session, "post")
     def test_get_request_options_with_headers_for_post(self, mock_requests_post):
         headers = {"foo": "bar"}
 
@@ -127,7 +135,7 @@ class HTTPClientTest(testtools.TestCase):
             EXPECTED_URL, EXPECTED_BODY, **expected_options
         )
 
-    @mock.patch.object(requests, "put")
+    @mock.patch.object(requests.Session, "put")
     def test_get_request_options_with_headers_for_put(self, mock_requests_put):
         headers = {"foo": "bar"}
 
@@ -142,7 +150,7 @@ class HTTPClientTest(testtools.TestCase):
             EXPECTED_URL, EXPECTED_BODY, **expected_options
         )
 
-    @mock.patch.object(requests, "delete")
+    @mock.patch.object(requests.Session, "delete")
     def test_get_request_options_with_headers_for_delete(self, mock_requests_delete):
         headers = {"foo": "bar"}
 
@@ -155,7 +163,7 @@ class HTTPClientTest(testtools.TestCase):
         mock_requests_delete.assert_called_with(EXPECTED_URL, **expected_options)
 
     @mock.patch.object(httpclient.HTTPClient, "_get_request_options")
-    @mock.patch.object(requests, "get")
+    @mock.patch.object(requests.Session, "get")
     def test_http_get(self, mock_requests_get, mock_get_request_options):
         self.client.get(API_URL)
         mock_requests_get.return_value = FakeResponse("get", EXPECTED_URL, 200)
@@ -165,7 +173,7 @@ class HTTPClientTest(testtools.TestCase):
         mock_requests_get.assert_called_with(EXPECTED_URL)
 
     @mock.patch.object(httpclient.HTTPClient, "_get_request_options")
-    @mock.patch.object(requests, "post")
+    @mock.patch.object(requests.Session, "post")
     def test_http_post(self, mock_requests_post, mock_get_request_options):
         self.client.post(API_URL, EXPECTED_BODY)
         mock_get_request_options.return_value = copy.deepcopy(EXPECTED_REQ_OPTIONS)
@@ -175,7 +183,7 @@ class HTTPClientTest(testtools.TestCase):
         mock_requests_post.assert_called_with(EXPECTED_URL, EXPECTED_BODY)
 
     @mock.patch.object(httpclient.HTTPClient, "_get_request_options")
-    @mock.patch.object(requests, "put")
+    @mock.patch.object(requests.Session, "put")
     def test_http_put(self, mock_requests_put, mock_get_request_options):
         self.client.put(API_URL, EXPECTED_BODY)
         mock_get_request_options.return_value = copy.deepcopy(EXPECTED_REQ_OPTIONS)
@@ -185,7 +193,7 @@ class HTTPClientTest(testtools.TestCase):
         mock_requests_put.assert_called_with(EXPECTED_URL, EXPECTED_BODY)
 
     @mock.patch.object(httpclient.HTTPClient, "_get_request_options")
-    @mock.patch.object(requests, "delete")
+    @mock.patch.object(requests.Session, "delete")
     def test_http_delete(self, mock_requests_delete, mock_get_request_options):
         self.client.delete(API_URL)
         mock_get_request_options.return_value = copy.deepcopy(EXPECTED_REQ_OPTIONS)
@@ -193,3 +201,253 @@ class HTTPClientTest(testtools.TestCase):
 
         mock_get_request_options.assert_called_with("delete", None)
         mock_requests_delete.assert_called_with(EXPECTED_URL)
+
+    def test_session_shared_between_requests(self):
+        adapter = self.client.session.get_adapter(API_BASE_URL)
+        self.assertIs(adapter, self.client.session.get_adapter(EXPECTED_URL))
+        self.assertEqual(httpclient.DEFAULT_POOL_MAXSIZE, adapter._pool_maxsize)
+
+    def test_session_pool_maxsize(self):
+        client = httpclient.HTTPClient(API_BASE_URL, AUTH_TOKEN, pool_maxsize=50)
+        adapter = client.session.get_adapter(API_BASE_URL)
+        self.assertEqual(50, adapter._pool_maxsize)
+
+    def test_set_credentials(self):
+        self.client.set_credentials("token2", "project2", "user2")
+
+        headers = self.client._update_headers({})
+        self.assertEqual("token2", headers["x-auth-token"])
+        self.assertEqual("project2", headers["X-Project-Id"])
+        self.assertEqual("user2", headers["X-User-Id"])
+        self.assertEqual(
+            ("project2", "user2"), (self.client.project_id, self.client.user_id)
+        )
+
+    @mock.patch.object(requests.Session, "get")
+    def test_authenticator(self, mock_requests_get):
+        authenticator = mock.Mock(
+            return_value=(API_BASE_URL, AUTH_TOKEN, PROJECT_ID, USER_ID)
+        )
+        client = httpclient.HTTPClient(None, authenticator=authenticator)
+        mock_requests_get.return_value = FakeResponse("get", EXPECTED_URL, 200)
+        authenticator.assert_not_called()
+
+        client.get(API_URL)
+        client.get(API_URL)
+
+        authenticator.assert_called_once_with()
+        self.assertEqual(EXPECTED_URL, mock_requests_get.call_args[0][0])
+        headers = mock_requests_get.call_args[1]["headers"]
+        self.assertEqual(AUTH_TOKEN, headers["x-auth-token"])
+
+    @mock.patch.object(requests.Session, "close")
+    def test_close_with_context_manager(self, mock_session_close):
+        with httpclient.HTTPClient(API_BASE_URL, AUTH_TOKEN) as client:
+            self.assertIsInstance(client.session, requests.Session)
+        mock_session_close.assert_called_once_with()
+
+
+@mock.patch.object(httpclient.time, "sleep")
+class HTTPClientRetryTest(testtools.TestCase):
+    def setUp(self):
+        super().setUp()
+        osprofiler.profiler.init(None)
+        self.client = httpclient.HTTPClient(
+            API_BASE_URL,
+            AUTH_TOKEN,
+            retry_policy=httpclient.RetryPolicy(retries=2, backoff=1, max_backoff=3),
+        )
+        self.counters = self.client.retry_policy.counters
+
+    @mock.patch.object(requests.Session, "get")
+    def test_get_retried(self, mock_requests_get, mock_sleep):
+        mock_requests_get.side_effect = [
+            requests.ConnectionError("reset"),
+            FakeResponse("get", EXPECTED_URL, 503),
+            FakeResponse("get", EXPECTED_URL, 200),
+        ]
+
+        with mock.patch.object(httpclient.random, "uniform") as mock_uniform:
+            mock_uniform.side_effect = lambda low, high: high
+            resp = self.client.get(API_URL)
+
+        self.assertEqual(200, resp.status_code)
+        # Capped exponential backoff
+        self.assertEqual([mock.call(1), mock.call(2)], mock_sleep.call_args_list)
+        self.assertEqual(3, self.counters["attempts"])
+        self.assertEqual(2, self.counters["retries"])
+
+    @mock.patch.object(requests.Session, "delete")
+    def test_delete_retries_exhausted(self, mock_requests_delete, mock_sleep):
+        mock_requests_delete.return_value = FakeResponse("delete", EXPECTED_URL, 502)
+
+        resp = self.client.delete(API_URL)
+
+        self.assertEqual(502, resp.status_code)
+        self.assertEqual(3, mock_requests_delete.call_count)
+        self.assertEqual(2, mock_sleep.call_count)
+        self.assertEqual(1, self.counters["retries_exhausted"])
+
+    @mock.patch.object(requests.Session, "get")
+    def test_retry_after(self, mock_requests_get, mock_sleep):
+        mock_requests_get.side_effect = [
+            FakeResponse("get", EXPECTED_URL, 503, {"Retry-After": "7"}),
+            FakeResponse("get", EXPECTED_URL, 200),
+        ]
+
+        self.client.get(API_URL)
+
+        mock_sleep.assert_called_once_with(7.0)
+
+    @mock.patch.object(requests.Session, "get")
+    def test_retry_after_http_date(self, mock_requests_get, mock_sleep):
+        retry_after = "Wed, 21 Oct 2015 07:28:00 GMT"
+        mock_requests_get.side_effect = [
+            FakeResponse("get", EXPECTED_URL, 503, {"Retry-After": retry_after}),
+            FakeResponse("get", EXPECTED_URL, 200),
+        ]
+
+        self.client.get(API_URL)
+
+        # A date in the past means retrying right away
+        mock_sleep.assert_called_once_with(0)
+
+    @mock.patch.object(requests.Session, "post")
+    def test_post_not_retried_by_default(self, mock_requests_post, mock_sleep):
+        mock_requests_post.return_value = FakeResponse("post", EXPECTED_URL, 503)
+
+        self.assertEqual(503, self.client.post(API_URL, "{}").status_code)
+        self.assertEqual(1, mock_requests_post.call_count)
+        mock_sleep.assert_not_called()
+
+    @mock.patch.object(requests.Session, "post")
+    def test_post_retry_opt_in(self, mock_requests_post, mock_sleep):
+        mock_requests_post.side_effect = [
+            requests.Timeout("timed out"),
+            FakeResponse("post", EXPECTED_URL, 200),
+        ]
+
+        self.assertEqual(200, self.client.post(API_URL, "{}", retry=True).status_code)
+        self.assertEqual(2, mock_requests_post.call_count)
+        mock_sleep.assert_called_once()
+
+    @mock.patch.object(requests.Session, "patch")
+    def test_streamed_body_not_retried(self, mock_requests_patch, mock_sleep):
+        mock_requests_patch.side_effect = requests.ConnectionError("reset")
+
+        with open(__file__, "rb") as body:
+            self.assertRaises(
+                requests.ConnectionError,
+                self.client.patch,
+                API_URL,
+                body,
+                retry=True,
+            )
+        self.assertEqual(1, mock_requests_patch.call_count)
+        mock_sleep.assert_not_called()
+
+    @mock.patch.object(requests.Session, "get")
+    def test_retry_budget(self, mock_requests_get, mock_sleep):
+        self.client.retry_policy.budget = 1
+        mock_requests_get.return_value = FakeResponse("get", EXPECTED_URL, 504)
+
+        self.client.get(API_URL)
+        self.client.get(API_URL)
+
+        self.assertEqual(1, mock_sleep.call_count)
+        self.assertEqual(2, self.counters["budget_exhausted"])
+
+        self.client.retry_policy.reset_budget()
+        self.client.get(API_URL)
+        self.assertEqual(2, mock_sleep.call_count)
+
+
+class HTTPClientTimeoutTest(testtools.TestCase):
+    def setUp(self):
+        super().setUp()
+        osprofiler.profiler.init(None)
+        self.client = httpclient.HTTPClient(
+            API_BASE_URL, AUTH_TOKEN, connect_timeout=5, read_timeout=60
+        )
+
+    @mock.patch.object(requests.Session, "get")
+    def test_timeouts(self, mock_requests_get):
+        self.client.get(API_URL)
+
+        self.assertEqual((5, 60), mock_requests_get.call_args[1]["timeout"])
+
+    @mock.patch.object(httpclient.time, "monotonic")
+    @mock.patch.object(requests.Session, "get")
+    def test_deadline_bounds_timeouts(self, mock_requests_get, mock_monotonic):
+        mock_monotonic.return_value = 100
+        self.client.set_deadline(30)
+        mock_monotonic.return_value = 110
+
+        self.client.get(API_URL)
+
+        self.assertEqual((5, 20), mock_requests_get.call_args[1]["timeout"])
+
+    @mock.patch.object(httpclient.time, "monotonic")
+    @mock.patch.object(requests.Session, "delete")
+    def test_deadline_expired(self, mock_requests_delete, mock_monotonic):
+        mock_monotonic.return_value = 100
+        self.client.set_deadline(30)
+        mock_monotonic.return_value = 130
+
+        self.assertRaises(exceptions.DeadlineExceeded, self.client.delete, API_URL)
+        mock_requests_delete.assert_not_called()
+
+        self.client.set_deadline(None)
+        self.client.delete(API_URL)
+        mock_requests_delete.assert_called_once()
+
+    @mock.patch.object(httpclient.time, "monotonic")
+    def test_continue_command(self, mock_monotonic):
+        mock_monotonic.return_value = 100
+        self.client.retry_policy.budget = 1
+        self.client.set_deadline(30)
+        error = requests.ConnectionError()
+        self.assertIsNotNone(
+            self.client.retry_policy.retry_delay("get", 0, error=error)
+        )
+        new_client = httpclient.HTTPClient(
+            API_BASE_URL,
+            AUTH_TOKEN,
+            retry_policy=httpclient.RetryPolicy(budget=1),
+        )
+        self.addCleanup(new_client.close)
+        mock_monotonic.return_value = 110
+
+        new_client.continue_command(self.client)
+
+        self.assertEqual(20, new_client._remaining_time())
+        self.assertIsNone(new_client.retry_policy.retry_delay("get", 0, error=error))
+
+    @mock.patch.object(httpclient.time, "sleep")
+    @mock.patch.object(httpclient.time, "monotonic")
+    @mock.patch.object(requests.Session, "get")
+    def test_deadline_stops_retries(
+        self, mock_requests_get, mock_monotonic, mock_sleep
+    ):
+        mock_monotonic.return_value = 100
+        self.client.set_deadline(5)
+        mock_requests_get.return_value = FakeResponse(
+            "get", EXPECTED_URL, 503, {"Retry-After": "10"}
+        )
+
+        self.assertRaises(exceptions.DeadlineExceeded, self.client.get, API_URL)
+        mock_sleep.assert_not_called()
+
+    @mock.patch.object(httpclient.time, "monotonic")
+    @mock.patch.object(requests.Session, "post")
+    def test_timeout_after_deadline(self, mock_requests_post, mock_monotonic):
+        mock_monotonic.return_value = 100
+        self.client.set_deadline(5)
+
+        def post(*_args, **_kwargs):
+            mock_monotonic.return_value = 105
+            raise requests.ReadTimeout("timed out")
+
+        mock_requests_post.side_effect = post
+
+        self.assertRaises(exceptions.DeadlineExceeded, self.client.post, API_URL, "{}")
@@ -0,0 +1,138 @@
+# Copyright (c) 2026 Wind River Systems, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+
+import ctypes
+import errno
+import subprocess
+
+import mock
+import testtools
+
+from dcmanagerclient import keyutils
+from dcmanagerclient import utils
+
+
+class FakeKeyringBackend(keyutils.KeyringBackend):
+    def __init__(self):
+        self.keys = {}
+        self.timeouts = {}
+
+    def add(self, name, data):
+        key_id = str(len(self.keys) + 1)
+        self.keys[key_id] = (name, data)
+        return key_id
+
+    def set_timeout(self, key_id, timeout):
+        self.timeouts[key_id] = timeout
+
+    def search(self, name):
+        for key_id, (key_name, _data) in self.keys.items():
+            if key_name == name:
+                return key_id
+        raise OSError(errno.ENOKEY, "Required key not available")
+
+    def read(self, key_id):
+        return self.keys[key_id][1]
+
+    def revoke(self, key_id):
+        del self.keys[key_id]
+
+
+class KeyringUtilsTest(testtools.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.backend = FakeKeyringBackend()
+        keyutils.set_backend(self.backend)
+        self.addCleanup(keyutils.set_backend, None)
+
+    def test_persist_and_load(self):
+        key_id = utils.persist_auth_session_keyring(
+            "dcmanager_client:session", timeout=30, token="token"
+        )
+
+        self.assertEqual({key_id: 30}, self.backend.timeouts)
+        self.assertEqual(
+            {"token": "token"},
+            utils.load_auth_session_keyring_by_name("dcmanager_client:session"),
+        )
+
+    def test_load_missing_key(self):
+        self.assertEqual({}, utils.load_auth_session_keyring_by_name("missing"))
+
+    def test_revoke(self):
+        utils.persist_auth_session_keyring("dcmanager_client:session", token="token")
+        utils.revoke_keyring_by_name("dcmanager_client:session")
+        self.assertEqual({}, self.backend.keys)
+
+
+class KeyctlCommandBackendTest(testtools.TestCase):
+    @mock.patch.object(subprocess, "run")
+    def test_search(self, mock_run):
+        mock_run.return_value.stdout = b"123\n"
+
+        key_id = keyutils.KeyctlCommandBackend().search("name")
+
+        self.assertEqual("123", key_id)
+        mock_run.assert_called_once_with(
+            [keyutils.KEYCTL_PATH, "search", "@s", "user", "name"],
+            check=True,
+            capture_output=True,
+        )
+
+
+class KeyutilsBackendTest(testtools.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.library = mock.MagicMock()
+        self.backend = keyutils.KeyutilsBackend(library=self.library)
+
+    def test_add(self):
+        self.library.add_key.return_value = 123
+
+        self.assertEqual("123", self.backend.add("name", b"{}"))
+        self.library.add_key.assert_called_once_with(
+            b"user", b"name", b"{}", 2, keyutils.KEY_SPEC_SESSION_KEYRING
+        )
+
+    def test_read(self):
+        def keyctl_read(_key_id, buffer, size):
+            if buffer is not None:
+                ctypes.memmove(buffer, b'{"a": 1}', min(size, 8))
+            return 8
+
+        self.library.keyctl_read.side_effect = keyctl_read
+        self.assertEqual(b'{"a": 1}', self.backend.read("123"))
+
+    def test_set_timeout(self):
+        self.library.keyctl_set_timeout.return_value = 0
+
+        self.backend.set_timeout("123", 60)
+        self.backend.set_timeout("123", 2**40)
+
+        self.assertEqual(
+            [mock.call(123, 60), mock.call(123, keyutils.MAX_KEY_TIMEOUT)],
+            self.library.keyctl_set_timeout.call_args_list,
+        )
+
+    def test_set_invalid_timeout(self):
+        for timeout in (-1, 1.5, "60", True):
+            self.assertRaises(ValueError, self.backend.set_timeout, "123", timeout)
+        self.library.keyctl_set_timeout.assert_not_called()
+
+    @mock.patch.object(ctypes, "get_errno", return_value=errno.ENOKEY)
+    def test_search_missing_key(self, _mock_get_errno):
+        self.library.keyctl_search.return_value = -1
+        self.assertRaises(OSError, self.backend.search, "name")
+
+    @mock.patch.object(ctypes, "CDLL")
+    def test_library_loaded_by_soname(self, mock_cdll):
+        keyutils.KeyutilsBackend()
+        mock_cdll.assert_called_once_with(keyutils.KEYUTILS_LIBRARY, use_errno=True)
+
+    @mock.patch.object(ctypes, "CDLL", side_effect=OSError("not found"))
+    def test_fallback_to_keyctl_command(self, _mock_cdll):
+        keyutils.set_backend(None)
+        self.addCleanup(keyutils.set_backend, None)
+        self.assertIsInstance(keyutils.get_backend(), keyutils.KeyctlCommandBackend)
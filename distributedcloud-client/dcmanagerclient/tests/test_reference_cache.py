@@ -0,0 +1,159 @@
+# Copyright (c) 2026 Wind River Systems, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+
+import json
+
+import mock
+import requests
+import testtools
+
+from dcmanagerclient.api import httpclient
+from dcmanagerclient.api import reference_cache
+from dcmanagerclient.api.v1.subcloud_group_manager import SubcloudGroupManager
+from dcmanagerclient.api.v1.subcloud_manager import SubcloudManager
+from dcmanagerclient.tests import base
+
+API_BASE_URL = "http://localhost:8119/v1.0"
+NO_RETRY = httpclient.RetryPolicy(retries=0)
+
+GROUP_PAYLOAD = {
+    "id": 2,
+    "name": "group1",
+    "description": "group description",
+    "update_apply_type": "parallel",
+    "max_parallel_subclouds": 2,
+    "created-at": base.TIME_NOW,
+    "updated-at": base.TIME_NOW,
+}
+
+
+def _response(status_code):
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = b"{}"
+    response.request = requests.Request("GET", API_BASE_URL).prepare()
+    return response
+
+
+class ReferenceCacheTest(testtools.TestCase):
+    def test_get_and_put(self):
+        cache = reference_cache.ReferenceCache()
+        resource = object()
+
+        self.assertIsNone(cache.get("subclouds", "subcloud1"))
+        cache.put("subclouds", resource, 1, "subcloud1")
+
+        self.assertIs(resource, cache.get("subclouds", "1"))
+        self.assertIs(resource, cache.get("subclouds", "subcloud1"))
+        self.assertIsNone(cache.get("subcloud_group", "subcloud1"))
+        self.assertEqual(2, cache.hits)
+        self.assertEqual(2, cache.misses)
+
+    @mock.patch("time.monotonic")
+    def test_expired_entry(self, mock_monotonic):
+        cache = reference_cache.ReferenceCache(ttl=10)
+        mock_monotonic.return_value = 100
+        cache.put("subclouds", object(), "subcloud1")
+
+        mock_monotonic.return_value = 111
+
+        self.assertIsNone(cache.get("subclouds", "subcloud1"))
+        self.assertEqual(0, len(cache))
+
+    def test_least_recently_used_evicted(self):
+        cache = reference_cache.ReferenceCache(max_entries=2)
+        cache.put("subclouds", "first", "subcloud1")
+        cache.put("subclouds", "second", "subcloud2")
+        cache.get("subclouds", "subcloud1")
+        cache.put("subclouds", "third", "subcloud3")
+
+        self.assertEqual("first", cache.get("subclouds", "subcloud1"))
+        self.assertIsNone(cache.get("subclouds", "subcloud2"))
+        self.assertEqual("third", cache.get("subclouds", "subcloud3"))
+
+
+class ManagerReferenceCacheTest(testtools.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.http_client = mock.MagicMock()
+        self.cache = reference_cache.ReferenceCache()
+        self.subcloud_manager = SubcloudManager(
+            self.http_client, reference_cache=self.cache
+        )
+        self.group_manager = SubcloudGroupManager(
+            self.http_client, self.subcloud_manager, reference_cache=self.cache
+        )
+
+    def _http_client(self):
+        http_client = httpclient.HTTPClient(
+            API_BASE_URL, "token", reference_cache=self.cache, retry_policy=NO_RETRY
+        )
+        self.addCleanup(http_client.close)
+        return http_client
+
+    def test_subcloud_lookups_cached(self):
+        self.http_client.get.return_value = base.FakeResponse(
+            200, json.dumps(base.SUBCLOUD_PAYLOAD)
+        )
+
+        subcloud = self.subcloud_manager.lookup_subcloud(base.NAME)
+
+        self.assertIs(subcloud, self.subcloud_manager.lookup_subcloud(base.ID))
+        self.assertEqual(base.ID, self.subcloud_manager.get_subcloud_id(base.NAME))
+        self.http_client.get.assert_called_once_with(f"/subclouds/{base.NAME}")
+        self.assertEqual(2, self.cache.hits)
+
+    def test_group_lookups_cached(self):
+        self.http_client.get.return_value = base.FakeResponse(
+            200, json.dumps(GROUP_PAYLOAD)
+        )
+
+        self.assertEqual(2, self.group_manager.get_subcloud_group_id("group1"))
+        self.assertEqual(2, self.group_manager.get_subcloud_group_id(2))
+        self.http_client.get.assert_called_once_with("/subcloud-groups/group1")
+
+    @mock.patch.object(requests.Session, "delete")
+    def test_mutating_call_invalidates(self, mock_delete):
+        self.cache.put("subclouds", mock.MagicMock(), base.NAME)
+        mock_delete.return_value = _response(200)
+
+        SubcloudManager(self._http_client()).delete_subcloud(base.NAME)
+
+        self.assertEqual(0, len(self.cache))
+
+    @mock.patch.object(requests.Session, "patch")
+    def test_failed_mutating_call_invalidates(self, mock_patch):
+        self.cache.put("subcloud_group", mock.MagicMock(), "group1")
+        mock_patch.side_effect = requests.ConnectionError("connection lost")
+        group_manager = SubcloudGroupManager(
+            self._http_client(), self.subcloud_manager, reference_cache=self.cache
+        )
+
+        self.assertRaises(
+            requests.ConnectionError,
+            group_manager.update_subcloud_group,
+            "group1",
+            name="g2",
+        )
+        self.assertEqual(0, len(self.cache))
+
+    @mock.patch.object(requests.Session, "post")
+    def test_change_from_any_manager_invalidates(self, mock_post):
+        # Managers without reference lookups can rename or move subclouds too
+        self.cache.put("subclouds", mock.MagicMock(), base.NAME)
+        mock_post.return_value = _response(200)
+
+        self._http_client().post("/phased-subcloud-deploy", "{}")
+
+        self.assertEqual(0, len(self.cache))
+
+    @mock.patch.object(requests.Session, "get")
+    def test_read_keeps_references(self, mock_get):
+        self.cache.put("subclouds", mock.MagicMock(), base.NAME)
+        mock_get.return_value = _response(200)
+
+        self._http_client().get("/subclouds")
+
+        self.assertEqual(1, len(self.cache))
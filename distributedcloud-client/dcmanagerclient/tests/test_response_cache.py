@@ -0,0 +1,175 @@
+# Copyright (c) 2026 Wind River Systems, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+
+import os
+import shutil
+import tempfile
+
+import mock
+import requests
+import testtools
+
+from dcmanagerclient.api import httpclient
+from dcmanagerclient.api import response_cache
+
+API_BASE_URL = "http://localhost:8119/v1.0"
+API_URL = "/subclouds"
+EXPECTED_URL = API_BASE_URL + API_URL
+ETAG = '"5f2b"'
+
+
+def _response(status_code=200, content=b'{"subclouds": []}', headers=None):
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = content
+    response.headers.update(headers or {})
+    response.url = EXPECTED_URL
+    response.request = requests.Request("GET", EXPECTED_URL).prepare()
+    return response
+
+
+class ResponseCacheTest(testtools.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.cache_dir)
+        self.cache = response_cache.ResponseCache(
+            ttl=60, path=os.path.join(self.cache_dir, "cache", "responses.sqlite")
+        )
+        self.addCleanup(self.cache.close)
+
+    def test_put_and_get(self):
+        key = self.cache.make_key("identity", EXPECTED_URL)
+        self.cache.put(key, "identity", _response(headers={"ETag": ETAG}))
+
+        cached = self.cache.get(key)
+
+        self.assertEqual(b'{"subclouds": []}', cached.content)
+        self.assertTrue(self.cache.is_fresh(cached))
+        self.assertEqual({"If-None-Match": ETAG}, cached.validators)
+        self.assertEqual({"subclouds": []}, cached.to_response().json())
+        cache_dir_mode = os.stat(os.path.dirname(self.cache.path)).st_mode
+        self.assertEqual(0o700, cache_dir_mode & 0o777)
+        self.assertEqual(0o600, os.stat(self.cache.path).st_mode & 0o777)
+
+    def test_keys_depend_on_identity(self):
+        self.assertNotEqual(
+            self.cache.make_key("user1", EXPECTED_URL),
+            self.cache.make_key("user2", EXPECTED_URL),
+        )
+
+    def test_not_stored(self):
+        key = self.cache.make_key("identity", EXPECTED_URL)
+        self.cache.put(key, "identity", _response(status_code=404))
+        self.cache.put(
+            key, "identity", _response(headers={"Cache-Control": "no-store"})
+        )
+        self.assertIsNone(self.cache.get(key))
+
+    def test_least_recently_used_evicted(self):
+        self.cache.max_size = 50
+        keys = [
+            self.cache.make_key("identity", f"{EXPECTED_URL}/{i}") for i in range(3)
+        ]
+        self.cache.put(keys[0], "identity", _response(content=b"0" * 20))
+        self.cache.put(keys[1], "identity", _response(content=b"1" * 20))
+        self.cache.get(keys[0])
+        self.cache.put(keys[2], "identity", _response(content=b"2" * 20))
+
+        self.assertIsNotNone(self.cache.get(keys[0]))
+        self.assertIsNone(self.cache.get(keys[1]))
+        self.assertIsNotNone(self.cache.get(keys[2]))
+
+    def test_invalidate(self):
+        key = self.cache.make_key("identity", EXPECTED_URL)
+        other_key = self.cache.make_key("other", EXPECTED_URL)
+        self.cache.put(key, "identity", _response())
+        self.cache.put(other_key, "other", _response())
+
+        self.cache.invalidate("identity")
+
+        self.assertIsNone(self.cache.get(key))
+        self.assertIsNotNone(self.cache.get(other_key))
+
+    def test_unusable_cache_file(self):
+        cache = response_cache.ResponseCache(ttl=60, path=self.cache_dir)
+        key = cache.make_key("identity", EXPECTED_URL)
+        cache.put(key, "identity", _response())
+        self.assertIsNone(cache.get(key))
+
+
+class HTTPClientResponseCacheTest(testtools.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.cache = mock.MagicMock()
+        self.cache.make_key.return_value = "key"
+        self.client = httpclient.HTTPClient(
+            API_BASE_URL, "token", "project", "user", response_cache=self.cache
+        )
+        mock_get = mock.patch.object(requests.Session, "get")
+        self.mock_get = mock_get.start()
+        self.addCleanup(mock_get.stop)
+
+    def _cached(self, fresh):
+        cached = response_cache.CachedResponse(
+            "key", EXPECTED_URL, 200, {"etag": ETAG}, b"{}", 0
+        )
+        self.cache.get.return_value = cached
+        self.cache.is_fresh.return_value = fresh
+        return cached
+
+    def test_fresh_response_served_from_cache(self):
+        self._cached(fresh=True)
+
+        resp = self.client.get(API_URL)
+
+        self.assertEqual({}, resp.json())
+        self.mock_get.assert_not_called()
+
+    def test_stale_response_revalidated(self):
+        cached = self._cached(fresh=False)
+        self.mock_get.return_value = _response(status_code=304, content=b"")
+
+        resp = self.client.get(API_URL)
+
+        self.assertEqual({}, resp.json())
+        headers = self.mock_get.call_args[1]["headers"]
+        self.assertEqual(ETAG, headers["If-None-Match"])
+        self.cache.revalidated.assert_called_once_with(cached)
+        self.cache.put.assert_not_called()
+
+    def test_stale_response_replaced(self):
+        self._cached(fresh=False)
+        new_response = _response()
+        self.mock_get.return_value = new_response
+
+        resp = self.client.get(API_URL)
+
+        self.assertIs(new_response, resp)
+        self.cache.put.assert_called_once_with(
+            "key", self.client.auth_identity, new_response
+        )
+
+    def test_refresh_cache(self):
+        self.client.refresh_cache = True
+        self.mock_get.return_value = _response()
+
+        self.client.get(API_URL)
+
+        self.cache.get.assert_not_called()
+        self.cache.put.assert_called_once()
+        self.assertNotIn("If-None-Match", self.mock_get.call_args[1]["headers"])
+
+    def test_streamed_request_not_cached(self):
+        self.mock_get.return_value = _response()
+        self.client.get(API_URL, stream=True)
+        self.cache.get.assert_not_called()
+        self.cache.put.assert_not_called()
+
+    @mock.patch.object(requests.Session, "patch")
+    def test_update_invalidates_cache(self, mock_patch):
+        mock_patch.return_value = _response()
+        self.client.patch(API_URL, "{}")
+        self.cache.invalidate.assert_called_once_with(self.client.auth_identity)
@@ -14,10 +14,30 @@
 #    limitations under the License.
 #
 
+import os
+import subprocess
+import sys
+
 import mock
+import testtools
 
+from dcmanagerclient import shell
+from dcmanagerclient.commands.v1 import subcloud_manager as subcloud_cmd
 from dcmanagerclient.tests import base_shell_test as base
 
+# Builds the command map in a fresh interpreter and prints the heavy modules
+# it imported
+STARTUP_SCRIPT = """
+import sys
+from dcmanagerclient import shell
+dcmanager_shell = shell.DCManagerShell()
+assert [name for name, _command in dcmanager_shell.command_manager]
+for module in ("dcmanagerclient.commands.v1.subcloud_manager", "bs4",
+               "requests_toolbelt"):
+    if module in sys.modules:
+        print(module)
+"""
+
 
 class TestShell(base.BaseShellTests):
     @mock.patch("dcmanagerclient.api.client.determine_client_version")
@@ -139,6 +159,56 @@ class TestShell(base.BaseShellTests):
         params = mock_client.call_args
         self.assertEqual(None, params[1]["profile"])
 
+    @mock.patch("dcmanagerclient.api.client.client")
+    def test_dcmanager_retries(self, mock_client):
+        self.shell("--retries=5 --retry-budget=20 quota defaults")
+        params = mock_client.call_args
+        self.assertEqual(5, params[1]["retries"])
+        self.assertEqual(20, params[1]["retry_budget"])
+
+    @mock.patch("dcmanagerclient.api.client.client")
+    def test_dcmanager_default_retries(self, mock_client):
+        self.shell("quota defaults")
+        params = mock_client.call_args
+        self.assertEqual(3, params[1]["retries"])
+        self.assertIsNone(params[1]["retry_budget"])
+
+    @mock.patch("dcmanagerclient.api.client.client")
+    def test_dcmanager_timeouts(self, mock_client):
+        self.shell("--connect-timeout=5 --read-timeout=60 quota defaults")
+        params = mock_client.call_args
+        self.assertEqual(5, params[1]["connect_timeout"])
+        self.assertEqual(60, params[1]["read_timeout"])
+
+    def test_dcmanager_deadline(self):
+        dcmanager_shell = shell.DCManagerShell()
+        dcmanager_shell.options = mock.Mock(deadline=90.0)
+        dcmanager_shell.client = mock.MagicMock()
+        http_client = dcmanager_shell.client.http_client
+
+        dcmanager_shell.prepare_to_run_command(mock.Mock())
+        http_client.set_deadline.assert_called_once_with(90.0)
+        http_client.retry_policy.reset_budget.assert_called_once_with()
+
+        dcmanager_shell.clean_up(mock.Mock(), 0, None)
+        http_client.set_deadline.assert_called_with(None)
+
+    @mock.patch("dcmanagerclient.api.client.client")
+    def test_reloaded_client_continues_command(self, mock_client):
+        dcmanager_shell = shell.DCManagerShell()
+        dcmanager_shell.options = dcmanager_shell.parser.parse_args(["--deadline=90"])
+        previous_client = mock.MagicMock()
+        dcmanager_shell.client = previous_client
+
+        # Reloaded after an authentication error in the middle of a command
+        dcmanager_shell.load_client(refresh_cache=True)
+
+        previous_client.close.assert_called_once_with()
+        new_http_client = mock_client.return_value.http_client
+        new_http_client.continue_command.assert_called_once_with(
+            previous_client.http_client
+        )
+
     @mock.patch("dcmanagerclient.api.client.client")
     def test_dcmanager_project_name(self, mock_client):
         self.shell("--os-project-name default quota defaults")
@@ -180,3 +250,72 @@ class TestShell(base.BaseShellTests):
         self.assertTrue(mock_client.called)
         params = mock_client.call_args
         self.assertEqual("default", params[1]["user_domain_id"])
+
+
+class TestLazyCommands(testtools.TestCase):
+    def test_commands_resolve(self):
+        dcmanager_shell = shell.DCManagerShell()
+        for name, command in dcmanager_shell.command_manager:
+            self.assertTrue(hasattr(command.load(), "take_action"), name)
+
+    def test_command_found(self):
+        dcmanager_shell = shell.DCManagerShell()
+        command, name, _args = dcmanager_shell.command_manager.find_command(
+            ["subcloud", "list"]
+        )
+        self.assertEqual("subcloud list", name)
+        self.assertIs(subcloud_cmd.ListSubcloud, command)
+
+    def test_startup_does_not_import_commands(self):
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+        result = subprocess.run(
+            [sys.executable, "-c", STARTUP_SCRIPT],
+            check=True,
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        self.assertEqual("", result.stdout)
+
+
+class TestLazyClient(testtools.TestCase):
+    @mock.patch("keystoneauth1.session.Session")
+    def test_load_client_does_not_authenticate(self, mock_keystone_auth_session):
+        dcmanager_shell = shell.DCManagerShell()
+        dcmanager_shell.options = dcmanager_shell.parser.parse_args(
+            [
+                "--os-auth-url=http://127.0.0.1:35357/v3",
+                "--os-username=admin",
+                "--os-password=1234",
+                "--os-tenant-name=admin",
+                "--no-cache",
+            ]
+        )
+
+        dcmanager_shell.load_client(refresh_cache=False, skip_auth=False)
+        client_manager = dcmanager_shell.client_manager
+
+        # The managers are created on first use, keystone on the first request
+        self.assertNotIn("alarm_manager", vars(dcmanager_shell.client))
+        self.assertIs(
+            dcmanager_shell.client.alarm_manager, client_manager.alarm_manager
+        )
+        self.assertRaises(AttributeError, getattr, client_manager, "http_client")
+        mock_keystone_auth_session.return_value.get_token.assert_not_called()
+
+    @mock.patch("dcmanagerclient.api.client.client")
+    def test_no_cache_disables_response_cache(self, mock_client):
+        dcmanager_shell = shell.DCManagerShell()
+        for no_cache, response_cache_ttl in (([], 60), (["--no-cache"], None)):
+            dcmanager_shell.options = dcmanager_shell.parser.parse_args(
+                ["--dcmanager-url=http://127.0.0.1:8119/v1.0"]
+                + ["--response-cache-ttl=60"]
+                + no_cache
+            )
+
+            dcmanager_shell.load_client(refresh_cache=False, skip_auth=True)
+
+            self.assertEqual(
+                response_cache_ttl,
+                mock_client.call_args[1]["response_cache_ttl"],
+            )
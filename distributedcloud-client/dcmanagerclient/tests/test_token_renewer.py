@@ -0,0 +1,107 @@
+# Copyright (c) 2026 Wind River Systems, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+#
+
+import datetime
+
+import mock
+import testtools
+
+from dcmanagerclient.api import httpclient
+from dcmanagerclient.api import token_renewer
+from dcmanagerclient.api.v1.client import AuthResult
+
+API_BASE_URL = "http://localhost:8119/v1.0"
+
+
+def _expiring_in(seconds):
+    now = datetime.datetime.now(datetime.timezone.utc)
+    return now + datetime.timedelta(seconds=seconds)
+
+
+def _auth(token, expires_at):
+    return AuthResult(API_BASE_URL, token, "project", "user", expires_at, None)
+
+
+@mock.patch.object(token_renewer.threading, "Timer")
+class TokenRenewerTest(testtools.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.http_client = httpclient.HTTPClient(
+            API_BASE_URL, "token1", "project", "user"
+        )
+        self.renew = mock.Mock()
+
+    def _renewer(self, seconds):
+        return token_renewer.TokenRenewer(
+            self.http_client, self.renew, _expiring_in(seconds)
+        )
+
+    def test_renewal_scheduled_before_expiry(self, mock_timer):
+        renewer = self._renewer(3600)
+
+        delay = mock_timer.call_args[0][0]
+        self.assertAlmostEqual(3600 - token_renewer.TOKEN_RENEWAL_MARGIN, delay, 0)
+        self.assertTrue(mock_timer.return_value.daemon)
+        mock_timer.return_value.start.assert_called_once_with()
+        self.renew.assert_not_called()
+
+        renewer.close()
+        mock_timer.return_value.cancel.assert_called_once_with()
+
+    def test_short_lived_token_renewed_half_way(self, mock_timer):
+        self._renewer(120)
+        self.assertAlmostEqual(60, mock_timer.call_args[0][0], 0)
+
+    def test_renew_swaps_credentials(self, mock_timer):
+        renewer = self._renewer(3600)
+        self.renew.return_value = _auth("token2", _expiring_in(7200))
+
+        renewer.renew()
+
+        self.renew.assert_called_once_with(mock.ANY)
+        self.assertEqual("token2", self.http_client.token)
+        self.assertEqual("token2", self.http_client._update_headers({})["x-auth-token"])
+        self.assertEqual(1, renewer.renewals)
+        self.assertEqual(2, mock_timer.call_count)
+        self.assertAlmostEqual(
+            7200 - token_renewer.TOKEN_RENEWAL_MARGIN, mock_timer.call_args[0][0], 0
+        )
+
+    def test_failed_renewal_retried(self, mock_timer):
+        renewer = self._renewer(3600)
+        self.renew.side_effect = RuntimeError("keystone unavailable")
+
+        renewer.renew()
+
+        self.assertEqual("token1", self.http_client.token)
+        self.assertEqual(1, renewer.failures)
+        self.assertEqual(token_renewer.TOKEN_RENEWAL_RETRY, mock_timer.call_args[0][0])
+
+    def test_renewal_not_expiring_later_fails(self, _mock_timer):
+        expires_at = _expiring_in(3600)
+        renewer = token_renewer.TokenRenewer(self.http_client, self.renew, expires_at)
+        self.renew.return_value = _auth("token2", expires_at)
+
+        renewer.renew()
+
+        self.assertEqual("token1", self.http_client.token)
+        self.assertEqual(1, renewer.failures)
+
+    def test_expired_token_not_retried(self, mock_timer):
+        renewer = self._renewer(-10)
+        self.renew.side_effect = RuntimeError("keystone unavailable")
+
+        renewer.renew()
+
+        self.assertEqual(1, mock_timer.call_count)
+
+    def test_no_renewal_after_close(self, mock_timer):
+        renewer = self._renewer(3600)
+        renewer.close()
+        self.renew.return_value = _auth("token2", _expiring_in(7200))
+
+        renewer.renew()
+
+        self.assertEqual(1, mock_timer.call_count)
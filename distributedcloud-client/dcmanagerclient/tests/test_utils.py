@@ -14,6 +14,7 @@
 #    limitations under the License.
 #
 
+import io
 import json
 import os
 import tarfile
@@ -43,6 +44,19 @@ class UtilityTest(testtools.TestCase):
     def test_load_yaml_content(self):
         self.assertDictEqual(ENV_DICT, utils.load_content(ENV_YAML))
 
+    def test_run_concurrently(self):
+        def action(value):
+            if value == 2:
+                raise ValueError("failed")
+            return value * 10
+
+        results = sorted(utils.run_concurrently(action, [1, 2, 3], max_workers=2))
+
+        self.assertEqual((1, 10, None), results[0])
+        self.assertEqual(2, results[1][0])
+        self.assertIsInstance(results[1][2], ValueError)
+        self.assertEqual((3, 30, None), results[2])
+
     def test_validate_cloud_init_config_file_not_exists(self):
         self.assertRaises(
             exceptions.DCManagerClientException,
@@ -99,3 +113,61 @@ class UtilityTest(testtools.TestCase):
             "    "
         )
         mock_print.assert_called_once_with(expected)
+
+    def test_progress_line(self):
+        stream = io.StringIO()
+        stream.isatty = lambda: True
+        progress = utils.ProgressLine(stream)
+
+        progress.update("1/10 done")
+        progress.update("2/10")
+        progress.close()
+
+        self.assertEqual("\r1/10 done\r2/10     \n", stream.getvalue())
+
+    def test_progress_line_not_a_terminal(self):
+        stream = io.StringIO()
+        progress = utils.ProgressLine(stream)
+        progress.update("1/10 done")
+        progress.close()
+        self.assertEqual("", stream.getvalue())
+
+    def test_upload_progress(self):
+        stream = io.StringIO()
+        stream.isatty = lambda: True
+
+        with utils.UploadProgress(stream, min_size=100) as progress:
+            progress(0, 50)
+            progress(0, 2097152)
+            progress(1024, 2097152)
+            progress(2097152, 2097152)
+
+        self.assertEqual(
+            "\rUploading: 0.0 of 2.0 MiB (0%)\rUploading: 2.0 of 2.0 MiB (100%)\n",
+            stream.getvalue(),
+        )
+
+    def test_runtime_dir(self):
+        with tempfile.TemporaryDirectory() as runtime_home:
+            with mock.patch.dict(os.environ, {"XDG_RUNTIME_DIR": runtime_home}):
+                path = utils.runtime_dir()
+                self.assertEqual(os.path.join(runtime_home, "dcmanagerclient"), path)
+                self.assertEqual(0o700, os.stat(path).st_mode & 0o777)
+
+                os.chmod(path, 0o777)
+                self.assertRaises(
+                    exceptions.DCManagerClientException, utils.runtime_dir
+                )
+
+    def test_file_lock(self):
+        with tempfile.TemporaryDirectory() as runtime_home:
+            with mock.patch.dict(os.environ, {"XDG_RUNTIME_DIR": runtime_home}):
+                with utils.file_lock("test.lock") as acquired:
+                    self.assertTrue(acquired)
+                    # The lock is held, another holder gives up after the timeout
+                    with utils.file_lock("test.lock", timeout=0) as other:
+                        self.assertFalse(other)
+
+                # Released once the first holder is done
+                with utils.file_lock("test.lock", timeout=0) as acquired:
+                    self.assertTrue(acquired)
@@ -3,6 +3,11 @@
 #
 # SPDX-License-Identifier: Apache-2.0
 #
+import mock
+
+from dcmanagerclient.api.v1.strategy_step_manager import StrategyStepManager
+from dcmanagerclient.commands.v1 import sw_update_manager as sw_update_cmd
+from dcmanagerclient.exceptions import DCManagerClientException
 from dcmanagerclient.tests.v1 import utils
 
 
@@ -104,6 +109,69 @@ class UpdateStrategyMixin:
         self.assertEqual(results[0], expected_strategy_type)
         self.assertEqual(results[1], expected_apply_type)
 
+    def _wait_for_apply(self, final_state, steps):
+        manager_to_test = self.sw_update_manager
+        manager_to_test.apply_sw_update_strategy.return_value = [
+            utils.make_strategy(state="applying")
+        ]
+        manager_to_test.update_sw_strategy_detail.side_effect = [
+            [utils.make_strategy(state="applying")],
+            [utils.make_strategy(state=final_state)],
+        ]
+        step_manager = StrategyStepManager(mock.MagicMock())
+        step_manager.list_strategy_steps = mock.Mock(side_effect=steps)
+        self.app.client_manager.strategy_step_manager = step_manager
+
+        cmd = self.apply_command(self.app, [])
+        parsed_args = cmd.get_parser("").parse_args(["--wait"])
+        with mock.patch.object(sw_update_cmd.time, "sleep") as mock_sleep:
+            columns, results = cmd.take_action(parsed_args)
+        return cmd, parsed_args, columns, results, mock_sleep
+
+    def test_apply_strategy_wait(self):
+        steps = [
+            [utils.make_strategy_step(state="applying")],
+            [utils.make_strategy_step(state="applying")],
+            [utils.make_strategy_step(state="complete")],
+        ]
+        cmd, parsed_args, columns, results, mock_sleep = self._wait_for_apply(
+            "complete", steps
+        )
+
+        self.assertEqual("complete", results[columns.index("state")])
+        # The polls are never served from the response cache
+        self.sw_update_manager.update_sw_strategy_detail.assert_called_with(cache=False)
+        step_manager = cmd.app.client_manager.strategy_step_manager
+        step_manager.list_strategy_steps.assert_called_with(cache=False)
+        # The polling slows down while the steps do not change
+        self.assertEqual([mock.call(2), mock.call(3.0)], mock_sleep.call_args_list)
+        self.assertEqual(
+            [
+                mock.call("subcloud1: stage 1 applying\n"),
+                mock.call("subcloud1: stage 1 complete\n"),
+            ],
+            self.app.stderr.write.call_args_list,
+        )
+        with mock.patch.object(sw_update_cmd.base.DCManagerShowOne, "produce_output"):
+            cmd.produce_output(parsed_args, columns, results)
+
+    def test_apply_strategy_wait_failed(self):
+        steps = [[utils.make_strategy_step(state="failed", details="error")]] * 3
+        cmd, parsed_args, columns, results, _ = self._wait_for_apply("failed", steps)
+
+        self.assertEqual("failed", results[columns.index("state")])
+        self.app.stderr.write.assert_called_once_with(
+            "subcloud1: stage 1 failed (error)\n"
+        )
+        with mock.patch.object(sw_update_cmd.base.DCManagerShowOne, "produce_output"):
+            self.assertRaises(
+                DCManagerClientException,
+                cmd.produce_output,
+                parsed_args,
+                columns,
+                results,
+            )
+
     def test_abort_strategy(self):
         # prepare mocked results
         manager_to_test = self.sw_update_manager
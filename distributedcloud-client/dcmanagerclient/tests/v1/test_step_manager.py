@@ -14,10 +14,15 @@
 #    limitations under the License.
 #
 
+import json
+
 import mock
 from oslo_utils import timeutils
+import testtools
 
+from dcmanagerclient import exceptions
 from dcmanagerclient.api.v1.strategy_step_manager import StrategyStep
+from dcmanagerclient.api.v1.strategy_step_manager import StrategyStepManager
 from dcmanagerclient.commands.v1 import sw_update_manager as cli_cmd
 from dcmanagerclient.tests import base
 
@@ -58,3 +63,144 @@ class TestCLI(base.BaseCommandTest):
         # The step object is a tuple based on the formatter
         for step in result_steps:
             self.assertEqual(TEST_CLOUD_ID, step[0])
+
+    def test_list_strategy_steps_filtered(self):
+        step_manager = self.app.client_manager.strategy_step_manager
+        step_manager.list_strategy_steps.return_value = []
+
+        self.call(
+            cli_cmd.ListSwUpdateStrategyStep,
+            app_args=[
+                "--state",
+                "failed",
+                "--state",
+                "applying",
+                "--stage",
+                "2",
+                "--cloud-prefix",
+                "subcloud1",
+                "--limit",
+                "10",
+                "--marker",
+                "subcloud10",
+            ],
+        )
+        step_manager.list_strategy_steps.assert_called_once_with(
+            state=["failed", "applying"],
+            stage=["2"],
+            cloud_prefix="subcloud1",
+            limit=10,
+            marker="subcloud10",
+        )
+
+    def test_list_strategy_steps_invalid_limit(self):
+        step_manager = self.app.client_manager.strategy_step_manager
+
+        self.assertRaises(
+            exceptions.DCManagerClientException,
+            self.call,
+            cli_cmd.ListSwUpdateStrategyStep,
+            app_args=["--limit", "-1"],
+        )
+        step_manager.list_strategy_steps.assert_not_called()
+
+
+def step_payload(cloud, state, updated_at):
+    return {
+        "cloud": cloud,
+        "stage": TEST_STAGE,
+        "state": state,
+        "details": "",
+        "started-at": None,
+        "finished-at": None,
+        "created-at": TEST_CREATED_AT,
+        "updated-at": updated_at,
+    }
+
+
+class TestStrategyStepManager(testtools.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.http_client = mock.MagicMock()
+        self.manager = StrategyStepManager(self.http_client)
+
+    def _poll_responses(self, *polls):
+        self.http_client.get.side_effect = [
+            base.FakeResponse(200, json.dumps({"strategy-steps": steps}))
+            for steps in polls
+        ]
+
+    def test_iter_strategy_step_changes(self):
+        self._poll_responses(
+            [
+                step_payload("subcloud1", "initial", "t1"),
+                step_payload("subcloud2", "initial", "t1"),
+            ],
+            [
+                step_payload("subcloud1", "initial", "t1"),
+                step_payload("subcloud2", "applying", "t2"),
+                step_payload("subcloud3", "initial", "t2"),
+            ],
+            [step_payload("subcloud2", "applying", "t3")],
+        )
+        changes = self.manager.iter_strategy_step_changes()
+
+        added, changed, removed = next(changes)
+        self.assertEqual(["subcloud1", "subcloud2"], [s.cloud for s in added])
+        self.assertEqual(([], []), (changed, removed))
+
+        added, changed, removed = next(changes)
+        self.assertEqual(["subcloud3"], [s.cloud for s in added])
+        self.assertEqual(["subcloud2"], [s.cloud for s in changed])
+        self.assertEqual([], removed)
+
+        # A new updated_at with the same fields is not a change
+        added, changed, removed = next(changes)
+        self.assertEqual(([], []), (added, changed))
+        self.assertEqual(["subcloud1", "subcloud3"], [s.cloud for s in removed])
+
+    def test_list_strategy_steps_filters(self):
+        self._poll_responses([step_payload("subcloud1", "failed", "t1")])
+
+        steps = self.manager.list_strategy_steps(
+            state=["failed", "applying"], stage=1, cloud_prefix="sub", limit=5
+        )
+
+        self.assertEqual(["subcloud1"], [s.cloud for s in steps])
+        self.http_client.get.assert_called_once_with(
+            "/sw-update-strategy/steps?state=failed&state=applying&stage=1"
+            "&cloud_prefix=sub&limit=5",
+            cache=True,
+        )
+
+    def test_list_strategy_steps_client_side_fallback(self):
+        # A server without filtering support returns every step
+        self._poll_responses(
+            [
+                step_payload("subcloud1", "complete", "t1"),
+                step_payload("subcloud2", "failed", "t1"),
+                step_payload("subcloud3", "failed", "t1"),
+                step_payload("subcloud4", "failed", "t1"),
+                step_payload("other", "failed", "t1"),
+            ]
+        )
+
+        steps = self.manager.list_strategy_steps(
+            state="failed", cloud_prefix="subcloud", limit=1, marker="subcloud2"
+        )
+
+        self.assertEqual(["subcloud3"], [s.cloud for s in steps])
+
+    def test_list_strategy_steps_invalid_limit(self):
+        self.assertRaises(ValueError, self.manager.list_strategy_steps, limit=-1)
+        self.http_client.get.assert_not_called()
+
+    def test_diff_strategy_steps_skips_unchanged_updated_at(self):
+        snapshot = {}
+        step = self.manager.build_from_json(step_payload("subcloud1", "initial", "t1"))
+        StrategyStepManager.diff_strategy_steps(snapshot, [step])
+
+        with mock.patch("builtins.hash") as mock_hash:
+            changes = StrategyStepManager.diff_strategy_steps(snapshot, [step])
+        mock_hash.assert_not_called()
+        self.assertEqual(([], [], []), changes)
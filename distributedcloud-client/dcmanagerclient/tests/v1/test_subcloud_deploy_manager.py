@@ -12,11 +12,19 @@
 #    limitations under the License.
 #
 
+import hashlib
+from http import server
+import json
 import os
+import shutil
 import tempfile
+import threading
+import zipfile
 
 import mock
+import testtools
 
+from dcmanagerclient.api import httpclient
 from dcmanagerclient.api.v1 import subcloud_deploy_manager as sdm
 from dcmanagerclient.commands.v1 import subcloud_deploy_manager
 from dcmanagerclient.exceptions import DCManagerClientException
@@ -201,6 +209,26 @@ class TestCLISubcloudDeployManagerV1(base.BaseCommandTest):
             actual_call[1],
         )
 
+    def test_subcloud_deploy_upload_chunked(self):
+        self.client.subcloud_deploy_upload.return_value = [SUBCLOUD_DEPLOY_PRESTAGE]
+
+        with tempfile.NamedTemporaryFile() as f1:
+            file_path_1 = os.path.abspath(f1.name)
+            self.call(
+                subcloud_deploy_manager.SubcloudDeployUpload,
+                app_args=[
+                    "--prestage-images",
+                    file_path_1,
+                    "--chunked",
+                    "--chunk-size",
+                    "8",
+                ],
+            )
+        self.assertEqual(
+            8 * 1024 * 1024,
+            self.client.subcloud_deploy_upload.call_args.kwargs["chunk_size"],
+        )
+
     def test_subcloud_deploy_upload_no_playbook(self):
         self.client.subcloud_deploy_upload.return_value = [SUBCLOUD_DEPLOY_NO_PLAYBOOK]
 
@@ -344,3 +372,259 @@ class TestCLISubcloudDeployManagerV1(base.BaseCommandTest):
         self.call(subcloud_deploy_manager.SubcloudDeployDelete)
         data = {"prestage_images": "False", "deployment_files": "False"}
         self.client.subcloud_deploy_delete.assert_called_once_with(None, data=data)
+
+
+class TestSubcloudDeployManagerV1(testtools.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.http_client = mock.MagicMock()
+        self.manager = sdm.SubcloudDeployManager(self.http_client)
+        work_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, work_dir)
+        self.manager.playbook_cache_dir = os.path.join(work_dir, "cache")
+
+        self.playbook = os.path.join(work_dir, "deploy", "playbook.yml")
+        self.role_tasks = os.path.join(work_dir, "deploy", "roles", "r1", "main.yml")
+        os.makedirs(os.path.dirname(self.role_tasks))
+        for path in (self.playbook, self.role_tasks):
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("- hosts: all\n")
+
+    def _get_playbook(self):
+        archive, filetype = self.manager._get_playbook(self.playbook)
+        self.addCleanup(archive.close)
+        self.assertEqual("application/zip", filetype)
+        with zipfile.ZipFile(archive) as zf:
+            self.assertEqual(["playbook.yml", "roles/r1/main.yml"], zf.namelist())
+        return archive
+
+    def test_playbook_archive_cached(self):
+        archive = self._get_playbook()
+
+        with mock.patch.object(
+            self.manager, "_write_playbook_archive"
+        ) as mock_write_archive:
+            self.assertEqual(archive.name, self._get_playbook().name)
+        mock_write_archive.assert_not_called()
+
+        with open(self.role_tasks, "a", encoding="utf-8") as f:
+            f.write("  tasks: []\n")
+        self.assertNotEqual(archive.name, self._get_playbook().name)
+
+    def test_playbook_archive_without_cache(self):
+        # The cache directory can not be created over a file
+        with open(self.manager.playbook_cache_dir, "w", encoding="utf-8"):
+            pass
+        self.assertIsInstance(self._get_playbook(), tempfile.SpooledTemporaryFile)
+
+    def test_upload_streams_playbook_archive(self):
+        uploaded = {}
+
+        def post(_url, body, **_kwargs):
+            uploaded["archive"] = body.fields["deploy_playbook"][1]
+            uploaded["body"] = body.read()
+            return base.FakeResponse(200, json.dumps({"deploy_playbook": "p"}))
+
+        self.http_client.post.side_effect = post
+
+        result = self.manager.subcloud_deploy_upload(
+            files={"deploy_playbook": self.playbook}, data={"release": "24.09"}
+        )
+
+        self.assertEqual("p", result[0].deploy_playbook)
+        self.assertIn(b"roles/r1/main.yml", uploaded["body"])
+        self.assertTrue(uploaded["archive"].closed)
+
+
+class FakeUploadHandler(server.BaseHTTPRequestHandler):
+    """Stand-in for a system controller accepting chunked uploads."""
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        pass
+
+    def _reply(self, status, body=None):
+        content = json.dumps(body or {}).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def _read_body(self):
+        return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        body = self._read_body()
+        state = self.server.state
+        if self.path == "/v1.0/subcloud-deploy/":
+            state["deploy_body"] = body
+            self._reply(200, {"prestage_images": "images.lst"})
+        elif not state["supported"]:
+            self._reply(404)
+        else:
+            upload_id = f"upload-{len(state['uploads'])}"
+            state["uploads"][upload_id] = bytearray()
+            self._reply(201, {"upload_id": upload_id, "offset": 0})
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        upload_id = self.path.rsplit("/", 1)[-1]
+        data = self.server.state["uploads"].get(upload_id)
+        if data is None:
+            self._reply(404)
+        else:
+            self._reply(200, {"offset": len(data)})
+
+    def do_PATCH(self):  # pylint: disable=invalid-name
+        chunk = self._read_body()
+        state = self.server.state
+        data = state["uploads"][self.path.rsplit("/", 1)[-1]]
+        offset = int(self.headers["Upload-Offset"])
+        state["offsets"].append(offset)
+        if state["fail"]:
+            state["fail"] -= 1
+            self._reply(500)
+            return
+        if state["stall"]:
+            state["stall"] -= 1
+            self._reply(200, {"offset": len(data)})
+            return
+        if state["corrupt"]:
+            state["corrupt"] -= 1
+            chunk = b"x" + chunk[1:]
+        checksum = "sha256 " + hashlib.sha256(chunk).hexdigest()
+        if checksum != self.headers["Upload-Checksum"]:
+            self._reply(460)
+        elif offset != len(data):
+            self._reply(409)
+        else:
+            data.extend(chunk)
+            self._reply(200, {"offset": len(data)})
+
+
+class TestSubcloudDeployChunkedUpload(testtools.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.server = server.ThreadingHTTPServer(("127.0.0.1", 0), FakeUploadHandler)
+        self.server.state = {
+            "supported": True,
+            "uploads": {},
+            "offsets": [],
+            "fail": 0,
+            "corrupt": 0,
+            "stall": 0,
+        }
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+        http_client = httpclient.HTTPClient(
+            f"http://127.0.0.1:{self.server.server_port}/v1.0", "token"
+        )
+        self.addCleanup(http_client.close)
+        self.manager = sdm.SubcloudDeployManager(http_client)
+        work_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, work_dir)
+        self.manager.upload_state_dir = os.path.join(work_dir, "uploads")
+        retry_delay = mock.patch.object(sdm, "CHUNK_RETRY_DELAY", 0)
+        retry_delay.start()
+        self.addCleanup(retry_delay.stop)
+
+        self.images = os.path.join(work_dir, "images.lst")
+        self.content = os.urandom(10 * 1024)
+        with open(self.images, "wb") as f:
+            f.write(self.content)
+
+    def _upload(self, progress=None):
+        return self.manager.subcloud_deploy_upload(
+            files={"prestage_images": self.images},
+            data={"release": "24.09"},
+            chunk_size=4096,
+            progress=progress,
+        )
+
+    def test_chunked_upload(self):
+        progress = mock.Mock()
+
+        result = self._upload(progress)
+
+        self.assertEqual("images.lst", result[0].prestage_images)
+        state = self.server.state
+        self.assertEqual(self.content, state["uploads"]["upload-0"])
+        self.assertEqual([0, 4096, 8192], state["offsets"])
+        self.assertIn(b"prestage_images_upload_id", state["deploy_body"])
+        self.assertNotIn(self.content, state["deploy_body"])
+        progress.assert_any_call(len(self.content), len(self.content))
+        # The final request reports its progress too
+        body_size = len(state["deploy_body"])
+        progress.assert_called_with(body_size, body_size)
+        self.assertEqual([], os.listdir(self.manager.upload_state_dir))
+
+    def test_chunked_upload_retries_failed_chunks(self):
+        self.server.state["fail"] = 1
+        self.server.state["corrupt"] = 1
+
+        self._upload()
+
+        self.assertEqual(self.content, self.server.state["uploads"]["upload-0"])
+        self.assertEqual([0, 0, 0, 4096, 8192], self.server.state["offsets"])
+
+    def test_chunked_upload_stalled_offset(self):
+        self.server.state["stall"] = 1 + sdm.CHUNK_RETRIES
+
+        self.assertRaises(DCManagerClientException, self._upload)
+
+        self.assertEqual([0] * (1 + sdm.CHUNK_RETRIES), self.server.state["offsets"])
+        self.assertNotIn("deploy_body", self.server.state)
+
+    def test_chunked_upload_resumes(self):
+        def fail_remaining_chunks(*_):
+            self.server.state["fail"] = 1 + sdm.CHUNK_RETRIES
+
+        # The first chunk is stored, the next one fails until the client gives up
+        progress = mock.Mock(side_effect=fail_remaining_chunks)
+        self.assertRaises(DCManagerClientException, self._upload, progress)
+        self.assertEqual(4096, len(self.server.state["uploads"]["upload-0"]))
+
+        self.server.state["offsets"] = []
+        self._upload()
+
+        self.assertEqual(1, len(self.server.state["uploads"]))
+        self.assertEqual(self.content, self.server.state["uploads"]["upload-0"])
+        self.assertEqual([4096, 8192], self.server.state["offsets"])
+
+    def test_chunked_upload_fallback(self):
+        self.server.state["supported"] = False
+
+        self._upload()
+
+        self.assertEqual([], self.server.state["offsets"])
+        self.assertIn(self.content, self.server.state["deploy_body"])
+
+    def test_chunked_upload_fallback_after_upload(self):
+        chart = os.path.join(os.path.dirname(self.images), "chart.tgz")
+        with open(chart, "wb") as f:
+            f.write(os.urandom(8 * 1024))
+        start_upload = self.manager._start_upload
+
+        def unsupported_after_first(field, path, data):
+            upload = start_upload(field, path, data)
+            self.server.state["supported"] = False
+            return upload
+
+        with mock.patch.object(
+            self.manager, "_start_upload", side_effect=unsupported_after_first
+        ):
+            self.manager.subcloud_deploy_upload(
+                files={"prestage_images": self.images, "deploy_chart": chart},
+                data={"release": "24.09"},
+                chunk_size=4096,
+            )
+
+        # The file uploaded in chunks is sent again with the single request
+        body = self.server.state["deploy_body"]
+        self.assertEqual(self.content, self.server.state["uploads"]["upload-0"])
+        self.assertIn(self.content, body)
+        with open(chart, "rb") as f:
+            self.assertIn(f.read(), body)
+        self.assertNotIn(b"_upload_id", body)
@@ -15,15 +15,22 @@
 #
 
 import copy
+import json
 import os
 import tarfile
 import tempfile
+import timeit
 
 import mock
+import testtools
+from testtools import content as test_content
 import yaml
 
+from dcmanagerclient import utils
+from dcmanagerclient.api import base as api_base
+from dcmanagerclient.api.v1.subcloud_manager import SubcloudManager
 from dcmanagerclient.commands.v1 import subcloud_manager as subcloud_cmd
-from dcmanagerclient.exceptions import DCManagerClientException
+from dcmanagerclient.exceptions import APIException, DCManagerClientException
 from dcmanagerclient.tests import base
 
 
@@ -76,10 +83,185 @@ class TestCLISubcloudManagerV1(base.BaseCommandTest):
             ["name", "prestage_status", "prestage_versions"],
         )
 
+    def test_list_subclouds_with_filters(self):
+        self.client.subcloud_manager.list_subclouds.return_value = [
+            self.subcloud_resource
+        ]
+        self.call(
+            subcloud_cmd.ListSubcloud,
+            app_args=[
+                "--deploy-status",
+                "complete",
+                "--availability",
+                "online",
+                "--group",
+                "1",
+                "--name-prefix",
+                "subcloud",
+                "--limit",
+                "10",
+            ],
+        )
+        self.client.subcloud_manager.list_subclouds.assert_called_once_with(
+            deploy_status=["complete"],
+            availability_status="online",
+            management_state=None,
+            group_id="1",
+            peer_group_id=None,
+            name_prefix="subcloud",
+            limit=10,
+            marker=None,
+        )
+        self.client.subcloud_group_manager.get_subcloud_group_id.assert_not_called()
+
+    def test_list_subclouds_secondary_excluded_before_limit(self):
+        self.client.subcloud_manager.list_subclouds.return_value = []
+        self.call(subcloud_cmd.ListSubcloud, app_args=["--limit", "5"])
+        self.client.subcloud_manager.list_subclouds.assert_called_once_with(
+            deploy_status=None,
+            availability_status=None,
+            management_state=None,
+            group_id=None,
+            peer_group_id=None,
+            name_prefix=None,
+            exclude_deploy_status=subcloud_cmd.SECONDARY_DEPLOY_STATES,
+            limit=5,
+            marker=None,
+        )
+
+    def test_list_subclouds_invalid_limit(self):
+        self.assertRaises(
+            DCManagerClientException,
+            self.call,
+            subcloud_cmd.ListSubcloud,
+            app_args=["--limit", "0"],
+        )
+        self.client.subcloud_manager.list_subclouds.assert_not_called()
+
+    def test_list_subclouds_with_group_name(self):
+        subcloud_group_manager = self.client.subcloud_group_manager
+        subcloud_group_manager.get_subcloud_group_id.return_value = 2
+        peer_group_manager = self.client.subcloud_peer_group_manager
+        peer_group_manager.get_subcloud_peer_group_id.return_value = 3
+        self.client.subcloud_manager.list_subclouds.return_value = []
+        self.call(
+            subcloud_cmd.ListSubcloud,
+            app_args=["--group", "group1", "--peer-group", "peer1"],
+        )
+        # Resolved through the client reference cache
+        subcloud_group_manager.get_subcloud_group_id.assert_called_once_with("group1")
+        peer_group_manager.get_subcloud_peer_group_id.assert_called_once_with("peer1")
+        call_kwargs = self.client.subcloud_manager.list_subclouds.call_args[1]
+        self.assertEqual(2, call_kwargs["group_id"])
+        self.assertEqual(3, call_kwargs["peer_group_id"])
+
+    def test_list_subclouds_stream(self):
+        self.client.subcloud_manager.stream_subclouds.return_value = (
+            s for s in [self.subcloud_resource]
+        )
+        actual_call = self.call(subcloud_cmd.ListSubcloud, app_args=["--stream"])
+        self.assertEqual([base.SUBCLOUD_LIST_RESULT], list(actual_call[1]))
+        self.client.subcloud_manager.list_subclouds.assert_not_called()
+        call_kwargs = self.client.subcloud_manager.stream_subclouds.call_args[1]
+        self.assertEqual(
+            subcloud_cmd.SECONDARY_DEPLOY_STATES, call_kwargs["exclude_deploy_status"]
+        )
+
+    def test_list_subclouds_stream_auth_error_retried(self):
+        auth_error = DCManagerClientException("unauthorized")
+        auth_error.error_code = 401
+        self.client.subcloud_manager.stream_subclouds.side_effect = [
+            auth_error,
+            (s for s in [self.subcloud_resource]),
+        ]
+
+        actual_call = self.call(subcloud_cmd.ListSubcloud, app_args=["--stream"])
+
+        self.app.load_client.assert_called_once_with(refresh_cache=True)
+        self.assertEqual([base.SUBCLOUD_LIST_RESULT], list(actual_call[1]))
+
+    def test_list_subclouds_stream_with_limit(self):
+        self.assertRaises(
+            DCManagerClientException,
+            self.call,
+            subcloud_cmd.ListSubcloud,
+            app_args=["--stream", "--limit", "10"],
+        )
+
     def test_delete_subcloud_with_subcloud_id(self):
         self.call(subcloud_cmd.DeleteSubcloud, app_args=[base.ID])
         self.client.subcloud_manager.delete_subcloud.assert_called_once_with(base.ID)
 
+    def test_delete_subcloud_with_filter(self):
+        self.assertRaises(
+            DCManagerClientException,
+            self.call,
+            subcloud_cmd.DeleteSubcloud,
+            app_args=[base.ID, "--name-prefix", "zzz", "--yes"],
+        )
+        self.client.subcloud_manager.delete_subcloud.assert_not_called()
+
+    def test_delete_many_subclouds(self):
+        self.client.subcloud_manager.delete_subclouds.return_value = iter(
+            [
+                (base.ID, None, None),
+                (base.NAME_SC2, None, Exception("not found")),
+            ]
+        )
+        cmd = subcloud_cmd.DeleteSubcloud(self.app, [])
+        parsed_args = cmd.get_parser("").parse_args(
+            [base.ID, base.NAME_SC2, "--concurrency", "2"]
+        )
+
+        columns, rows = cmd.take_action(parsed_args)
+
+        self.assertEqual(("subcloud", "result", "error"), columns)
+        self.assertEqual(
+            [(base.ID, "deleted", "<none>"), (base.NAME_SC2, "failed", "not found")],
+            rows,
+        )
+        self.client.subcloud_manager.delete_subclouds.assert_called_once_with(
+            [base.ID, base.NAME_SC2], max_workers=2
+        )
+        with mock.patch.object(subcloud_cmd.command.Lister, "produce_output"):
+            self.assertRaises(
+                DCManagerClientException,
+                cmd.produce_output,
+                parsed_args,
+                columns,
+                rows,
+            )
+
+    @mock.patch.dict(os.environ, {"CLI_CONFIRMATIONS": "enabled"})
+    @mock.patch.object(utils.CLIUtils, "_prompt_cli_confirmation")
+    def test_delete_subcloud_peer_group_single_confirmation(self, mock_prompt):
+        peer_group_manager = self.client.subcloud_peer_group_manager
+        peer_group_manager.get_subcloud_peer_group_id.return_value = 3
+        secondary_subcloud = copy.copy(self.subcloud_resource)
+        secondary_subcloud.name = base.NAME_SC2
+        secondary_subcloud.deploy_status = "secondary"
+        self.client.subcloud_manager.list_subclouds.return_value = [
+            self.subcloud_resource,
+            secondary_subcloud,
+        ]
+        self.client.subcloud_manager.delete_subclouds.return_value = iter(
+            [(base.NAME, None, None)]
+        )
+
+        actual_call = self.call(
+            subcloud_cmd.DeleteSubcloud, app_args=["--peer-group", "peer-group1"]
+        )
+
+        self.assertEqual([(base.NAME, "deleted", "<none>")], actual_call[1])
+        mock_prompt.assert_called_once_with([base.NAME])
+        self.client.subcloud_manager.list_subclouds.assert_called_once_with(
+            deploy_status=None,
+            availability_status=None,
+            group_id=None,
+            peer_group_id=3,
+            name_prefix=None,
+        )
+
     def test_delete_subcloud_without_subcloud_id(self):
         self.assertRaises(
             SystemExit, self.call, subcloud_cmd.DeleteSubcloud, app_args=[]
@@ -129,6 +311,101 @@ class TestCLISubcloudManagerV1(base.BaseCommandTest):
             base.EMPTY_SUBCLOUD_FIELD_RESULT_WITH_PEERID_REHOME_DATA, actual_call[1]
         )
 
+    def test_show_many_subclouds_with_additional_detail(self):
+        self.subcloud_resource.oam_floating_ip = base.EXTERNAL_OAM_FLOATING_ADDRESS
+        self.client.subcloud_manager.subclouds_additional_details.return_value = iter(
+            [(base.ID, [self.subcloud_resource], None)]
+        )
+        actual_call = self.call(
+            subcloud_cmd.ShowSubcloud,
+            app_args=[base.ID, base.NAME_SC2, "--detail", "--concurrency", "5"],
+        )
+        rows = list(actual_call[1])
+
+        subcloud_manager = self.client.subcloud_manager
+        subcloud_manager.subclouds_additional_details.assert_called_once_with(
+            [base.ID, base.NAME_SC2], max_workers=5
+        )
+        self.assertEqual(subcloud_cmd.detail_many_format()[0], actual_call[0])
+        self.assertEqual(1, len(rows))
+        self.assertIn(base.EXTERNAL_OAM_FLOATING_ADDRESS, rows[0])
+
+    def test_show_many_subclouds_partial_failure(self):
+        self.client.subcloud_manager.subclouds_detail.return_value = iter(
+            [
+                (base.ID, [self.subcloud_resource], None),
+                (base.NAME_SC2, None, Exception("not found")),
+            ]
+        )
+        cmd = subcloud_cmd.ShowSubcloud(self.app, [])
+        parsed_args = cmd.get_parser("").parse_args([base.ID, base.NAME_SC2])
+        columns, rows = cmd.take_action(parsed_args)
+
+        self.assertEqual([base.ID], [row[0] for row in rows])
+        # The failures are reported after the other subclouds were shown
+        with mock.patch.object(
+            subcloud_cmd.base.DCManagerShow, "produce_output"
+        ) as mock_produce_output:
+            self.assertRaises(
+                DCManagerClientException,
+                cmd.produce_output,
+                parsed_args,
+                columns,
+                rows,
+            )
+        mock_produce_output.assert_called_once_with(parsed_args, columns, rows)
+
+    def test_show_many_subclouds_auth_error_retried(self):
+        auth_error = DCManagerClientException("unauthorized")
+        auth_error.error_code = 401
+        self.client.subcloud_manager.subclouds_detail.side_effect = [
+            iter([(base.NAME_SC2, None, auth_error)]),
+            iter([(base.NAME_SC2, [self.subcloud_resource], None)]),
+        ]
+
+        actual_call = self.call(
+            subcloud_cmd.ShowSubcloud, app_args=[base.ID, base.NAME_SC2]
+        )
+
+        self.app.load_client.assert_called_once_with(refresh_cache=True)
+        self.assertEqual([base.ID], [row[0] for row in actual_call[1]])
+
+    def test_show_subcloud_group_with_additional_detail(self):
+        subcloud_group_manager = self.client.subcloud_group_manager
+        subcloud_group_manager.subcloud_group_list_subclouds.return_value = [
+            self.subcloud_resource
+        ]
+        self.client.subcloud_manager.subclouds_additional_details.return_value = iter(
+            []
+        )
+        actual_call = self.call(
+            subcloud_cmd.ShowSubcloud, app_args=["--group", "1", "--detail"]
+        )
+        self.assertEqual([], list(actual_call[1]))
+        subcloud_manager = self.client.subcloud_manager
+        subcloud_manager.subclouds_additional_details.assert_called_once_with(
+            [base.NAME], max_workers=10
+        )
+
+    def test_show_all_subclouds(self):
+        self.client.subcloud_manager.list_subclouds.return_value = [
+            self.subcloud_resource
+        ]
+        actual_call = self.call(subcloud_cmd.ShowSubcloud, app_args=["--all"])
+        self.assertEqual(1, len(list(actual_call[1])))
+        self.client.subcloud_manager.subclouds_detail.assert_not_called()
+
+    def test_show_subcloud_invalid_selection(self):
+        self.assertRaises(
+            DCManagerClientException, self.call, subcloud_cmd.ShowSubcloud
+        )
+        self.assertRaises(
+            DCManagerClientException,
+            self.call,
+            subcloud_cmd.ShowSubcloud,
+            app_args=[base.ID, "--all"],
+        )
+
     @mock.patch("getpass.getpass", return_value="testpassword")
     def test_add_subcloud(self, _mock_getpass):
         self.client.subcloud_manager.add_subcloud.return_value = [
@@ -494,6 +771,129 @@ class TestCLISubcloudManagerV1(base.BaseCommandTest):
             SystemExit, self.call, subcloud_cmd.ManageSubcloud, app_args=[]
         )
 
+    def test_manage_many_subclouds(self):
+        self.client.subcloud_manager.update_subclouds.return_value = iter(
+            [
+                (base.ID, [self.subcloud_resource], None),
+                (base.NAME_SC2, None, Exception("not found")),
+            ]
+        )
+        cmd = subcloud_cmd.ManageSubcloud(self.app, [])
+        parsed_args = cmd.get_parser("").parse_args(
+            [base.ID, base.NAME_SC2, "--force", "--concurrency", "5"]
+        )
+        columns, rows = cmd.take_action(parsed_args)
+
+        self.assertEqual(subcloud_cmd.bulk_result_format()[0], columns)
+        self.assertEqual(
+            [
+                (base.NAME, "success", base.MANAGEMENT_STATE, base.AVAILABILITY_STATUS),
+                (base.NAME_SC2, "failed", "<none>", "<none>"),
+            ],
+            [row[:4] for row in rows],
+        )
+        self.client.subcloud_manager.update_subclouds.assert_called_once_with(
+            [base.ID, base.NAME_SC2],
+            {"management-state": "managed", "force": "true"},
+            max_workers=5,
+        )
+        # The failures are reported after all the rows were shown
+        with mock.patch.object(
+            subcloud_cmd.base.DCManagerShow, "produce_output"
+        ) as mock_produce_output:
+            self.assertRaises(
+                DCManagerClientException,
+                cmd.produce_output,
+                parsed_args,
+                columns,
+                rows,
+            )
+        mock_produce_output.assert_called_once()
+
+    def test_unmanage_subcloud_group(self):
+        subcloud_group_manager = self.client.subcloud_group_manager
+        subcloud_group_manager.get_subcloud_group_id.return_value = 2
+        self.client.subcloud_manager.list_subclouds.return_value = [
+            self.subcloud_resource
+        ]
+        self.client.subcloud_manager.update_subclouds.return_value = iter(
+            [(base.NAME, [self.subcloud_resource], None)]
+        )
+
+        actual_call = self.call(
+            subcloud_cmd.UnmanageSubcloud,
+            app_args=["--group", "group1", "--availability", "offline", "--yes"],
+        )
+
+        self.assertEqual(1, len(list(actual_call[1])))
+        self.client.subcloud_manager.list_subclouds.assert_called_once_with(
+            deploy_status=None,
+            availability_status="offline",
+            group_id=2,
+            peer_group_id=None,
+            name_prefix=None,
+            management_state="managed",
+        )
+        self.client.subcloud_manager.update_subclouds.assert_called_once_with(
+            [base.NAME], {"management-state": "unmanaged"}, max_workers=10
+        )
+
+    @mock.patch.dict(os.environ, {"CLI_CONFIRMATIONS": "enabled"})
+    @mock.patch.object(utils.CLIUtils, "_prompt_cli_confirmation")
+    def test_unmanage_many_subclouds_with_filters(self, mock_prompt):
+        self.assertRaises(
+            DCManagerClientException,
+            self.call,
+            subcloud_cmd.UnmanageSubcloud,
+            app_args=[base.ID, base.NAME_SC2, "--availability", "offline"],
+        )
+        # Rejected before the confirmation
+        mock_prompt.assert_not_called()
+
+    @mock.patch.dict(os.environ, {"CLI_CONFIRMATIONS": "enabled"})
+    @mock.patch.object(utils.CLIUtils, "_prompt_cli_confirmation")
+    def test_unmanage_subcloud_group_single_confirmation(self, mock_prompt):
+        self.client.subcloud_manager.list_subclouds.return_value = [
+            self.subcloud_resource
+        ]
+        self.client.subcloud_manager.update_subclouds.return_value = iter(
+            [(base.NAME, [self.subcloud_resource], None)]
+        )
+
+        self.call(subcloud_cmd.UnmanageSubcloud, app_args=["--group", "1"])
+
+        mock_prompt.assert_called_once_with([base.NAME])
+
+    @mock.patch.dict(os.environ, {"CLI_CONFIRMATIONS": "enabled"})
+    @mock.patch.object(utils.CLIUtils, "_prompt_cli_confirmation")
+    def test_unmanage_empty_selection(self, mock_prompt):
+        self.client.subcloud_manager.list_subclouds.return_value = []
+
+        self.assertRaises(
+            DCManagerClientException,
+            self.call,
+            subcloud_cmd.UnmanageSubcloud,
+            app_args=["--all"],
+        )
+        mock_prompt.assert_not_called()
+        self.client.subcloud_manager.update_subclouds.assert_not_called()
+
+    def test_manage_many_subclouds_auth_error_retried(self):
+        auth_error = DCManagerClientException("unauthorized")
+        auth_error.error_code = 401
+        self.client.subcloud_manager.update_subclouds.side_effect = [
+            iter([(base.ID, None, auth_error)]),
+            iter([(base.ID, [self.subcloud_resource], None)]),
+        ]
+
+        columns, rows = self.call(
+            subcloud_cmd.ManageSubcloud, app_args=[base.ID, base.NAME_SC2]
+        )
+
+        self.app.load_client.assert_called_once_with(refresh_cache=True)
+        self.assertEqual(subcloud_cmd.bulk_result_format()[0], columns)
+        self.assertEqual([(base.NAME, "success")], [row[:2] for row in rows])
+
     def test_update_subcloud(self):
         self.client.subcloud_manager.update_subcloud.return_value = [
             self.subcloud_resource
@@ -738,3 +1138,350 @@ class TestCLISubcloudManagerV1(base.BaseCommandTest):
             base.SUBCLOUD_FIELD_RESULT_LIST_WITH_PEERID + (base.SOFTWARE_VERSION,),
             actual_call_with_release[1],
         )
+
+
+def _subcloud_payloads(count, **fields):
+    payloads = []
+    for index in range(1, count + 1):
+        payload = dict(base.SUBCLOUD_PAYLOAD, id=index, name=f"subcloud{index}")
+        payload.update(fields)
+        payloads.append(payload)
+    return payloads
+
+
+def _list_response(payloads):
+    return base.FakeResponse(200, json.dumps({"subclouds": payloads}))
+
+
+def _legacy_from_payload(manager, payload):
+    # Decoding through a keyword arguments dict, as done before the payload
+    # loaders were built
+    parameters = {"manager": manager}
+    for payload_param, value in payload.items():
+        param_name = api_base.Subcloud._PAYLOAD_NAME_MAP.get(payload_param)
+        if param_name is not None:
+            parameters[param_name] = value
+    return api_base.Subcloud(**parameters)
+
+
+def _stream_response(content, chunk_size):
+    content = content.encode("utf-8")
+    resp = mock.MagicMock(status_code=200)
+    resp.iter_content.return_value = (
+        content[i : i + chunk_size] for i in range(0, len(content), chunk_size)
+    )
+    return resp
+
+
+class TestSubcloudManagerV1(testtools.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.http_client = mock.MagicMock()
+        self.subcloud_manager = SubcloudManager(self.http_client)
+
+    def test_list_subclouds_without_filters(self):
+        self.http_client.get.return_value = _list_response(_subcloud_payloads(2))
+        subclouds = self.subcloud_manager.list_subclouds()
+        self.http_client.get.assert_called_once_with("/subclouds/")
+        self.assertEqual(2, len(subclouds))
+
+    def test_list_subclouds_query_parameters(self):
+        self.http_client.get.return_value = _list_response([])
+        self.subcloud_manager.list_subclouds(
+            deploy_status=["complete", "deploying"],
+            management_state="managed",
+            name_prefix="subcloud",
+            limit=5,
+            marker=3,
+        )
+        self.http_client.get.assert_called_once_with(
+            "/subclouds/?deploy_status=complete&deploy_status=deploying"
+            "&management_state=managed&name_prefix=subcloud&limit=5&marker=3"
+        )
+
+    def test_list_subclouds_client_side_fallback(self):
+        payloads = _subcloud_payloads(6)
+        payloads[1]["management-state"] = "managed"
+        payloads[3]["management-state"] = "managed"
+        payloads[4]["management-state"] = "managed"
+        payloads[5]["management-state"] = "managed"
+        self.http_client.get.return_value = _list_response(payloads)
+
+        subclouds = self.subcloud_manager.list_subclouds(
+            management_state="managed", limit=2, marker=2
+        )
+
+        self.assertEqual([4, 5], [s.subcloud_id for s in subclouds])
+
+    def test_list_subclouds_excluded_before_limit(self):
+        payloads = _subcloud_payloads(4)
+        payloads[0]["deploy-status"] = "secondary"
+        self.http_client.get.side_effect = [
+            _list_response(payloads[0:2]),
+            _list_response(payloads[2:4]),
+        ]
+
+        subclouds = self.subcloud_manager.list_subclouds(
+            exclude_deploy_status=("secondary",), limit=2
+        )
+
+        # The excluded subcloud leaves the first page short
+        self.assertEqual([2, 3], [s.subcloud_id for s in subclouds])
+        self.assertEqual(
+            [
+                mock.call("/subclouds/?limit=2"),
+                mock.call("/subclouds/?limit=2&marker=2"),
+            ],
+            self.http_client.get.call_args_list,
+        )
+
+    def test_list_subclouds_excluded_without_server_pagination(self):
+        payloads = _subcloud_payloads(4)
+        payloads[0]["deploy-status"] = "secondary"
+        self.http_client.get.return_value = _list_response(payloads)
+
+        subclouds = self.subcloud_manager.list_subclouds(
+            exclude_deploy_status=("secondary",), limit=2
+        )
+
+        self.assertEqual([2, 3], [s.subcloud_id for s in subclouds])
+        self.http_client.get.assert_called_once_with("/subclouds/?limit=2")
+
+    def test_list_subclouds_invalid_limit(self):
+        self.assertRaises(ValueError, self.subcloud_manager.list_subclouds, limit=0)
+        self.http_client.get.assert_not_called()
+
+    def test_list_subclouds_name_prefix_fallback(self):
+        payloads = _subcloud_payloads(2)
+        payloads[1]["name"] = "edge1"
+        self.http_client.get.return_value = _list_response(payloads)
+
+        subclouds = self.subcloud_manager.list_subclouds(name_prefix="edge")
+
+        self.assertEqual(["edge1"], [s.name for s in subclouds])
+
+    def test_iter_subclouds_pages(self):
+        payloads = _subcloud_payloads(5)
+        self.http_client.get.side_effect = [
+            _list_response(payloads[0:2]),
+            _list_response(payloads[2:4]),
+            _list_response(payloads[4:]),
+        ]
+
+        subclouds = self.subcloud_manager.iter_subclouds(page_size=2)
+
+        self.assertEqual([1, 2, 3, 4, 5], [s.subcloud_id for s in subclouds])
+        self.assertEqual(
+            [
+                mock.call("/subclouds/?limit=2"),
+                mock.call("/subclouds/?limit=2&marker=2"),
+                mock.call("/subclouds/?limit=2&marker=4"),
+            ],
+            self.http_client.get.call_args_list,
+        )
+
+    def test_iter_subclouds_without_server_pagination(self):
+        self.http_client.get.return_value = _list_response(_subcloud_payloads(5))
+
+        subclouds = list(self.subcloud_manager.iter_subclouds(page_size=2))
+
+        self.assertEqual(5, len(subclouds))
+        self.http_client.get.assert_called_once_with("/subclouds/?limit=2")
+
+    def test_stream_subclouds(self):
+        payloads = _subcloud_payloads(3, description="sübcloud")
+        payloads[1]["name"] = "edge1"
+        content = json.dumps({"other": [{"id": 10}], "subclouds": payloads})
+        resp = _stream_response(content, chunk_size=7)
+        self.http_client.get.return_value = resp
+
+        subclouds = list(self.subcloud_manager.stream_subclouds(name_prefix="subcloud"))
+
+        self.assertEqual([1, 3], [s.subcloud_id for s in subclouds])
+        self.assertEqual("sübcloud", subclouds[0].description)
+        self.http_client.get.assert_called_once_with(
+            "/subclouds/?name_prefix=subcloud", stream=True
+        )
+        resp.close.assert_called_once_with()
+
+    def test_stream_subclouds_request_sent_by_call(self):
+        self.http_client.get.return_value = base.FakeResponse(500, "")
+
+        # Raised before the subclouds are iterated
+        self.assertRaises(APIException, self.subcloud_manager.stream_subclouds)
+
+    def test_stream_subclouds_empty_list(self):
+        self.http_client.get.return_value = _stream_response(
+            '{"subclouds": [ ]}', chunk_size=3
+        )
+        self.assertEqual([], list(self.subcloud_manager.stream_subclouds()))
+
+    def test_stream_subclouds_truncated_response(self):
+        content = json.dumps({"subclouds": _subcloud_payloads(2)})[:-20]
+        self.http_client.get.return_value = _stream_response(content, chunk_size=16)
+        self.assertRaises(ValueError, list, self.subcloud_manager.stream_subclouds())
+
+    def test_update_subclouds(self):
+        payload = dict(base.SUBCLOUD_PAYLOAD, **{"management-state": "managed"})
+        self.http_client.patch.side_effect = [
+            base.FakeResponse(200, json.dumps(payload)),
+            base.FakeResponse(404, json.dumps({"error_message": "not found"})),
+        ]
+
+        results = self.subcloud_manager.update_subclouds(
+            [base.NAME, base.NAME_SC2], {"management-state": "managed"}, max_workers=1
+        )
+        results = {ref: (result, error) for ref, result, error in results}
+
+        self.assertEqual("managed", results[base.NAME][0][0].management_state)
+        self.assertIsNotNone(results[base.NAME_SC2][1])
+        self.assertEqual(2, self.http_client.patch.call_count)
+
+    def test_add_subcloud_streams_files(self):
+        with tempfile.NamedTemporaryFile(delete=False) as bootstrap_file:
+            bootstrap_file.write(b"system_mode: simplex\n" * 1000)
+        self.addCleanup(os.unlink, bootstrap_file.name)
+        uploaded = {}
+
+        def post(_url, body, headers):
+            uploaded["file"] = body.encoder.fields["bootstrap_values"][1]
+            uploaded["body"] = body.read()
+            uploaded["content-type"] = headers["content-type"]
+            return base.FakeResponse(200, json.dumps(base.SUBCLOUD_PAYLOAD))
+
+        self.http_client.post.side_effect = post
+        progress = mock.MagicMock()
+
+        subcloud = self.subcloud_manager.add_subcloud(
+            files={"bootstrap_values": bootstrap_file.name},
+            data={"bootstrap-address": "10.10.10.12"},
+            progress=progress,
+        )
+
+        self.assertEqual(base.NAME, subcloud[0].name)
+        self.assertIn(b"system_mode: simplex\n" * 1000, uploaded["body"])
+        self.assertIn(b"10.10.10.12", uploaded["body"])
+        self.assertTrue(uploaded["content-type"].startswith("multipart/form-data"))
+        # The file was streamed from its handle, closed after the request
+        self.assertTrue(uploaded["file"].closed)
+        total = len(uploaded["body"])
+        progress.assert_called_with(total, total)
+
+    def test_delete_subclouds(self):
+        self.http_client.delete.side_effect = [
+            base.FakeResponse(200),
+            base.FakeResponse(404, json.dumps({"error_message": "not found"})),
+        ]
+
+        results = self.subcloud_manager.delete_subclouds(
+            [base.NAME, base.NAME_SC2], max_workers=1
+        )
+        errors = {subcloud_ref: error for subcloud_ref, _, error in results}
+
+        self.assertIsNone(errors[base.NAME])
+        self.assertIsNotNone(errors[base.NAME_SC2])
+
+    def test_subcloud_resource_has_no_instance_dict(self):
+        subcloud = api_base.Subcloud.from_payload(
+            self.subcloud_manager, base.SUBCLOUD_PAYLOAD
+        )
+        self.assertFalse(hasattr(subcloud, "__dict__"))
+        self.assertRaises(AttributeError, setattr, subcloud, "unknown", 1)
+
+    def test_subcloud_lazy_fields(self):
+        endpoint_sync_status = [
+            {"endpoint_type": "platform", "sync_status": "in-sync"},
+            {"endpoint_type": "identity", "sync_status": "out-of-sync"},
+        ]
+        payload = dict(
+            base.SUBCLOUD_PAYLOAD,
+            endpoint_sync_status=endpoint_sync_status,
+            rehome_data='{"saved_payload": {}}',
+        )
+
+        subcloud = api_base.Subcloud.from_payload(self.subcloud_manager, payload)
+
+        self.assertIsInstance(subcloud._endpoint_sync_status, str)
+        self.assertEqual(endpoint_sync_status, subcloud.endpoint_sync_status)
+        self.assertEqual('{"saved_payload": {}}', subcloud.rehome_data)
+        subcloud.rehome_data = {"saved_payload": {"name": "subcloud1"}}
+        self.assertEqual({"saved_payload": {"name": "subcloud1"}}, subcloud.rehome_data)
+
+    def test_subcloud_lazy_field_decoded_once(self):
+        payload = dict(
+            base.SUBCLOUD_PAYLOAD,
+            endpoint_sync_status=[{"endpoint_type": "platform"}],
+        )
+        subcloud = api_base.Subcloud.from_payload(self.subcloud_manager, payload)
+
+        with mock.patch.object(api_base.json, "loads", wraps=json.loads) as loads:
+            subcloud.endpoint_sync_status[0]["sync_status"] = "in-sync"
+            status = subcloud.endpoint_sync_status
+
+        loads.assert_called_once()
+        self.assertIs(status, subcloud._endpoint_sync_status)
+        self.assertEqual(
+            [{"endpoint_type": "platform", "sync_status": "in-sync"}], status
+        )
+
+    def test_subcloud_default_endpoint_sync_status(self):
+        subcloud = api_base.Subcloud.from_payload(
+            self.subcloud_manager, base.SUBCLOUD_PAYLOAD
+        )
+        self.assertEqual({}, subcloud.endpoint_sync_status)
+        self.assertIsNone(subcloud.rehome_data)
+
+    def test_from_payload_missing_optional_fields(self):
+        subcloud = api_base.Subcloud.from_payload(
+            self.subcloud_manager, dict(base.SUBCLOUD_PAYLOAD, unknown="value")
+        )
+
+        self.assertEqual("unknown", subcloud.sync_status)
+        self.assertIsNone(subcloud.region_name)
+        self.assertIs(self.subcloud_manager, subcloud.manager)
+
+    def test_from_payloads_matches_keyword_arguments(self):
+        payloads = _subcloud_payloads(100)
+        manager = self.subcloud_manager
+
+        subclouds = api_base.Subcloud.from_payloads(manager, payloads)
+        expected = [_legacy_from_payload(manager, payload) for payload in payloads]
+        attributes = api_base.Subcloud.__slots__
+        for subcloud, expected_subcloud in zip(subclouds, expected):
+            for attribute in attributes:
+                self.assertEqual(
+                    getattr(expected_subcloud, attribute),
+                    getattr(subcloud, attribute),
+                )
+
+    def test_from_payloads_benchmark(self):
+        payloads = _subcloud_payloads(10000)
+        manager = self.subcloud_manager
+
+        # timeit disables the garbage collector while timing, keeping the
+        # measurements stable
+        legacy_time = min(
+            timeit.repeat(
+                lambda: [_legacy_from_payload(manager, p) for p in payloads],
+                number=1,
+                repeat=3,
+            )
+        )
+        loader_time = min(
+            timeit.repeat(
+                lambda: api_base.Subcloud.from_payloads(manager, payloads),
+                number=1,
+                repeat=3,
+            )
+        )
+        self.addDetail(
+            "benchmark",
+            test_content.text_content(
+                f"10000 subclouds: keyword arguments {legacy_time:.3f}s, "
+                f"payload loader {loader_time:.3f}s, "
+                f"speedup {legacy_time / loader_time:.2f}x"
+            ),
+        )
+        # Only catches a loader much slower than the keyword arguments path,
+        # the measured speedup is reported in the test details
+        self.assertLess(loader_time, legacy_time * 3)
@@ -4,7 +4,20 @@
 # SPDX-License-Identifier: Apache-2.0
 #
 
+import json
+import os
+import shutil
+import tempfile
+
+import mock
+import requests
+
+from dcmanagerclient.api import httpclient
+from dcmanagerclient.api import response_cache
 from dcmanagerclient.api.v1.strategy_step_manager import StrategyStep
+from dcmanagerclient.api.v1.strategy_step_manager import StrategyStepManager
+from dcmanagerclient.api.v1.sw_deploy_manager import SwDeployManager
+from dcmanagerclient.commands.v1 import sw_deploy_manager as sw_deploy_cmd
 from dcmanagerclient.commands.v1 import sw_update_manager as sw_update_cmd
 from dcmanagerclient.tests import base
 
@@ -18,6 +31,8 @@ FAKE_FINISHED_AT = None
 FAKE_CREATED_AT = None
 FAKE_UPDATED_AT = None
 
+API_BASE_URL = "http://localhost:8119/v1.0"
+
 STRATEGY_STEP = StrategyStep(
     FAKE_MANAGER,
     FAKE_CLOUD,
@@ -56,3 +71,82 @@ class TestCLISWUpdateManagerV1(base.BaseCommandTest):
             ),
             actual_call[1],
         )
+
+
+class TestStrategyWaitWithResponseCache(base.BaseCommandTest):
+    """Waits for a strategy through an HTTP client caching the responses."""
+
+    def setUp(self):
+        super().setUp()
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir)
+        cache = response_cache.ResponseCache(
+            ttl=3600, path=os.path.join(cache_dir, "responses.sqlite")
+        )
+        http_client = httpclient.HTTPClient(
+            API_BASE_URL, "token", "project", "user", response_cache=cache
+        )
+        self.addCleanup(http_client.close)
+        self.app.client_manager.sw_deploy_manager = SwDeployManager(http_client)
+        self.app.client_manager.strategy_step_manager = StrategyStepManager(http_client)
+        self.states = iter(["applying", "applying", "complete"])
+        self.state = None
+
+    def _strategy(self):
+        return {
+            "type": "sw-deploy",
+            "subcloud-apply-type": "parallel",
+            "max-parallel-subclouds": 2,
+            "stop-on-failure": False,
+            "state": self.state,
+            "created-at": None,
+            "updated-at": None,
+        }
+
+    def _steps(self):
+        step = {
+            "cloud": FAKE_CLOUD,
+            "stage": 1,
+            "state": self.state,
+            "details": "",
+            "started-at": None,
+            "finished-at": None,
+            "created-at": None,
+            "updated-at": None,
+        }
+        return {"strategy-steps": [step]}
+
+    def _get(self, url, **_kwargs):
+        # Each strategy request moves the strategy to its next state
+        if "/steps" in url:
+            body = self._steps()
+        else:
+            self.state = next(self.states)
+            body = self._strategy()
+        response = requests.Response()
+        response.status_code = 200
+        response._content = json.dumps(body).encode("utf-8")
+        response.url = url
+        response.request = requests.Request("GET", url).prepare()
+        return response
+
+    @mock.patch.object(sw_update_cmd.time, "sleep")
+    @mock.patch.object(requests.Session, "get")
+    def test_wait_polls_the_server(self, mock_get, mock_sleep):
+        mock_get.side_effect = self._get
+        # A cached strategy would be polled forever
+        mock_sleep.side_effect = [None] * 5
+
+        columns, results = self.call(
+            sw_deploy_cmd.ShowSwDeployStrategy, app_args=["--wait"]
+        )
+
+        self.assertEqual("complete", results[columns.index("state")])
+        self.assertEqual(2, mock_sleep.call_count)
+        self.assertEqual(
+            [
+                mock.call(f"{FAKE_CLOUD}: stage 1 applying\n"),
+                mock.call(f"{FAKE_CLOUD}: stage 1 complete\n"),
+            ],
+            self.app.stderr.write.call_args_list,
+        )
@@ -227,7 +227,7 @@ class TestCLISystemPeerManagerV1(base.BaseCommandTest):
 
     def test_update_system_peer(self):
         updated_system_peer = copy.copy(SYSTEM_PEER)
-        updated_system_peer.peer_controller_gateway_ip = NEW_PEER_CONTROLLER_GATEWAY_IP
+        updated_system_peer.gateway_address = NEW_PEER_CONTROLLER_GATEWAY_IP
         self.client.update_system_peer.return_value = [updated_system_peer]
         actual_call = self.call(
             system_peer_cmd.UpdateSystemPeer,
@@ -244,7 +244,7 @@ class TestCLISystemPeerManagerV1(base.BaseCommandTest):
                 SYSTEM_PEER_NAME,
                 MANAGER_ENDPOINT,
                 MANAGER_USERNAME,
-                PEER_CONTROLLER_GATEWAY_IP,
+                NEW_PEER_CONTROLLER_GATEWAY_IP,
                 ADMINISTRATIVE_STATE,
                 HEARTBEAT_INTERVAL,
                 HEARTBEAT_FAILURE_THRESHOLD,
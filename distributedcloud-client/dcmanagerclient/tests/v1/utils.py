@@ -8,6 +8,7 @@ import mock
 
 from oslo_utils import timeutils
 
+from dcmanagerclient.api.v1.strategy_step_manager import StrategyStep
 from dcmanagerclient.api.v1.sw_update_manager import SwUpdateStrategy
 
 TIME_NOW = timeutils.utcnow().isoformat()
@@ -15,6 +16,8 @@ DEFAULT_APPLY_TYPE = "serial"
 DEFAULT_MAX_PARALLEL = 2
 DEFAULT_STATE = "initial"
 DEFAULT_STRATEGY_TYPE = "sw-deploy"
+DEFAULT_CLOUD = "subcloud1"
+DEFAULT_STAGE = 1
 
 
 def make_strategy(
@@ -41,3 +44,29 @@ def make_strategy(
         updated_at,
         extra_args,
     )
+
+
+def make_strategy_step(
+    manager=None,
+    cloud=DEFAULT_CLOUD,
+    stage=DEFAULT_STAGE,
+    state=DEFAULT_STATE,
+    details="",
+    started_at=TIME_NOW,
+    finished_at=None,
+    created_at=TIME_NOW,
+    updated_at=None,
+):
+    if manager is None:
+        manager = mock.MagicMock()
+    return StrategyStep(
+        manager,
+        cloud,
+        stage,
+        state,
+        details,
+        started_at,
+        finished_at,
+        created_at,
+        updated_at,
+    )
@@ -16,24 +16,37 @@
 #    limitations under the License.
 #
 
+from concurrent import futures
+import contextlib
+import fcntl
 import getpass
-import subprocess
 import json
 import os
 import base64
 import signal
 import logging
+import stat
 import sys
 import tarfile
+import tempfile
+import time
 from typing import Union
 from urllib import parse, request
 
 import yaml
 
 from dcmanagerclient import exceptions
+from dcmanagerclient import keyutils
 
 LOG = logging.getLogger(__name__)
 
+# Default number of API requests issued in parallel by bulk operations
+DEFAULT_MAX_WORKERS = 10
+
+# Seconds to wait for a lock held by another process, then between attempts
+DEFAULT_LOCK_TIMEOUT = 20
+LOCK_POLL_INTERVAL = 0.1
+
 
 def do_action_on_many(action, resources, success_msg, error_msg):
     """Helper to run an action on many resources."""
@@ -51,6 +64,89 @@ def do_action_on_many(action, resources, success_msg, error_msg):
         raise exceptions.DCManagerClientException(error_msg)
 
 
+def run_concurrently(action, resources, max_workers=DEFAULT_MAX_WORKERS):
+    """Helper to run an action on many resources using a bounded thread pool.
+
+    Yields a (resource, result, exception) tuple for each resource as soon as
+    its action completes, so callers can report the outcome incrementally.
+    A failed action does not stop the remaining ones.
+    """
+    with futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = {
+            executor.submit(action, resource): resource for resource in resources
+        }
+        try:
+            for future in futures.as_completed(pending):
+                resource = pending[future]
+                result, error = None, None
+                try:
+                    result = future.result()
+                except Exception as exc:
+                    error = exc
+                yield resource, result, error
+        finally:
+            # Avoid waiting for the queued actions when the caller stops early
+            for future in pending:
+                future.cancel()
+
+
+class ProgressLine:
+    """Shows a status line rewritten in place on a terminal.
+
+    Nothing is written when the stream is not a terminal, so redirected
+    output is not cluttered with the intermediate states.
+    """
+
+    def __init__(self, stream=None):
+        self.stream = stream or sys.stderr
+        isatty = getattr(self.stream, "isatty", None)
+        self.enabled = bool(isatty and isatty())
+        self._width = 0
+
+    def update(self, text):
+        if not self.enabled:
+            return
+        # Pad with spaces to erase the end of a longer previous line
+        self.stream.write("\r" + text.ljust(self._width))
+        self.stream.flush()
+        self._width = len(text)
+
+    def close(self):
+        if self.enabled and self._width:
+            self.stream.write("\n")
+            self.stream.flush()
+        self._width = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class UploadProgress(ProgressLine):
+    """Progress callback of the uploads, rendered as a status line.
+
+    Uploads smaller than min_size complete too quickly to be worth showing.
+    """
+
+    def __init__(self, stream=None, min_size=1024 * 1024):
+        super().__init__(stream)
+        self.min_size = min_size
+        self._percent = None
+
+    def __call__(self, bytes_sent, total):
+        if total < self.min_size:
+            return
+        percent = bytes_sent * 100 // total
+        if percent != self._percent:
+            self._percent = percent
+            self.update(
+                f"Uploading: {bytes_sent / 1048576:.1f} of "
+                f"{total / 1048576:.1f} MiB ({percent}%)"
+            )
+
+
 def load_content(content):
     if content is None or content == "":
         return {}
@@ -101,7 +197,98 @@ def get_contents_if_file(contents_or_file_name):
         )
 
 
+def runtime_dir():
+    """Returns the private runtime directory of the user, creating it.
+
+    The directory holds sockets and lock files, it is placed under
+    XDG_RUNTIME_DIR when set and in the temporary directory otherwise.
+    """
+    if os.environ.get("XDG_RUNTIME_DIR"):
+        path = os.path.join(os.environ["XDG_RUNTIME_DIR"], "dcmanagerclient")
+    else:
+        path = os.path.join(tempfile.gettempdir(), f"dcmanagerclient-{os.getuid()}")
+
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    # A directory created by another user in a shared location is not used
+    path_stat = os.lstat(path)
+    if (
+        not stat.S_ISDIR(path_stat.st_mode)
+        or path_stat.st_uid != os.getuid()
+        or path_stat.st_mode & 0o077
+    ):
+        raise exceptions.DCManagerClientException(
+            f"The runtime directory {path} is not private to the current user"
+        )
+    return path
+
+
+@contextlib.contextmanager
+def file_lock(name, timeout=DEFAULT_LOCK_TIMEOUT):
+    """Holds an exclusive lock shared by the processes of the current user.
+
+    The lock file is placed in the runtime directory. Yields whether the
+    lock was acquired within timeout seconds, the caller then goes on
+    without it rather than failing.
+    """
+    try:
+        lock_file = open(  # pylint: disable=consider-using-with
+            os.path.join(runtime_dir(), name), "a", encoding="utf-8"
+        )
+    except (OSError, exceptions.DCManagerClientException) as exc:
+        LOG.debug("Unable to open the lock file %s: %s", name, exc)
+        yield False
+        return
+
+    with lock_file:
+        deadline = time.monotonic() + timeout
+        acquired = False
+        while not acquired:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                acquired = True
+            except BlockingIOError:
+                if time.monotonic() >= deadline:
+                    LOG.debug("Timed out waiting for the lock %s", name)
+                    break
+                time.sleep(LOCK_POLL_INTERVAL)
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+class NonInteractive:
+    """Refuses the prompts for user input while active.
+
+    Used to run commands without the terminal of the user, e.g. those
+    forwarded to a server. The prompts refused are recorded in ``refused``.
+    """
+
+    active = None
+
+    def __init__(self):
+        self.refused = []
+
+    def __enter__(self):
+        NonInteractive.active = self
+        return self
+
+    def __exit__(self, *exc_info):
+        NonInteractive.active = None
+
+    @classmethod
+    def check(cls, prompt):
+        """Raises if prompting for the input of the user is refused."""
+        if cls.active is not None:
+            cls.active.refused.append(prompt)
+            raise exceptions.DCManagerClientException(
+                f"Unable to prompt for {prompt} without a terminal"
+            )
+
+
 def prompt_for_password(password_type="sysadmin", item_type="subcloud"):
+    NonInteractive.check(f"the {password_type} password")
     while True:
         try:
             password = getpass.getpass(
@@ -243,13 +430,23 @@ class CLIUtils:
             print("\nNo response received within the time limit.")
             sys.exit(1)
 
-    def _prompt_cli_confirmation(self):
+    def _prompt_cli_confirmation(self, resources=None):
         """Display warning and ask for user confirmation."""
+        NonInteractive.check("a confirmation")
         YELLOW = "\033[93m"
         RESET = "\033[0m"
         BOLD = "\033[1m"
 
-        prompt_msg = (
+        prompt_msg = ""
+        if resources:
+            names = ", ".join(str(resource) for resource in resources[:10])
+            if len(resources) > 10:
+                names += f" and {len(resources) - 10} more"
+            prompt_msg = (
+                f"The operation applies to {len(resources)} resource(s): {names}\n"
+            )
+
+        prompt_msg += (
             f"{BOLD}{YELLOW}WARNING: This is a high-risk operation that "
             f"may cause service interruption or remove critical resources.{RESET}\n"
             f"{BOLD}{YELLOW}Do you want to continue? (yes/No): {RESET}"
@@ -265,12 +462,18 @@ class CLIUtils:
         return os.environ.get("CLI_CONFIRMATIONS", "disabled") == "enabled"
 
     @classmethod
-    def prompt_cli_confirmation_if_required(cls, requires_confirmation, parsed_args):
-        """Handle CLI confirmation prompt if required."""
+    def prompt_cli_confirmation_if_required(
+        cls, requires_confirmation, parsed_args, resources=None
+    ):
+        """Handle CLI confirmation prompt if required.
+
+        The resources the operation applies to, if given, are listed in a
+        single prompt.
+        """
         instance = CLIUtils()
         if requires_confirmation and instance._is_cliconf_enabled():
             if hasattr(parsed_args, "yes") and not parsed_args.yes:
-                instance._prompt_cli_confirmation()
+                instance._prompt_cli_confirmation(resources)
 
 
 def persist_auth_session_keyring(
@@ -287,26 +490,12 @@ def persist_auth_session_keyring(
                     expires.
     """
     try:
+        backend = keyutils.get_backend()
         # Persist the key
-        stdout = subprocess.run(
-            [
-                "/usr/bin/keyctl",
-                "add",
-                "user",
-                name,
-                json.dumps(values),
-                "@s",
-            ],
-            check=True,
-            capture_output=True,
-        ).stdout
-        keyring_entry_id = stdout.decode("utf-8").strip("\n")
+        keyring_entry_id = backend.add(name, json.dumps(values).encode("utf-8"))
         # Set key timeout
         if timeout:
-            subprocess.run(
-                ["/usr/bin/keyctl", "timeout", keyring_entry_id, str(timeout)],
-                check=True,
-            )
+            backend.set_timeout(keyring_entry_id, timeout)
         return keyring_entry_id
     except Exception as exc:
         LOG.debug(exc)
@@ -320,12 +509,7 @@ def load_auth_session_keyring_by_name(key_name: str) -> dict:
     """
     try:
         # Search for the key
-        stdout = subprocess.run(
-            ["/usr/bin/keyctl", "search", "@s", "user", key_name],
-            check=True,
-            capture_output=True,
-        ).stdout
-        keyring_entry_id = stdout.decode("utf-8").strip("\n")
+        keyring_entry_id = keyutils.get_backend().search(key_name)
         # Retrieve session data
         return load_auth_session_keyring_by_id(keyring_entry_id)
     except Exception as exc:
@@ -340,12 +524,7 @@ def load_auth_session_keyring_by_id(key_id: str) -> dict:
     """
     try:
         # Retrieve session data
-        stdout = subprocess.run(
-            ["/usr/bin/keyctl", "print", key_id],
-            check=True,
-            capture_output=True,
-        ).stdout
-        return json.loads(stdout.decode("utf-8").strip("\n"))
+        return json.loads(keyutils.get_backend().read(key_id).decode("utf-8"))
     except Exception as exc:
         LOG.debug(exc)
         return {}
@@ -358,13 +537,7 @@ def revoke_keyring_by_name(key_name: str):
     """
     try:
         # Search for the key
-        stdout = subprocess.run(
-            ["/usr/bin/keyctl", "search", "@s", "user", key_name],
-            check=True,
-            capture_output=True,
-        ).stdout
-
-        keyring_entry_id = stdout.decode("utf-8").strip("\n")
+        keyring_entry_id = keyutils.get_backend().search(key_name)
         revoke_keyring_by_id(keyring_entry_id)
     except Exception as exc:
         LOG.debug(exc)
@@ -376,11 +549,7 @@ def revoke_keyring_by_id(key_id: str):
     :param key_id: Key Identifier
     """
     try:
-        subprocess.run(
-            ["/usr/bin/keyctl", "revoke", key_id],
-            check=True,
-            capture_output=True,
-        ).stdout
+        keyutils.get_backend().revoke(key_id)
     except Exception as exc:
         LOG.debug(exc)
 